@@ -0,0 +1,264 @@
+"""
+End-to-end benchmark of the agent, i.e., installed on a local volttron test instance and polled by a loopback
+DNP3 master (dnp3-python `MyMasterNew`), at several database sizes (points per point type, i.e., "db_size").
+
+Measured per size:
+    - update throughput (updates per second) of single point RPCs (`apply_update_analog_input`) and of batch RPCs
+      (`apply_update_batch`), with the "ack" response mode
+    - propagation latency, i.e., from the update RPC call to the new value observed by the master
+      (static reads of the analog inputs, i.e., group 30 variation 6, until the value is seen)
+    - integrity poll response time, i.e., class 0/1/2/3 read of the whole database by the master
+    - database polling latency of `display_outstation_db` (cached snapshot), without writes (i.e., cache hits) and
+      with a write before every poll (i.e., a rebuild per poll), versus the uncached whole-database
+      `query_outstation_db`
+    - memory, i.e., the agent process max resident memory and the point store size (`get_outstation_stats`)
+The results are written as json with the git commit, and `--baseline` prints the relative change of each result
+versus a previous run, i.e., to compare commits.
+Requires volttron, volttron-testing and dnp3-python; the waits poll for readiness instead of fixed sleeps.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_agent.py [--sizes 10 100 1000 10000] [--samples 100]
+        [--output results.json] [--baseline previous.json]
+"""
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import random
+import socket
+import subprocess
+import time
+
+import gevent
+from dnp3_python.dnp3station.master_new import MyMasterNew
+from pydnp3 import opendnp3
+from volttrontesting.fixtures.volttron_platform_fixtures import build_wrapper, cleanup_wrapper
+from volttrontesting.utils import get_rand_vip
+
+AGENT_DIR = pathlib.Path(__file__).parent.parent
+AGENT_IDENTITY = "dnp3_outstation_bench"
+BATCH_SIZE = 1000
+ANALOG_INPUT_GV = opendnp3.GroupVariationID(30, 6)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=AGENT_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def wait_until(predicate, timeout: float, interval: float = 0.001) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        gevent.sleep(interval)
+    return True
+
+
+def summary_ms(samples: list) -> dict:
+    if not samples:
+        return {"count": 0}
+    samples = sorted(samples)
+    percentile = lambda p: samples[min(len(samples) - 1, int(p / 100 * len(samples)))] * 1e3
+    return {"count": len(samples), "mean_ms": sum(samples) / len(samples) * 1e3, "p50_ms": percentile(50),
+            "p99_ms": percentile(99), "max_ms": samples[-1] * 1e3}
+
+
+class AgentUnderTest:
+    """the agent installed with `config` on the volttron test instance, and its rpc caller"""
+
+    def __init__(self, wrapper, caller, config: dict):
+        self.wrapper = wrapper
+        self.caller = caller
+        self.uuid = wrapper.install_agent(agent_dir=AGENT_DIR, config_file=config, start=False,
+                                          vip_identity=AGENT_IDENTITY)
+        wrapper.start_agent(self.uuid)
+        if not wait_until(self._is_ready, timeout=60, interval=0.5):
+            raise RuntimeError("the agent did not start within 60 seconds")
+
+    def _is_ready(self) -> bool:
+        try:
+            return bool(self.call("rpc_dummy", timeout=1))
+        except Exception:
+            return False
+
+    def call(self, method: str, *args, timeout: float = 30, **kwargs):
+        return self.caller.vip.rpc.call(AGENT_IDENTITY, method, *args, **kwargs).get(timeout=timeout)
+
+    def remove(self):
+        self.wrapper.remove_agent(self.uuid)
+
+
+class LoopbackMaster:
+    """the dnp3-python master, with reads waiting for the (opendnp3 thread) SOE handler results"""
+
+    def __init__(self, port: int):
+        self.master = MyMasterNew(masterstation_ip_str="0.0.0.0", outstation_ip_str="127.0.0.1", port=port,
+                                  masterstation_id_int=2, outstation_id_int=1)
+        self.master.start()
+        if not wait_until(lambda: self.master.is_connected, timeout=30, interval=0.1):
+            raise RuntimeError(f"the master did not connect to the outstation on port {port}")
+
+    @property
+    def values(self) -> dict:
+        return self.master.soe_handler.gv_index_value_nested_dict
+
+    def read_analog_inputs(self, timeout: float = 5) -> dict:
+        """static read of the analog inputs, return {index: value}"""
+        gv_cls = opendnp3.GroupVariation.Group30Var6
+        self.values[gv_cls] = None
+        self.master.master.ScanAllObjects(gvId=ANALOG_INPUT_GV, config=opendnp3.TaskConfig().Default())
+        wait_until(lambda: self.values.get(gv_cls) is not None, timeout)
+        return self.values.get(gv_cls) or {}
+
+    def integrity_poll(self, timeout: float = 30) -> float:
+        """class 0/1/2/3 read, return the seconds until the static values of the four point types are received"""
+        self.values.clear()
+        start = time.perf_counter()
+        self.master.master.ScanClasses(opendnp3.ClassField().AllClasses(), opendnp3.TaskConfig().Default())
+        if not wait_until(lambda: sum(val is not None for val in list(self.values.values())) >= 4, timeout):
+            raise RuntimeError(f"integrity poll timed out after {timeout} seconds")
+        return time.perf_counter() - start
+
+    def shutdown(self):
+        self.master.shutdown()
+
+
+def bench_throughput(agent: AgentUnderTest, db_size: int, num_samples: int) -> dict:
+    start = time.perf_counter()
+    for _ in range(num_samples):
+        agent.call("apply_update_analog_input", random.random(), random.randrange(db_size), response_mode="ack")
+    single = num_samples / (time.perf_counter() - start)
+
+    batch_size = min(db_size, BATCH_SIZE)
+    batches = [{"types": ["Analog"] * batch_size, "indexes": random.sample(range(db_size), batch_size),
+                "values": [random.random() for _ in range(batch_size)]} for _ in range(max(num_samples // 10, 1))]
+    start = time.perf_counter()
+    for batch in batches:
+        agent.call("apply_update_batch", batch, response_mode="ack")
+    batch_rate = len(batches) * batch_size / (time.perf_counter() - start)
+    return {"single_updates_per_s": single, "batch_updates_per_s": batch_rate, "batch_size": batch_size}
+
+
+def bench_propagation(agent: AgentUnderTest, master: LoopbackMaster, db_size: int, num_samples: int,
+                      timeout: float = 5) -> dict:
+    latencies, timeouts = [], 0
+    for sample in range(num_samples):
+        index, val = random.randrange(db_size), float(sample) + random.random()
+        start = time.perf_counter()
+        agent.call("apply_update_analog_input", val, index, response_mode="ack")
+        while master.read_analog_inputs().get(index) != val:
+            if time.perf_counter() - start > timeout:
+                timeouts += 1
+                break
+        else:
+            latencies.append(time.perf_counter() - start)
+    return {**summary_ms(latencies), "timeouts": timeouts}
+
+
+def bench_db_polling(agent: AgentUnderTest, db_size: int, num_samples: int) -> dict:
+    """latency of the whole-database reads, i.e., as a monitoring agent polling the outstation"""
+
+    def poll(method: str, write: bool) -> dict:
+        latencies = []
+        for _ in range(num_samples):
+            if write:
+                agent.call("apply_update_analog_input", random.random(), random.randrange(db_size),
+                           response_mode="ack")
+            start = time.perf_counter()
+            agent.call(method)
+            latencies.append(time.perf_counter() - start)
+        return summary_ms(latencies)
+
+    cache_before = agent.call("get_metrics")["snapshot_cache"]
+    result = {"cached_read_only": poll("display_outstation_db", write=False),
+              "cached_write_every_poll": poll("display_outstation_db", write=True),
+              "uncached_write_every_poll": poll("query_outstation_db", write=True)}
+    cache = agent.call("get_metrics")["snapshot_cache"]
+    result["cache_hits"] = cache["hits"] - cache_before["hits"]
+    result["cache_misses"] = cache["misses"] - cache_before["misses"]
+    return result
+
+
+def bench(wrapper, caller, db_size: int, num_samples: int) -> dict:
+    port = free_port()
+    agent = AgentUnderTest(wrapper, caller, {"outstation_ip": "0.0.0.0", "port": port, "master_id": 2,
+                                             "outstation_id": 1, "db_size": db_size, "response_mode": "ack"})
+    master = None
+    try:
+        master = LoopbackMaster(port)
+        result = {"db_size": db_size, "throughput": bench_throughput(agent, db_size, num_samples)}
+        result["propagation_latency"] = bench_propagation(agent, master, db_size, num_samples)
+        result["db_polling"] = bench_db_polling(agent, db_size, num_samples)
+        master.integrity_poll()  # note: drain the pending events first
+        result["integrity_poll"] = summary_ms([master.integrity_poll() for _ in range(max(num_samples // 10, 1))])
+        stats = agent.call("get_outstation_stats")
+        outstation_stats = next(iter(stats["outstations"].values()))
+        result["memory"] = {"agent_max_rss_kb": stats["process"]["max_rss_kb"],
+                            "store_memory_bytes": outstation_stats["store_memory_bytes"]}
+        return result
+    finally:
+        if master is not None:
+            master.shutdown()
+        agent.remove()
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, val in results.items():
+        if isinstance(val, dict):
+            flat.update(flatten(val, f"{prefix}{key}."))
+        elif isinstance(val, (int, float)) and not isinstance(val, bool):
+            flat[f"{prefix}{key}"] = val
+    return flat
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    """relative change (%) of each numeric result versus the baseline, per db_size"""
+    baseline_by_size = {run["db_size"]: flatten(run) for run in baseline["runs"]}
+    changes = {}
+    for run in results["runs"]:
+        previous = baseline_by_size.get(run["db_size"], {})
+        changes[run["db_size"]] = {key: (val - previous[key]) / previous[key] * 100
+                                   for key, val in flatten(run).items() if previous.get(key)}
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--samples", type=int, default=100, help="number of RPCs/reads per measurement")
+    parser.add_argument("--output", type=str, default=None, help="write results as json to this path")
+    parser.add_argument("--baseline", type=str, default=None, help="results json of a previous run to compare")
+    args = parser.parse_args()
+
+    wrapper = build_wrapper(get_rand_vip())
+    try:
+        caller = wrapper.build_agent()
+        runs = [bench(wrapper, caller, db_size, args.samples) for db_size in args.sizes]
+    finally:
+        cleanup_wrapper(wrapper)
+
+    results = {"commit": git_commit(), "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+               "python": platform.python_version(), "samples": args.samples, "runs": runs}
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            print(json.dumps({"change_percent": compare(results, json.load(f))}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
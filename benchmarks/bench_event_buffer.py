@@ -0,0 +1,141 @@
+"""
+Benchmark of the opendnp3 event buffer sizes ("event_buffer_size"), i.e., an in-process `Outstation` polled by a
+loopback DNP3 master (dnp3-python `MyMasterNew`, with unsolicited responses disabled).
+
+Measured per event buffer size, for bursts of analog input updates (distinct points, i.e., one event each, applied
+as one transaction) between two class 1/2/3 event polls:
+    - events received by the master, i.e., the events beyond the buffer capacity are lost (buffer overflow)
+    - overflow threshold, i.e., the smallest burst losing events
+    - event poll response time, i.e., from the poll request to the last event received
+Requires dnp3-python (no volttron instance).
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_event_buffer.py [--buffer-sizes 10 100 1000 10000]
+        [--bursts 0.5 1 1.5 2] [--samples 5] [--output results.json]
+"""
+import argparse
+import json
+import random
+import socket
+import time
+
+from dnp3_python.dnp3station.master_new import MyMasterNew
+from pydnp3 import asiodnp3, opendnp3, openpal
+
+from dnp3_outstation.outstation import Outstation
+
+EVENT_GV = opendnp3.GroupVariation.Group32Var7  # see "point_config" below
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until(predicate, timeout: float, interval: float = 0.001) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(interval)
+    return True
+
+
+def summary_ms(samples: list) -> dict:
+    if not samples:
+        return {"count": 0}
+    samples = sorted(samples)
+    return {"count": len(samples), "mean_ms": sum(samples) / len(samples) * 1e3,
+            "p50_ms": samples[len(samples) // 2] * 1e3, "max_ms": samples[-1] * 1e3}
+
+
+class PollingMaster:
+    """the dnp3-python master without unsolicited responses, i.e., the events are only received by polls"""
+
+    def __init__(self, port: int):
+        stack_config = asiodnp3.MasterStackConfig()
+        stack_config.master.responseTimeout = openpal.TimeDuration().Seconds(10)
+        stack_config.master.disableUnsolOnStartup = True
+        stack_config.master.unsolClassMask = opendnp3.ClassField()
+        stack_config.link.RemoteAddr = 1
+        stack_config.link.LocalAddr = 2
+        self.master = MyMasterNew(masterstation_ip_str="0.0.0.0", outstation_ip_str="127.0.0.1", port=port,
+                                  masterstation_id_int=2, outstation_id_int=1, stack_config=stack_config)
+        self.master.start()
+        if not wait_until(lambda: self.master.is_connected, timeout=30, interval=0.1):
+            raise RuntimeError(f"the master did not connect to the outstation on port {port}")
+
+    def poll_events(self, expected: int, timeout: float = 10, quiet: float = 0.2) -> tuple:
+        """class 1/2/3 poll, return (number of events received, seconds until the last event received), i.e.,
+        waits for `expected` events, or no more events for `quiet` seconds"""
+        values = self.master.soe_handler.gv_index_value_nested_dict
+        values.pop(EVENT_GV, None)
+        received = lambda: len(values.get(EVENT_GV) or {})
+        start = time.perf_counter()
+        self.master.master.ScanClasses(opendnp3.ClassField().AllEventClasses(), opendnp3.TaskConfig().Default())
+        count, last = 0, start
+        deadline = start + timeout
+        while count < expected and time.perf_counter() < deadline and time.perf_counter() - last < quiet:
+            time.sleep(0.001)
+            if received() > count:
+                count, last = received(), time.perf_counter()
+        return count, last - start
+
+    def shutdown(self):
+        self.master.shutdown()
+
+
+def bench(buffer_size: int, burst_ratios: list, num_samples: int) -> dict:
+    bursts = sorted({max(1, int(buffer_size * ratio)) for ratio in burst_ratios})
+    port = free_port()
+    outstation = Outstation("bench", {
+        "outstation_ip": "0.0.0.0", "port": port, "master_id": 2, "outstation_id": 1,
+        "db_size": {"ai": max(bursts)}, "event_buffer_size": {"ai": buffer_size},
+        "point_config": [{"type": "ai", "class": 1, "static_variation": "30.6", "event_variation": "32.7"}]})
+    master = None
+    try:
+        outstation.start()
+        master = PollingMaster(port)
+        master.poll_events(expected=0)  # note: drain the events of the startup integrity poll
+        runs = []
+        for burst in bursts:
+            received, poll_times = [], []
+            for _ in range(num_samples):
+                indexes = random.sample(range(max(bursts)), burst)
+                outstation.apply_batch({"types": ["Analog"] * burst, "indexes": indexes,
+                                        "values": [random.random() for _ in indexes]})
+                count, poll_time = master.poll_events(expected=burst)
+                received.append(count)
+                poll_times.append(poll_time)
+                master.poll_events(expected=0)  # note: drain the events left over, if any
+            runs.append({"burst": burst, "events_received_min": min(received), "lost": burst - min(received),
+                         "poll": summary_ms(poll_times)})
+        overflow = [run["burst"] for run in runs if run["lost"]]
+        return {"event_buffer_size": buffer_size, "overflow_threshold": overflow[0] if overflow else None,
+                "bursts": runs}
+    finally:
+        if master is not None:
+            master.shutdown()
+        outstation.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buffer-sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--bursts", type=float, nargs="+", default=[0.5, 1, 1.5, 2],
+                        help="burst sizes relative to the event buffer size")
+    parser.add_argument("--samples", type=int, default=5, help="number of bursts per burst size")
+    parser.add_argument("--output", type=str, default=None, help="write results as json to this path")
+    args = parser.parse_args()
+
+    results = {"samples": args.samples,
+               "runs": [bench(buffer_size, args.bursts, args.samples) for buffer_size in args.buffer_sizes]}
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
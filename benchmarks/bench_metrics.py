@@ -0,0 +1,101 @@
+"""
+Benchmark the overhead of the metrics (`Metrics`) on the update hot path.
+
+Measured: the cost of a counter increment and of a histogram observation, and the per-update cost of the
+python-side update loop of `Outstation.apply_measurements` (i.e., deadband check, point store write) without
+and with its metrics, i.e., the per point type counts, the transaction counter and latency histogram.
+No volttron instance (nor opendnp3) is required.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_metrics.py [--batch-size 100] [--batches 2000] [--output results.json]
+"""
+import argparse
+import json
+import random
+import time
+
+from dnp3_outstation.filters import DeadbandFilter
+from dnp3_outstation.metrics import Metrics
+from dnp3_outstation.points import ANALOG_INPUT, BINARY_INPUT
+from dnp3_outstation.store import PointStore
+
+# as `outstation._UPDATE_COUNTERS`, i.e., without importing opendnp3
+UPDATE_COUNTERS = {point_type: (f"updates.{point_type}", f"events.{point_type}", f"suppressed.{point_type}")
+                   for point_type in (ANALOG_INPUT, BINARY_INPUT)}
+
+
+def per_call_ns(fn, num_calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        fn()
+    return (time.perf_counter() - start) / num_calls * 1e9
+
+
+def update_loop(batches, deadband_filter: DeadbandFilter, store: PointStore, metrics: Metrics = None) -> float:
+    """the python-side loop of `apply_measurements`, return the seconds spent"""
+    start = time.perf_counter()
+    for batch in batches:
+        wall_start = time.perf_counter()
+        events, suppressed = {}, {}
+        now = time.time()
+        for point_type, index, value in batch:
+            if deadband_filter.check(point_type, index, value):
+                events[point_type] = events.get(point_type, 0) + 1
+            else:
+                suppressed[point_type] = suppressed.get(point_type, 0) + 1
+        for point_type, index, value in batch:
+            store[point_type].write(index, value, 1, now)
+        if metrics is not None:
+            inc = metrics.inc
+            for point_type, count in events.items():
+                updates_name, events_name, _ = UPDATE_COUNTERS[point_type]
+                inc(updates_name, count)
+                inc(events_name, count)
+            for point_type, count in suppressed.items():
+                updates_name, _, suppressed_name = UPDATE_COUNTERS[point_type]
+                inc(updates_name, count)
+                inc(suppressed_name, count)
+            inc("transactions")
+            metrics.observe("apply", time.perf_counter() - wall_start)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--batches", type=int, default=2000)
+    parser.add_argument("--output", type=str, default=None, help="write results as json to this path")
+    args = parser.parse_args()
+
+    metrics = Metrics()
+    batches = [[(random.choice((ANALOG_INPUT, BINARY_INPUT)), random.randrange(1000), random.random())
+                for _ in range(args.batch_size)] for _ in range(args.batches)]
+    batches = [[(point_type, index, value if point_type == ANALOG_INPUT else value < 0.5)
+                for point_type, index, value in batch] for batch in batches]
+    store = PointStore({ANALOG_INPUT: 1000, BINARY_INPUT: 1000})
+    num_updates = args.batch_size * args.batches
+
+    # warm up, then alternate the runs to even out the noise
+    update_loop(batches[:100], DeadbandFilter(), store)
+    without, with_metrics = [], []
+    for _ in range(3):
+        without.append(update_loop(batches, DeadbandFilter(), store))
+        with_metrics.append(update_loop(batches, DeadbandFilter(), store, Metrics()))
+    without_ns, with_ns = min(without) / num_updates * 1e9, min(with_metrics) / num_updates * 1e9
+
+    results = {
+        "counter_inc_ns": per_call_ns(lambda: metrics.inc("updates.Analog"), 100000),
+        "histogram_observe_ns": per_call_ns(lambda: metrics.observe("apply", 0.0005), 100000),
+        "batch_size": args.batch_size,
+        "update_ns_without_metrics": without_ns,
+        "update_ns_with_metrics": with_ns,
+        "overhead_percent": (with_ns - without_ns) / without_ns * 100,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark loading a large tabular (csv) point registry, and the lookups used on the update path.
+
+Usage:
+    python benchmarks/bench_point_registry.py [--rows 50000] [--output results.json]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from dnp3_outstation.registry import PointRegistry
+
+POINT_TYPES = ("Analog", "AnalogOutputStatus", "Binary", "BinaryOutputStatus")
+
+
+def write_registry(path: str, num_rows: int):
+    with open(path, "w") as f:
+        f.write("name,type,index,scaling,deadband,source_topic\n")
+        for row in range(num_rows):
+            point_type = POINT_TYPES[row % len(POINT_TYPES)]
+            index = row // len(POINT_TYPES)
+            f.write(f"point_{row},{point_type},{index},1.0,0.1,devices/campus/device_{index // 100}/all\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    parser.add_argument("--output", type=str, default=None, help="write results as json to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "points.csv")
+        write_registry(path, args.rows)
+        start = time.perf_counter()
+        point_registry = PointRegistry.from_csv(path)
+        load_s = time.perf_counter() - start
+
+    names = [f"point_{random.randrange(args.rows)}" for _ in range(args.lookups)]
+    start = time.perf_counter()
+    for name in names:
+        point_type, index = point_registry.lookup(name)
+        point_registry.scale(point_type, index, 1.0)
+    lookup_s = time.perf_counter() - start
+
+    results = {
+        "rows": args.rows,
+        "load_s": load_s,
+        "lookup_and_scale_ns": lookup_s / args.lookups * 1e9,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark the memory and latency of the array-backed point store (`PointStore`) versus the nested dict
+of the outstation database (i.e., `db_handler.db`, which the outstation no longer fills), at 1k, 10k and 100k points
+per point type.
+
+Measured per size: memory (tracemalloc) of the database with every point set, bulk write of 10% of the points
+(`write_many` with per-point quality and timestamp, as `Outstation.apply_measurements`), read of all the values
+(`read_range`, as `display_outstation_db`), and a json serialized query page (100 points of a range over half of the
+analog points).
+No volttron instance is required.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_point_store.py [--sizes 1000 10000 100000] [--output results.json]
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from dnp3_outstation.points import POINT_TYPES
+from dnp3_outstation.query import query_points
+from dnp3_outstation.store import PointStore
+
+
+def make_values(point_type: str, num_points: int) -> list:
+    if point_type.startswith("Analog"):
+        return [random.random() for _ in range(num_points)]
+    return [random.random() < 0.5 for _ in range(num_points)]
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def measure_memory(build) -> int:
+    tracemalloc.start()
+    db = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del db
+    return size
+
+
+def bench(num_points: int) -> dict:
+    values = {point_type: make_values(point_type, num_points) for point_type in POINT_TYPES}
+    build_dict = lambda: {point_type: dict(enumerate(values[point_type])) for point_type in POINT_TYPES}
+
+    def build_store():
+        store = PointStore({point_type: num_points for point_type in POINT_TYPES})
+        for point_type in POINT_TYPES:
+            store[point_type].write_range(0, values[point_type])
+        return store
+
+    db, store = build_dict(), build_store()
+    indexes = random.sample(range(num_points), num_points // 10)
+    updates = {point_type: [values[point_type][index] for index in indexes] for point_type in POINT_TYPES}
+
+    def write_dict():
+        for point_type in POINT_TYPES:
+            points = db[point_type]
+            for index, val in zip(indexes, updates[point_type]):
+                points[index] = val
+
+    flags = [1] * len(indexes)
+    timestamps = [time.time()] * len(indexes)
+
+    def write_store():
+        for point_type in POINT_TYPES:
+            store[point_type].write_many(indexes, updates[point_type], flags, timestamps)
+
+    page = lambda target: json.dumps(query_points(target, "Analog", [[0, num_points // 2]], 0, 100))
+
+    return {
+        "points_per_type": num_points,
+        "dict_memory_bytes": measure_memory(build_dict),
+        "store_memory_bytes": measure_memory(build_store),
+        "dict_build_ms": timed(build_dict) * 1e3,
+        "store_build_ms": timed(build_store) * 1e3,
+        "dict_bulk_write_ms": timed(write_dict) * 1e3,
+        "store_bulk_write_ms": timed(write_store) * 1e3,
+        "dict_read_all_ms": timed(lambda: [list(db[point_type].values()) for point_type in POINT_TYPES]) * 1e3,
+        "store_read_all_ms": timed(lambda: [store[point_type].read_range() for point_type in POINT_TYPES]) * 1e3,
+        "dict_query_page_ms": timed(page, db) * 1e3,
+        "store_query_page_ms": timed(page, store) * 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--output", type=str, default=None, help="write results as json to this path")
+    args = parser.parse_args()
+
+    results = [bench(num_points) for num_points in args.sizes]
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark how the apply_update_* RPC response size and latency scale with the database size, for each response
+mode, i.e., "db" (full database), "entry" (changed entry only) and "ack".
+
+The agent is installed on a local volttron test instance (see `bench_agent.AgentUnderTest`), once per database size
+(points per point type, i.e., "db_size"), and its `apply_update_analog_input` and `apply_update_binary_output` RPCs
+are called with each response mode. The latency is the RPC round trip (i.e., including the volttron serialization of
+the response), the size is the json serialized response.
+Requires volttron, volttron-testing and dnp3-python.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_response_mode.py [--sizes 10 100 1000 10000] [--repeat 200]
+        [--output results.json]
+"""
+import argparse
+import json
+import random
+import time
+
+from volttrontesting.fixtures.volttron_platform_fixtures import build_wrapper, cleanup_wrapper
+from volttrontesting.utils import get_rand_vip
+
+from bench_agent import AgentUnderTest, free_port, summary_ms
+from dnp3_outstation.points import ANALOG_TYPES, POINT_TYPES
+
+RPC_VALUES = {"apply_update_analog_input": lambda: random.random(),
+              "apply_update_binary_output": lambda: random.random() < 0.5}
+
+
+def bench_mode(agent: AgentUnderTest, method: str, db_size: int, response_mode: str, repeat: int) -> dict:
+    latencies = []
+    size = 0
+    for _ in range(repeat):
+        val, index = RPC_VALUES[method](), random.randrange(db_size)
+        start = time.perf_counter()
+        response = agent.call(method, val, index, response_mode=response_mode)
+        latencies.append(time.perf_counter() - start)
+        size = len(json.dumps(response).encode())
+    return {"points_per_type": db_size, "method": method, "response_mode": response_mode,
+            "response_bytes": size, "latency": summary_ms(latencies)}
+
+
+def bench(wrapper, caller, db_size: int, modes: list, repeat: int) -> list:
+    agent = AgentUnderTest(wrapper, caller, {"outstation_ip": "0.0.0.0", "port": free_port(), "master_id": 2,
+                                             "outstation_id": 1, "db_size": db_size})
+    try:
+        # note: set every point first (one batch per point type), i.e., the "db" responses carry a value per point
+        for point_type in POINT_TYPES:
+            values = [RPC_VALUES["apply_update_analog_input" if point_type in ANALOG_TYPES
+                                 else "apply_update_binary_output"]() for _ in range(db_size)]
+            agent.call("apply_update_batch", {"types": [point_type] * db_size, "indexes": list(range(db_size)),
+                                              "values": values}, response_mode="ack")
+        return [bench_mode(agent, method, db_size, mode, repeat) for method in RPC_VALUES for mode in modes]
+    finally:
+        agent.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--modes", nargs="+", default=["db", "entry", "ack"])
+    parser.add_argument("--repeat", type=int, default=200, help="number of RPCs per method and response mode")
+    parser.add_argument("--output", type=str, default=None, help="write results as json to this path")
+    args = parser.parse_args()
+
+    wrapper = build_wrapper(get_rand_vip())
+    try:
+        caller = wrapper.build_agent()
+        results = [result for db_size in args.sizes for result in bench(wrapper, caller, db_size, args.modes,
+                                                                         args.repeat)]
+    finally:
+        cleanup_wrapper(wrapper)
+
+    print(f"{'points/type':>12} {'method':>27} {'mode':>6} {'bytes':>10} {'p50(ms)':>9} {'p99(ms)':>9}")
+    for r in results:
+        print(f"{r['points_per_type']:>12} {r['method']:>27} {r['response_mode']:>6} {r['response_bytes']:>10} "
+              f"{r['latency']['p50_ms']:>9.2f} {r['latency']['p99_ms']:>9.2f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark the point update throughput (updates per second) versus the number of outstation worker processes.
+
+Each round sends one batch per outstation (i.e., `apply_update_batch` as forwarded by the agent), with
+`--workers 0` for the outstations hosted in the benchmark process, i.e., without sharding.
+Requires dnp3-python (the outstations listen on `--port` and up), no volttron instance is required.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_sharding.py [--outstations 16] [--workers 0 1 2 4 8 16]
+        [--batch 1000] [--duration 5] [--output results.json]
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+from dnp3_outstation.outstation import Outstation
+from dnp3_outstation.sharding import ShardPool
+
+POINT_TYPES = ("Analog", "AnalogOutputStatus", "Binary", "BinaryOutputStatus")
+
+
+def make_batch(db: dict, batch_size: int) -> dict:
+    """columnar batch of random updates to the points in `db`"""
+    batch = {"types": [], "indexes": [], "values": []}
+    for _ in range(batch_size):
+        point_type = random.choice(POINT_TYPES)
+        batch["types"].append(point_type)
+        batch["indexes"].append(random.choice(list(db[point_type])))
+        batch["values"].append(random.random() if point_type.startswith("Analog") else random.random() < 0.5)
+    return batch
+
+
+def bench(num_outstations: int, num_workers: int, batch_size: int, duration: float, port: int) -> dict:
+    configs = {f"outstation{i}": {"outstation_ip": "0.0.0.0", "port": port + i, "master_id": 2, "outstation_id": 1}
+               for i in range(num_outstations)}
+    names = list(configs)
+    if num_workers:
+        pool = ShardPool(Outstation, configs, num_workers)
+        pool.start()
+        pool.call_many([(name, "start", (), {}) for name in names])
+        dbs = pool.call_many([(name, "db", (), {}) for name in names])
+    else:
+        outstations = [Outstation(name, config) for name, config in configs.items()]
+        for outstation in outstations:
+            outstation.start()
+        dbs = [outstation.db for outstation in outstations]
+    batches = [make_batch(db, batch_size) for db in dbs]
+
+    num_updates = 0
+    rounds = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        if num_workers:
+            results = pool.call_many([(name, "apply_batch", (batch,), {}) for name, batch in zip(names, batches)])
+        else:
+            results = [outstation.apply_batch(batch) for outstation, batch in zip(outstations, batches)]
+        num_updates += sum(result["applied"] for result in results)
+        rounds += 1
+    elapsed = time.perf_counter() - start
+
+    if num_workers:
+        pool.close()
+    else:
+        for outstation in outstations:
+            outstation.shutdown()
+    return {"outstations": num_outstations, "workers": num_workers, "batch": batch_size, "rounds": rounds,
+            "updates": num_updates, "updates_per_s": num_updates / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--outstations", type=int, default=16)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4, 8, 16])
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--port", type=int, default=20000)
+    parser.add_argument("--output", type=str, default=None, help="write results as json to this path")
+    args = parser.parse_args()
+
+    results = []
+    for run, num_workers in enumerate(args.workers):
+        # note: new ports for every run, the previous listeners may still be closing
+        port = args.port + run * args.outstations
+        results.append(bench(args.outstations, num_workers, args.batch, args.duration, port))
+    print(f"cpus: {os.cpu_count()}")
+    print(f"{'workers':>8} {'updates/s':>12} {'speedup':>8}")
+    for r in results:
+        print(f"{r['workers']:>8} {r['updates_per_s']:>12.0f} {r['updates_per_s'] / results[0]['updates_per_s']:>8.2f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
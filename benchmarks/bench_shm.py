@@ -0,0 +1,148 @@
+"""
+Benchmark the shared-memory ingestion ring (`ShmRingBuffer`) against the RPC path (`apply_update_batch`).
+
+Measured (local, no volttron instance nor opendnp3 required):
+    - ring: a producer process writes the records in chunks of `--chunk-size`, this process drains them as
+      columnar batches, i.e., records per second end to end across the two processes
+    - rpc serialization: json encode + decode of the same records as `apply_update_batch` batches, i.e.,
+      the lower bound of the RPC path cost (without the message bus hops)
+With `--agent` (requires volttron, volttron-testing and dnp3-python): the agent installed on a local volttron test
+instance with a "shm_ring", then the records per second into the outstation via `apply_update_batch` RPCs versus
+the ring (until the agent drained all the records), and the ring write-to-drain latency.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_shm.py [--records 1000000] [--chunk-size 1000] [--agent]
+        [--output results.json]
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import time
+
+from dnp3_outstation.shm import ShmRingBuffer
+
+DB_SIZE = 1000
+
+
+def make_records(num_records: int) -> list:
+    return [("Analog", random.randrange(DB_SIZE), random.random(), None, None) for _ in range(num_records)]
+
+
+def chunks(records: list, chunk_size: int):
+    for start in range(0, len(records), chunk_size):
+        yield records[start:start + chunk_size]
+
+
+def produce(name: str, num_records: int, chunk_size: int):
+    """producer process, write the records as fast as the consumer drains them"""
+    ring = ShmRingBuffer.attach(name)
+    for chunk in chunks(make_records(num_records), chunk_size):
+        while chunk:
+            chunk = chunk[ring.write(chunk):]
+    ring.close()
+
+
+def bench_ring_local(num_records: int, chunk_size: int, capacity: int) -> dict:
+    ring = ShmRingBuffer.create(capacity=capacity)
+    try:
+        process = multiprocessing.get_context("spawn").Process(target=produce, args=(ring.name, num_records,
+                                                                                     chunk_size))
+        process.start()
+        # Note: measured from the first record, i.e., excluding the producer process start
+        while not len(ring):
+            pass
+        start = time.perf_counter()
+        drained = drains = 0
+        while drained < num_records:
+            num_drained = len(ring.read_batch()["types"])
+            drained += num_drained
+            drains += num_drained > 0
+        elapsed = time.perf_counter() - start
+        process.join()
+        return {"records_per_s": drained / elapsed, "drains": drains, "dropped": ring.dropped}
+    finally:
+        ring.close()
+
+
+def bench_rpc_serialization(num_records: int, chunk_size: int) -> dict:
+    records = make_records(num_records)
+    start = time.perf_counter()
+    for chunk in chunks(records, chunk_size):
+        batch = {"types": [record[0] for record in chunk], "indexes": [record[1] for record in chunk],
+                 "values": [record[2] for record in chunk]}
+        json.loads(json.dumps({"method": "apply_update_batch", "args": [batch]}))
+    return {"records_per_s": num_records / (time.perf_counter() - start)}
+
+
+def bench_agent(num_records: int, chunk_size: int, capacity: int) -> dict:
+    from volttrontesting.fixtures.volttron_platform_fixtures import build_wrapper, cleanup_wrapper
+    from volttrontesting.utils import get_rand_vip
+
+    from bench_agent import AgentUnderTest, free_port, wait_until
+
+    ring_name = f"dnp3_bench_{free_port()}"
+    wrapper = build_wrapper(get_rand_vip())
+    try:
+        caller = wrapper.build_agent()
+        agent = AgentUnderTest(wrapper, caller, {"outstation_ip": "0.0.0.0", "port": free_port(), "master_id": 2,
+                                                 "outstation_id": 1, "db_size": DB_SIZE, "shm_ring": ring_name,
+                                                 "shm_ring_capacity": capacity, "shm_drain_interval": 0.005})
+        try:
+            records = make_records(num_records)
+            start = time.perf_counter()
+            for chunk in chunks(records, chunk_size):
+                agent.call("apply_update_batch", {"types": [record[0] for record in chunk],
+                                                  "indexes": [record[1] for record in chunk],
+                                                  "values": [record[2] for record in chunk]}, response_mode="ack")
+            rpc_rate = num_records / (time.perf_counter() - start)
+
+            ring = ShmRingBuffer.attach(ring_name)
+            try:
+                start = time.perf_counter()
+                for chunk in chunks(records, chunk_size):
+                    while chunk:
+                        chunk = chunk[ring.write(chunk):]
+                wait_until(lambda: not len(ring), timeout=60)
+                ring_rate = num_records / (time.perf_counter() - start)
+
+                latencies = []
+                for record in records[:100]:
+                    start = time.perf_counter()
+                    ring.write([record])
+                    wait_until(lambda: not len(ring), timeout=5, interval=0.0001)
+                    latencies.append(time.perf_counter() - start)
+            finally:
+                ring.close()
+            latencies.sort()
+            return {"rpc_records_per_s": rpc_rate, "ring_records_per_s": ring_rate,
+                    "ring_latency_p50_ms": latencies[len(latencies) // 2] * 1e3,
+                    "ring_latency_max_ms": latencies[-1] * 1e3}
+        finally:
+            agent.remove()
+    finally:
+        cleanup_wrapper(wrapper)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1000000)
+    parser.add_argument("--chunk-size", type=int, default=1000, help="records per ring write / RPC batch")
+    parser.add_argument("--capacity", type=int, default=65536, help="ring capacity (records)")
+    parser.add_argument("--agent", action="store_true", help="also benchmark end to end with the agent")
+    parser.add_argument("--output", type=str, default=None, help="write results as json to this path")
+    args = parser.parse_args()
+
+    results = {"records": args.records, "chunk_size": args.chunk_size, "capacity": args.capacity,
+               "ring_local": bench_ring_local(args.records, args.chunk_size, args.capacity),
+               "rpc_serialization": bench_rpc_serialization(args.records, args.chunk_size)}
+    if args.agent:
+        results["agent"] = bench_agent(args.records, args.chunk_size, args.capacity)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
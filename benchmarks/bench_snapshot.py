@@ -0,0 +1,58 @@
+"""
+Benchmark the persistent point snapshot: incremental flush cost versus the number of changed points,
+and the restore (load) time versus the database size.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--sizes 1000 10000 100000] [--changed 10 100 1000] [--output results.json]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from dnp3_outstation.snapshot import PointSnapshotStore
+
+
+def bench(num_points: int, changed: list) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = PointSnapshotStore(os.path.join(tmp_dir, "snapshot.sqlite"))
+        for index in range(num_points):
+            store.mark("Analog", index, random.random())
+        start = time.perf_counter()
+        store.flush()
+        full_flush_s = time.perf_counter() - start
+
+        flush_s = {}
+        for num_changed in changed:
+            for index in random.sample(range(num_points), min(num_changed, num_points)):
+                store.mark("Analog", index, random.random())
+            start = time.perf_counter()
+            store.flush()
+            flush_s[num_changed] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        num_loaded = sum(1 for _ in store.load())
+        load_s = time.perf_counter() - start
+        store.close()
+    return {"points": num_points, "full_flush_s": full_flush_s, "flush_s_by_changed": flush_s,
+            "load_s": load_s, "loaded": num_loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--changed", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--output", type=str, default=None, help="write results as json to this path")
+    args = parser.parse_args()
+
+    results = [bench(num_points, args.changed) for num_points in args.sizes]
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Event buffer occupancy estimate and admission control of the point updates.
+
+opendnp3 drops the oldest events once an event buffer (one per point type, see "event_buffer_size") is full, and
+neither reports its occupancy nor the events read by the masters. The occupancy is thus estimated from the events
+the agent generates: the events are pending until the master reads them, i.e., within the master event poll
+interval ("event_poll_interval", 0 for unsolicited reporting), or, while no master is connected, until a master
+connects (i.e., its startup integrity poll).
+
+Above the high watermark ("event_high_watermark", a fraction of the buffer capacity), the bulk updates are handled
+according to "event_admission":
+    "hint": applied, the result carries a "backpressure" hint, i.e., the producers should slow down
+    "coalesce": the updates beyond the watermark are deferred (the latest value per point), and applied once the
+        buffer has room again, i.e., the intermediate values of a point are dropped rather than the oldest events
+    "reject": the updates beyond the watermark are reported as errors, i.e., the producers retry them
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dnp3_outstation.points import POINT_TYPES
+
+# config keys of the admission control, i.e., applied by resetting the outstation
+ADMISSION_CONFIG_KEYS = ("event_poll_interval", "event_high_watermark", "event_admission")
+ADMISSION_POLICIES = ("hint", "coalesce", "reject")
+DEFAULT_ADMISSION_POLICY = "hint"
+DEFAULT_HIGH_WATERMARK = 0.8
+POINT_CLASSES = (1, 2, 3)
+
+
+class EventBufferMonitor:
+    """Estimated number of events pending in the opendnp3 event buffers, per point type and per event class.
+
+    capacities: event buffer capacity per point type
+    poll_interval: seconds between the master event polls, 0 for unsolicited reporting
+    Thread-safe, i.e., the master commands are recorded from the opendnp3 thread.
+    """
+
+    def __init__(self, capacities: Dict[str, int], poll_interval: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if poll_interval < 0:
+            raise ValueError(f"event_poll_interval {poll_interval} should not be negative")
+        self.capacities = dict(capacities)
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.connected = False
+        # [time, point_type, point_class, count] of the pending events, oldest first
+        self._window = deque()
+        self._pending_types: Dict[str, int] = {point_type: 0 for point_type in POINT_TYPES}
+        self._pending_classes: Dict[int, int] = {point_class: 0 for point_class in POINT_CLASSES}
+        self.lost: Dict[str, int] = {point_type: 0 for point_type in POINT_TYPES}
+        self._lock = threading.Lock()
+
+    def set_connected(self, connected: bool):
+        """update the master connection state, i.e., a master connecting reads all the pending events"""
+        with self._lock:
+            if connected and not self.connected:
+                self._discard(self._window)
+            self.connected = connected
+
+    def _discard(self, entries):
+        for _, point_type, point_class, count in entries:
+            self._pending_types[point_type] -= count
+            self._pending_classes[point_class] -= count
+        entries.clear()
+
+    def _expire(self, now: float):
+        """drop the events read by the (modeled) master polls"""
+        if not self.connected:
+            return
+        window = self._window
+        expired = []
+        while window and window[0][0] <= now - self.poll_interval:
+            expired.append(window.popleft())
+        self._discard(expired)
+
+    def _drop_oldest(self, point_type: str, count: int):
+        """drop the `count` oldest events of `point_type`, i.e., as opendnp3 does on a buffer overflow"""
+        for entry in self._window:
+            if not count:
+                break
+            if entry[1] != point_type or not entry[3]:
+                continue
+            dropped = min(count, entry[3])
+            entry[3] -= dropped
+            self._pending_types[point_type] -= dropped
+            self._pending_classes[entry[2]] -= dropped
+            count -= dropped
+
+    def record(self, counts: Dict[Tuple[str, int], int]):
+        """add the events of one transaction, i.e., (point_type, point_class) -> number of events
+        Note: class 0 points do not generate events"""
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            for (point_type, point_class), count in counts.items():
+                if not point_class or not count:
+                    continue
+                self._window.append([now, point_type, point_class, count])
+                self._pending_types[point_type] += count
+                self._pending_classes[point_class] += count
+                overflow = self._pending_types[point_type] - self.capacities.get(point_type, 0)
+                if overflow > 0:
+                    self.lost[point_type] += overflow
+                    self._drop_oldest(point_type, overflow)
+
+    def admit(self, keys: List[Tuple[str, int]], high_watermark: float) -> List[bool]:
+        """whether each (point_type, point_class) update fits under the high watermark, in order, i.e., the
+        updates beyond the headroom of their point type are not admitted (class 0 updates always are)"""
+        with self._lock:
+            self._expire(self.clock())
+            headroom = {point_type: int(high_watermark * capacity) - self._pending_types[point_type]
+                        for point_type, capacity in self.capacities.items()}
+        admitted = []
+        for point_type, point_class in keys:
+            if not point_class:
+                admitted.append(True)
+            elif headroom.get(point_type, 0) > 0:
+                headroom[point_type] -= 1
+                admitted.append(True)
+            else:
+                admitted.append(False)
+        return admitted
+
+    def occupancy(self) -> float:
+        """the highest occupancy (pending events / capacity) across the point types"""
+        with self._lock:
+            self._expire(self.clock())
+            return max((self._pending_types[point_type] / capacity
+                        for point_type, capacity in self.capacities.items() if capacity), default=0.0)
+
+    def retry_after(self) -> Optional[float]:
+        """seconds until the oldest pending events are read (modeled), None while no master is connected"""
+        if not self.connected:
+            return None
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            if not self._window:
+                return 0.0
+            return max(0.0, self._window[0][0] + self.poll_interval - now)
+
+    def snapshot(self) -> dict:
+        """{"occupancy": <highest ratio>, "connected": bool,
+            "classes": {"1": <pending events>, "2": ..., "3": ...},
+            "types": {"Analog": {"pending": n, "capacity": n, "occupancy": ratio}, ...},
+            "lost": {"Analog": <events dropped on overflow>, ...}}"""
+        with self._lock:
+            self._expire(self.clock())
+            types = {point_type: {"pending": self._pending_types[point_type], "capacity": capacity,
+                                  "occupancy": self._pending_types[point_type] / capacity if capacity else 0.0}
+                     for point_type, capacity in self.capacities.items()}
+            return {"occupancy": max((val["occupancy"] for val in types.values()), default=0.0),
+                    "connected": self.connected,
+                    "classes": {str(point_class): count for point_class, count in self._pending_classes.items()},
+                    "types": types, "lost": dict(self.lost)}
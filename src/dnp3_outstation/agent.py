@@ -23,30 +23,61 @@
 
 from pathlib import Path
 from pprint import pformat
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
 from volttron.client.messaging import (headers)
 from volttron.utils import (format_timestamp, get_aware_utc_now, load_config,
                             setup_logging, vip_main)
 
+import base64
+import json
 import logging
+import resource
 import sys
+import time
+import uuid
 import gevent
+import gevent.event
+import gevent.lock
+import gevent.queue
+import gevent.socket
 
 from dnp3_python.dnp3station.outstation_new import MyOutStationNew
-from pydnp3 import opendnp3
 from volttron.client.vip.agent import Agent, Core, RPC
 
+from dnp3_outstation.admission import ADMISSION_CONFIG_KEYS
+from dnp3_outstation.cache import SnapshotCache
+from dnp3_outstation.commands import DEFAULT_COMMAND_TOPIC, CommandQueue, LatencyStats
+from dnp3_outstation.database import DATABASE_CONFIG_KEYS, check_database_config
+from dnp3_outstation.ingest import TopicPatterns, subscription_prefixes
+from dnp3_outstation.metrics import Metrics, timed_method
+from dnp3_outstation.outstation import DEFAULT_OUTSTATION_NAME, Outstation
+from dnp3_outstation.points import ANALOG_INPUT, ANALOG_OUTPUT, BINARY_INPUT, BINARY_OUTPUT, parse_timestamp
+from dnp3_outstation.replay import DEFAULT_LAG_TOLERANCE, ReplayEngine
+from dnp3_outstation.routing import (COMM_LOST, DEFAULT_COMMAND_TIMEOUT, DEFAULT_DRIVER_IDENTITY, CommandRouter,
+                                     Route)
+from dnp3_outstation.sharding import RemoteOutstation, ShardPool, ShardWorker
+from dnp3_outstation.stream import DEFAULT_STREAM_MAX_EVENTS, DEFAULT_STREAM_MAX_POINTS, ChangeStream, ClientQueue
+from dnp3_outstation.web import (DEFAULT_WEB_BATCH_SIZE, JSON_CONTENT_TYPE, NDJSON_CONTENT_TYPE, apply_bulk_updates,
+                                 iter_body_items, iter_query_json, iter_query_ndjson, parse_query_string)
+
 setup_logging()
 _log = logging.getLogger(__name__)
 __version__ = "1.0"
 
+# what the apply_update_* RPCs return: the full database, only the changed entry, or an acknowledgement
+RESPONSE_MODES = ("db", "entry", "ack")
+DEFAULT_RESPONSE_MODE = "db"
+
 
 class Dnp3OutstationAgent(Agent):
     """This is class is a subclass of the Volttron Agent;
         This agent is an implementation of a DNP3 outstation;
         The agent overrides @Core.receiver methods to modify agent life cycle behavior;
         The agent exposes @RPC.export as public interface utilizing RPC calls.
+    Note: the agent can host many outstations (see "outstations" config), the RPCs take an optional
+        `outstation` name, default to the first outstation. With "num_workers", the outstations are sharded
+        across worker processes, and the agent forwards the calls to them.
     """
 
     def __init__(self, config_path: str, **kwargs) -> None:
@@ -62,35 +93,124 @@ class Dnp3OutstationAgent(Agent):
         #  and add config from "config store"
         try:
             _log.info("Using config_from_path {config_from_path}")
-            self._dnp3_outstation_config = config_from_path
-            self.outstation_application = MyOutStationNew(**self._dnp3_outstation_config)
+            self._agent_config = config_from_path
+            self.outstations: Dict[str, Union[Outstation, RemoteOutstation]] = \
+                self._create_outstations(self._agent_config)
         except Exception as e:
             _log.error(e)
             _log.info(f"Failed to use config_from_path {config_from_path}"
                       f"Using default_config {default_config}")
-            self._dnp3_outstation_config = default_config
-            self.outstation_application = MyOutStationNew(**self._dnp3_outstation_config)
-
-        # SubSystem/ConfigStore
-        self.vip.config.set_default("config", default_config)
+            self._agent_config = default_config
+            self.outstations: Dict[str, Union[Outstation, RemoteOutstation]] = \
+                self._create_outstations(self._agent_config)
+        self._default_outstation: str = next(iter(self.outstations))
+
+        self.response_mode: str = self._check_response_mode(
+            self._agent_config.get("response_mode", DEFAULT_RESPONSE_MODE))
+
+        # pub/sub ingestion, i.e., topic (or pattern) -> outstations with fields mapped to points
+        self.coalesce_window: float = float(self._agent_config.get("coalesce_window", 0))
+        self._topic_outstations: Dict[str, List[Outstation]] = {}
+        for outstation in self.outstations.values():
+            for topic in outstation.topics:
+                self._topic_outstations.setdefault(topic, []).append(outstation)
+        self._topic_patterns = TopicPatterns(self._topic_outstations)
+
+        # event buffer admission control, i.e., the deferred updates ("coalesce") retried every
+        # deferred_flush_interval seconds
+        self.deferred_flush_interval: float = float(self._agent_config.get("deferred_flush_interval", 1))
+
+        # shared-memory ingestion, i.e., the "shm_ring" of the outstations drained every shm_drain_interval seconds
+        self.shm_drain_interval: float = float(self._agent_config.get("shm_drain_interval", 0.01))
+
+        # persistent point snapshot, i.e., warm restart
+        self.snapshot_interval: float = float(self._agent_config.get("snapshot_interval", 5))
+
+        # master command publication, i.e., handoff from the opendnp3 thread, then publish to command_topic
+        self.command_topic: str = self._agent_config.get("command_topic", DEFAULT_COMMAND_TOPIC)
+        self._command_queue = CommandQueue()
+        self.command_latency = LatencyStats()
+        self._command_watcher = None
+
+        # master command forwarding to the platform driver, i.e., routing table and bounded dispatch pool
+        try:
+            self.command_router = CommandRouter.from_config(
+                self._agent_config.get("command_routes", []),
+                float(self._agent_config.get("command_timeout", DEFAULT_COMMAND_TIMEOUT)))
+        except (TypeError, ValueError) as e:
+            _log.error(f"Invalid command_routes config, command forwarding is disabled: {e}")
+            self.command_router = CommandRouter()
+        self.driver_identity: str = self._agent_config.get("driver_identity", DEFAULT_DRIVER_IDENTITY)
+        self.command_max_concurrency: int = int(self._agent_config.get("command_max_concurrency", 10))
+        self._dispatch_queue = gevent.queue.Queue(maxsize=100 * self.command_max_concurrency)
+        self.dispatch_counts = {"dispatched": 0, "succeeded": 0, "failed": 0, "timeout": 0, "rejected": 0}
+        self.dispatch_latency = LatencyStats()
+
+        # agent metrics, i.e., per RPC latency histograms, see `get_metrics`, optionally published to metrics_topic
+        self.metrics = Metrics()
+        self.metrics_topic: str = self._agent_config.get("metrics_topic")
+        self.metrics_interval: float = float(self._agent_config.get("metrics_interval", 60))
+        # database and config responses, rebuilt at most once per write transaction (see `Outstation.versions`)
+        self.snapshot_cache = SnapshotCache(self.metrics, lock_factory=gevent.lock.Semaphore)
+
+        # HTTP bulk update and query endpoints, i.e., <web_prefix>/points on the platform web service
+        # Note: opt-in (unauthenticated writes to the points), i.e., registered only if web_prefix is configured
+        self.web_prefix: Optional[str] = self._agent_config.get("web_prefix") or None
+        self.web_batch_size: int = int(self._agent_config.get("web_batch_size", DEFAULT_WEB_BATCH_SIZE))
+        # push stream, i.e., <web_prefix>/stream websockets of point changes, master commands and connection states
+        self.stream_interval: float = float(self._agent_config.get("stream_interval", 0.1))
+        self.change_stream = ChangeStream(
+            int(self._agent_config.get("stream_max_points", DEFAULT_STREAM_MAX_POINTS)),
+            int(self._agent_config.get("stream_max_events", DEFAULT_STREAM_MAX_EVENTS)))
+        self._stream_endpoints: Dict[str, float] = {}  # websocket endpoint -> creation time, until opened
+        self._stream_connected: Dict[str, bool] = {}
+
+        # replay of recorded point values, see `start_replay`
+        self._replay: Optional[ReplayEngine] = None
+
+        # SubSystem/ConfigStore, i.e., the outstations are reset on "config" updates, see `_configure`
+        self.vip.config.set_default("config", self._agent_config)
         self.vip.config.subscribe(
-            self._config_callback_dummy,  # TODO: cleanup: used to be _configure_ven_client
+            self._configure,
             actions=["NEW", "UPDATE"],
             pattern="config",
-        )  # TODO: understand what vip.config.subscribe does
+        )
+
+    @property
+    def outstation_application(self) -> MyOutStationNew:
+        """the (default) outstation application, None if hosted by a worker process"""
+        return getattr(self.outstations[self._default_outstation], "application", None)
 
     @property
     def dnp3_outstation_config(self):
-        return self._dnp3_outstation_config
+        return self.outstations[self._default_outstation].config
 
     @dnp3_outstation_config.setter
     def dnp3_outstation_config(self, config: dict):
         # TODO: add validation
-        self._dnp3_outstation_config = config
-
-    def _config_callback_dummy(self, config_name: str, action: str,
-                               contents: Dict) -> None:
-        pass
+        self.outstations[self._default_outstation].config = config
+
+    def _configure(self, config_name: str, action: str, contents: Dict) -> None:
+        """apply a "config" store update, i.e., reset the outstations whose config changed (e.g., "db_size",
+        "event_buffer_size", "point_config"), the agent-level settings and the hosted outstations (added or
+        removed) take effect on the agent restart"""
+        if not contents or contents == self._agent_config:
+            return
+        try:
+            outstation_configs = self._outstation_configs(contents)
+            for outstation_config in outstation_configs.values():
+                check_database_config(outstation_config)
+        except (TypeError, ValueError) as e:
+            _log.error(f"Invalid {config_name} from the config store ({action}), keeping the current config: {e}")
+            return
+        if set(outstation_configs) != set(self.outstations):
+            _log.warning(f"Hosted outstations changed to {list(outstation_configs)}, restart the agent to apply")
+        self._agent_config = contents
+        for name, outstation_config in outstation_configs.items():
+            target = self.outstations.get(name)
+            if target is not None and target.config != outstation_config:
+                target.config = outstation_config
+                self.reset_outstation(name)
 
     @Core.receiver("onstart")
     def onstart(self, sender, **kwargs):
@@ -103,7 +223,33 @@ class Dnp3OutstationAgent(Agent):
         """
 
         # for dnp3 outstation
-        self.outstation_application.start()
+        if self.command_topic or len(self.command_router) or self.web_prefix:
+            self._start_command_handoff()
+        for _ in range(self.command_max_concurrency if len(self.command_router) else 0):
+            gevent.spawn(self._run_command_dispatcher)
+        self._call_all("start")
+        if any(outstation.config.get("snapshot_path") for outstation in self.outstations.values()):
+            self.core.periodic(self.snapshot_interval, self._flush_snapshots)
+
+        # pub/sub ingestion
+        for prefix in subscription_prefixes(self._topic_outstations):
+            self.vip.pubsub.subscribe(peer="pubsub", prefix=prefix, callback=self._on_ingest_publish)
+        if self._topic_outstations and self.coalesce_window > 0:
+            self.core.periodic(self.coalesce_window, self._flush_coalesced_updates)
+        if any(outstation.config.get("shm_ring") for outstation in self.outstations.values()):
+            self.core.periodic(self.shm_drain_interval, self._drain_rings)
+        if any(outstation.config.get("event_admission") == "coalesce" for outstation in self.outstations.values()):
+            self.core.periodic(self.deferred_flush_interval, self._flush_deferred_updates)
+        _log.info(f"Started {len(self.outstations)} outstations, subscribed to {len(self._topic_outstations)} topics")
+        if self.metrics_topic:
+            self.core.periodic(self.metrics_interval, self._publish_metrics)
+        if self.web_prefix:
+            try:
+                self.vip.web.register_endpoint(f"{self.web_prefix}/points", self._web_points, "raw")
+                self.vip.web.register_endpoint(f"{self.web_prefix}/stream", self._web_stream, "raw")
+                self.core.periodic(self.stream_interval, self._pump_stream)
+            except Exception as e:
+                _log.warning(f"Failed to register the web endpoints (is the platform web service enabled?): {e}")
 
         # Example publish to pubsub
         # self.vip.pubsub.publish('pubsub', "some/random/topic", message="HI!")
@@ -113,6 +259,23 @@ class Dnp3OutstationAgent(Agent):
         # pass
         # self._create_subscriptions(self.setting2)
 
+    @Core.receiver("onstop")
+    def onstop(self, sender, **kwargs):
+        """
+        This method is called when the Agent is about to shutdown, but before it disconnects from
+        the message bus.
+        """
+        if self._command_watcher is not None:
+            self._command_watcher.stop()
+        if self._replay is not None:
+            self._replay.stop()
+        if self._shard_pool is not None:
+            # Note: the workers close their outstations on exit
+            self._shard_pool.close()
+            return
+        for outstation in self.outstations.values():
+            outstation.close()
+
     # ***************** Helper methods ********************
     def _parse_config(self, config_path: str) -> Dict:
         """Parses the agent's configuration file.
@@ -120,7 +283,6 @@ class Dnp3OutstationAgent(Agent):
         :param config_path: The path to the configuration file
         :return: The configuration
         """
-        # TODO: added capability to configuration based on tabular config file (e.g., csv)
         try:
             config = load_config(config_path)
         except NameError as err:
@@ -134,7 +296,345 @@ class Dnp3OutstationAgent(Agent):
             raise Exception("Configuration cannot be empty.")
         return config
 
+    @staticmethod
+    def _outstation_configs(config: dict) -> Dict[str, dict]:
+        """Outstation name -> config of the hosted outstations.
+        Without "outstations", the agent config is the config of a single outstation,
+        otherwise each "outstations" entry (which requires a unique "name") overrides the agent-level keys.
+        """
+        entries = config.get("outstations")
+        if entries is None:
+            return {config.get("name", DEFAULT_OUTSTATION_NAME): config}
+
+        base_config = {key: val for key, val in config.items() if key != "outstations"}
+        outstation_configs = {}
+        for entry in entries:
+            outstation_config = {**base_config, **entry}
+            name = entry.get("name")
+            if not name or name in outstation_configs:
+                raise ValueError(f"outstation {entry} requires a unique 'name'")
+            outstation_configs[name] = outstation_config
+        snapshot_paths = [outstation_config["snapshot_path"] for outstation_config in outstation_configs.values()
+                          if outstation_config.get("snapshot_path")]
+        if len(snapshot_paths) != len(set(snapshot_paths)):
+            raise ValueError(f"outstations should not share a snapshot_path, got {snapshot_paths}")
+        shm_rings = [outstation_config["shm_ring"] for outstation_config in outstation_configs.values()
+                     if outstation_config.get("shm_ring")]
+        if len(shm_rings) != len(set(shm_rings)):
+            raise ValueError(f"outstations should not share a shm_ring, got {shm_rings}")
+        if not outstation_configs:
+            raise ValueError("outstations config cannot be empty")
+        return outstation_configs
+
+    def _create_outstations(self, config: dict) -> Dict[str, Union[Outstation, RemoteOutstation]]:
+        """Create the hosted outstations from the agent config, either in the agent process,
+        or sharded across "num_workers" worker processes"""
+        outstation_configs = self._outstation_configs(config)
+        num_workers = int(config.get("num_workers", 0))
+        self._shard_pool = None
+        if num_workers <= 0:
+            return {name: Outstation(name, outstation_config)
+                    for name, outstation_config in outstation_configs.items()}
+
+        shard_pool = ShardPool(Outstation, outstation_configs, num_workers,
+                               wait_read=gevent.socket.wait_read, lock_factory=gevent.lock.Semaphore)
+        shard_pool.start()
+        self._shard_pool = shard_pool
+        names = list(outstation_configs)
+        topics = shard_pool.call_many([(name, "topics", (), {}) for name in names])
+        return {name: RemoteOutstation(shard_pool, name, outstation_configs[name], outstation_topics)
+                for name, outstation_topics in zip(names, topics)}
+
+    def _get_outstation(self, outstation: str = None) -> Outstation:
+        """get a hosted outstation by name, default to the first outstation"""
+        if outstation is None:
+            outstation = self._default_outstation
+        try:
+            return self.outstations[outstation]
+        except KeyError:
+            raise ValueError(f"unknown outstation {outstation!r}, should be one of {list(self.outstations)}")
+
+    @staticmethod
+    def _check_response_mode(response_mode: str) -> str:
+        if response_mode not in RESPONSE_MODES:
+            raise ValueError(f"response_mode {response_mode!r} should be one of {RESPONSE_MODES}")
+        return response_mode
+
+    def _apply_point(self, point_type: str, index: int, val: Any, response_mode: str = None,
+                     outstation: str = None, flags: Union[int, str, list] = None,
+                     timestamp: Union[float, str] = None) -> dict:
+        """apply a single point update, then build the RPC response according to `response_mode`"""
+        response_mode = self._check_response_mode(response_mode or self.response_mode)
+        return self._get_outstation(outstation).apply_point(point_type, index, val, response_mode, flags, timestamp)
+
+    def _call_all(self, method: str, *args) -> Dict[str, Any]:
+        """call `method` of every hosted outstation, i.e., in parallel across the workers if sharded,
+        return the results by outstation name"""
+        if self._shard_pool is not None:
+            results = self._shard_pool.call_many([(name, method, args, {}) for name in self.outstations])
+            return dict(zip(self.outstations, results))
+        return {name: getattr(outstation, method)(*args) for name, outstation in self.outstations.items()}
+
+    def _on_ingest_publish(self, peer, sender, bus, topic, headers, message):
+        """pub/sub callback, map the message fields to the points of each subscribed outstation,
+        then either apply them as one batch or hold them until the next coalescing flush"""
+        self.metrics.inc("ingest.messages")
+        # Note: an outstation may subscribe to several matching topics (e.g., patterns), it ingests the message once
+        outstations = {outstation.name: outstation for matching_topic in self._topic_patterns.match(topic)
+                       for outstation in self._topic_outstations[matching_topic]}
+        for outstation in outstations.values():
+            outstation.ingest(topic, message, coalesce=self.coalesce_window > 0)
+
+    def _flush_coalesced_updates(self):
+        self._call_all("flush_coalesced")
+
+    def _flush_deferred_updates(self):
+        self._call_all("flush_deferred")
+
+    def _drain_rings(self):
+        self._call_all("drain_ring")
+
+    def _web_points(self, env: dict, data: Union[str, bytes]) -> tuple:
+        """<web_prefix>/points endpoint (raw response, i.e., (status, base64 body, headers)), query parameters:
+            POST: bulk update, the body is a json array or json lines of update rows or objects (see
+                `apply_update_batch`), applied in chunks of web_batch_size updates; "outstation", "flags" and
+                "timestamp" (defaults of the updates without their own)
+            GET: query (see `query_outstation_db`), "outstation", "types" (comma separated), "indexes" (e.g., 0-9,15),
+                "offset", "limit" and "format" ("json" or "ndjson")
+        """
+        method = env.get("REQUEST_METHOD", "GET")
+        params = parse_query_string(env.get("QUERY_STRING"))
+        try:
+            outstation = self._get_outstation(params.get("outstation"))
+            if method == "POST":
+                self.metrics.inc("web.updates")
+                result = apply_bulk_updates(
+                    lambda chunk: outstation.apply_batch(chunk, "ack", flags=params.get("flags"),
+                                                         timestamp=params.get("timestamp")),
+                    iter_body_items(data or "", env.get("CONTENT_TYPE")), self.web_batch_size)
+                status = "400 Bad Request" if "error" in result else "200 OK"
+                return self._web_response(status, [json.dumps(result).encode()])
+            if method == "GET":
+                self.metrics.inc("web.queries")
+                point_types = params["types"].split(",") if params.get("types") else None
+                offset = int(params.get("offset", 0))
+                limit = int(params["limit"]) if params.get("limit") else None
+                if params.get("format") == "ndjson":
+                    chunks = iter_query_ndjson(outstation.query, point_types, params.get("indexes"), offset, limit)
+                    return self._web_response("200 OK", chunks, NDJSON_CONTENT_TYPE)
+                if point_types is None and params.get("indexes") is None and not offset and limit is None:
+                    # Note: the whole database, i.e., one serialized payload shared until the next write
+                    body = self.snapshot_cache.get(("web_db", outstation.name), outstation.versions()["db"],
+                                                   lambda: b"".join(iter_query_json(outstation.query))).value
+                    return self._web_response("200 OK", [body])
+                chunks = iter_query_json(outstation.query, point_types, params.get("indexes"), offset, limit)
+                return self._web_response("200 OK", chunks)
+            return self._web_response("405 Method Not Allowed", [json.dumps({"error": f"{method} not allowed, "
+                                                                             f"use GET or POST"}).encode()])
+        except (TypeError, ValueError) as e:
+            self.metrics.inc("web.errors")
+            return self._web_response("400 Bad Request", [json.dumps({"error": str(e)}).encode()])
+
+    def _web_stream(self, env: dict, data: Union[str, bytes]) -> tuple:
+        """<web_prefix>/stream endpoint, POST creates a stream client, i.e., returns the websocket endpoint
+        {"websocket": "<web_prefix>/stream/<client id>"} the client should connect to (within 60 seconds)"""
+        if env.get("REQUEST_METHOD") != "POST":
+            return self._web_response("405 Method Not Allowed", [b'{"error": "use POST to create a stream client"}'])
+        endpoint = f"{self.web_prefix}/stream/{uuid.uuid4().hex[:12]}"
+        self.vip.web.register_websocket(endpoint, self._stream_opened, self._stream_closed, self._stream_received)
+        self._stream_endpoints[endpoint] = time.monotonic()
+        return self._web_response("200 OK", [json.dumps({"websocket": endpoint}).encode()])
+
+    def _stream_opened(self, fromip: str, endpoint: str) -> bool:
+        if endpoint not in self._stream_endpoints:
+            return False
+        del self._stream_endpoints[endpoint]
+        wake = gevent.event.Event()
+        client = self.change_stream.subscribe(endpoint, notify=wake.set)
+        if len(self.change_stream) == 1:
+            self._call_all("watch_changes", True)
+        # Note: the current connection states, i.e., the first message
+        for name, connected in self._stream_connected.items():
+            client.put_event({"event": "connection", "outstation": name, "connected": connected})
+        gevent.spawn(self._run_stream_sender, client, wake)
+        _log.info(f"Stream client {endpoint} opened from {fromip}")
+        return True
+
+    def _stream_closed(self, endpoint: str):
+        client = self.change_stream.unsubscribe(endpoint)
+        if client is not None:
+            client.notify()  # i.e., stop its sender
+            _log.info(f"Stream client {endpoint} closed, {client.stats()}")
+            if not len(self.change_stream):
+                self._call_all("watch_changes", False)
+                self._stream_connected.clear()
+        try:
+            self.vip.web.unregister_websocket(endpoint)
+        except Exception as e:
+            _log.debug(f"Failed to unregister the stream endpoint {endpoint}: {e}")
+
+    def _stream_received(self, endpoint: str, message: str):
+        """the stream is one-way, i.e., the client messages are ignored"""
+
+    def _run_stream_sender(self, client: ClientQueue, wake: gevent.event.Event):
+        """send the pending changes of a stream client as one message per wake-up, i.e., the changes coalesce in
+        the client queue while the previous message is sent"""
+        while True:
+            wake.wait()
+            wake.clear()
+            if client.client_id not in self.change_stream.clients:
+                return
+            message = client.pop_message()
+            if message is None:
+                continue
+            try:
+                self.vip.web.send(client.client_id, json.dumps(message))
+            except Exception as e:
+                _log.warning(f"Failed to send to stream client {client.client_id}: {e}")
+
+    def _pump_stream(self):
+        """hand the changed points and connection state changes of the outstations over to the stream clients,
+        and unregister the stream endpoints not opened within 60 seconds"""
+        now = time.monotonic()
+        for endpoint, created in list(self._stream_endpoints.items()):
+            if now - created > 60:
+                del self._stream_endpoints[endpoint]
+                self._stream_closed(endpoint)
+        if not len(self.change_stream):
+            return
+        for name, changes in self._call_all("drain_changes").items():
+            self.change_stream.publish_points(name, changes["points"])
+            if self._stream_connected.get(name) != changes["connected"]:
+                self._stream_connected[name] = changes["connected"]
+                self.change_stream.publish_event({"event": "connection", "outstation": name,
+                                                  "connected": changes["connected"], "time": time.time()})
+
+    @staticmethod
+    def _web_response(status: str, chunks: Iterable[bytes], content_type: str = JSON_CONTENT_TYPE) -> tuple:
+        """raw endpoint response, i.e., the encoded chunks joined once, then base64 encoded for the web service"""
+        body = base64.b64encode(b"".join(chunks)).decode("ascii")
+        return status, body, [("Content-Type", content_type)]
+
+    def _start_command_handoff(self):
+        """hand the master commands over to the gevent loop, i.e., an async watcher (thread-safe, signals are
+        coalesced) drains the command queue, or a greenlet per worker receives the batches of sharded outstations"""
+        if self._shard_pool is not None:
+            for worker in self._shard_pool.workers:
+                gevent.spawn(self._receive_worker_commands, worker)
+            return
+        self._command_watcher = gevent.get_hub().loop.async_()
+        self._command_watcher.start(self._handle_commands)
+        self._command_queue.notify = self._command_watcher.send
+        for outstation in self.outstations.values():
+            outstation.event_sink = self._command_queue.put
+
+    def _handle_commands(self):
+        for record in self._command_queue.drain():
+            self._handle_command(record)
+
+    def _handle_command(self, record: dict):
+        """publish the master command record, then queue it for the platform driver if routed"""
+        if self.command_topic:
+            self._publish_command(record)
+        if len(self.command_router):
+            self._queue_command_dispatch(record)
+        if len(self.change_stream):
+            self.change_stream.publish_event({"event": "command", **record})
+
+    def _receive_worker_commands(self, worker: ShardWorker):
+        while True:
+            try:
+                records = worker.recv_events()
+            except (EOFError, OSError):
+                return
+            for record in records:
+                self._handle_command(record)
+
+    def _publish_command(self, record: dict):
+        """publish a master command record to `<command_topic>/<outstation name>`"""
+        topic = f"{self.command_topic}/{record['outstation']}"
+        _headers = {headers.TIMESTAMP: format_timestamp(get_aware_utc_now())}
+        try:
+            self.vip.pubsub.publish("pubsub", topic, headers=_headers, message=record)
+        except Exception as e:
+            _log.error(f"Failed to publish {record['command_type']} command to {topic}: {e}")
+            return
+        self.command_latency.add(time.time() - record["received"])
+
+    def _queue_command_dispatch(self, record: dict):
+        """queue an (applied) operate command on a routed point, without blocking, i.e., rejected if full"""
+        if record["command_type"] != "Operate" or record["point_type"] is None or record["status"] != "SUCCESS":
+            return
+        route = self.command_router.lookup(record["outstation"], record["point_type"], record["index"])
+        if route is None:
+            return
+        try:
+            self._dispatch_queue.put_nowait((record, route))
+        except gevent.queue.Full:
+            self.dispatch_counts["rejected"] += 1
+            self._reflect_dispatch_result(record, route, "REJECTED: dispatch queue full")
+
+    def _run_command_dispatcher(self):
+        """one of `command_max_concurrency` greenlets forwarding the queued commands"""
+        while True:
+            record, route = self._dispatch_queue.get()
+            self._dispatch_command(record, route)
+
+    def _dispatch_command(self, record: dict, route: Route):
+        """forward a command to the platform driver `set_point`, within the route timeout"""
+        self.dispatch_counts["dispatched"] += 1
+        try:
+            self.vip.rpc.call(self.driver_identity, "set_point", route.path, route.point,
+                              record["value"]).get(timeout=route.timeout)
+            status = "SUCCESS"
+            self.dispatch_counts["succeeded"] += 1
+        except gevent.Timeout:
+            status = f"TIMEOUT: no result within {route.timeout} seconds"
+            self.dispatch_counts["timeout"] += 1
+        except Exception as e:
+            status = f"FAILED: {e}"
+            self.dispatch_counts["failed"] += 1
+        self.dispatch_latency.add(time.time() - record["received"])
+        self._reflect_dispatch_result(record, route, status)
+
+    def _reflect_dispatch_result(self, record: dict, route: Route, status: str):
+        """Reflect the downstream result on the outstation, i.e., on failure the output status point is reverted
+        to its previous value (if known) and flagged COMM_LOST, then publish the result.
+        Note: the DNP3 operate response was already returned (SUCCESS) by the opendnp3 thread, thus the master
+            sees the downstream result on its next poll (or event) of the output status point.
+        """
+        if status != "SUCCESS":
+            _log.warning(f"Failed to forward {record['point_type']} {record['index']} command of outstation "
+                         f"{record['outstation']} to {route.path}/{route.point}: {status}")
+            val = record["value"] if record["previous"] is None else record["previous"]
+            try:
+                self._get_outstation(record["outstation"]).apply_point(record["point_type"], record["index"], val,
+                                                                       "ack", flags=COMM_LOST)
+            except Exception as e:
+                _log.error(f"Failed to revert {record['point_type']} {record['index']} of outstation "
+                           f"{record['outstation']}: {e}")
+        if self.command_topic:
+            topic = f"{self.command_topic}/{record['outstation']}/result"
+            message = {**record, "path": route.path, "point": route.point, "dispatch_status": status}
+            _headers = {headers.TIMESTAMP: format_timestamp(get_aware_utc_now())}
+            self.vip.pubsub.publish("pubsub", topic, headers=_headers, message=message)
+
+    def _flush_snapshots(self):
+        self._call_all("flush_snapshot")
+
+    def _publish_metrics(self):
+        _headers = {headers.TIMESTAMP: format_timestamp(get_aware_utc_now())}
+        self.vip.pubsub.publish("pubsub", self.metrics_topic, headers=_headers, message=self._collect_metrics())
+
+    def _collect_metrics(self, outstation: str = None) -> dict:
+        names = list(self.outstations) if outstation is None else [self._get_outstation(outstation).name]
+        return {"agent": self.metrics.snapshot(),
+                "outstations": {name: self.outstations[name].get_metrics() for name in names},
+                "stream_clients": self.change_stream.stats(),
+                "snapshot_cache": self.snapshot_cache.stats()}
+
     @RPC.export
+    @timed_method
     def rpc_dummy(self) -> str:
         """
         For testing rpc call
@@ -142,108 +642,351 @@ class Dnp3OutstationAgent(Agent):
         return "This is a dummy rpc call"
 
     @RPC.export
-    def reset_outstation(self):
+    @timed_method
+    def list_outstations(self) -> List[str]:
+        """names of the hosted outstations, the first one is the default"""
+        return list(self.outstations)
+
+    @RPC.export
+    @timed_method
+    def get_outstation_stats(self, outstation: str = None) -> dict:
+        """usage statistics per hosted outstation (all outstations if `outstation` is None),
+        i.e., number of points and updates, cpu time spent on updates, and memory of the python-side database,
+        plus the agent process cpu time and max resident memory, and the master commands dropped (queue overflow)
+        and the latency from command receipt to publish (see "command_topic" config), and the command forwarding
+        counts and round trip latency from command receipt to the platform driver result (see "command_routes").
+        Note: the opendnp3 stack threads are shared by the process, thus only reported in "process"
+            (the agent process, i.e., "worker_pid" identifies the process of sharded outstations).
+        """
+        names = list(self.outstations) if outstation is None else [self._get_outstation(outstation).name]
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return {
+            "outstations": {name: self.outstations[name].stats() for name in names},
+            "process": {"cpu_s": usage.ru_utime + usage.ru_stime, "max_rss_kb": usage.ru_maxrss},
+            "commands": {"dropped": self._command_queue.num_dropped,
+                         "publish_latency": self.command_latency.summary(),
+                         "dispatch": {**self.dispatch_counts, "pending": self._dispatch_queue.qsize(),
+                                      "round_trip_latency": self.dispatch_latency.summary()}},
+        }
+
+    @RPC.export
+    @timed_method
+    def get_metrics(self, outstation: str = None) -> dict:
+        """latency and throughput metrics of the agent and per hosted outstation (all outstations if `outstation`
+        is None), e.g.,
+        {"agent": {"uptime_s": 12.5, "counters": {"ingest.messages": 10}, "rates": {...}, "recent_rates": {...},
+                   "histograms": {"rpc.apply_update_batch": {"count": 3, "sum_ms": 1.2, "max_ms": 0.6,
+                                                             "mean_ms": 0.4, "p50_ms": 0.5, "p99_ms": 1,
+                                                             "buckets_ms": [0.1, ..., "+Inf"],
+                                                             "bucket_counts": [0, 1, 2, ...]}}},
+         "outstations": {"default": {"uptime_s": 12.5, "counters": {"updates.Analog": 30, "events.Analog": 25,
+                                                                    "suppressed.Analog": 5, "transactions": 4},
+                                     "rates": {...}, "recent_rates": {...}, "histograms": {"apply": {...}},
+                                     "connections": {"opened": 1, "open_failed": 0, "closed": 0}}}}
+        "rates" are per second since start, "recent_rates" since the previous read (i.e., this RPC or a publish),
+        and the histogram percentiles are the upper bounds of the buckets holding them.
+        """
+        return self._collect_metrics(outstation)
+
+    @RPC.export
+    @timed_method
+    def reset_outstation(self, outstation: str = None):
         """update`self._dnp3_outstation_config`, then init a new outstation.
         For post-configuration and immediately take effect.
-        Note: will start a new outstation instance and the old database data will lose"""
+        Note: will start a new outstation instance, the database data is restored (as one batch)
+        before the new outstation accepts connections"""
         # self.dnp3_outstation_config(**kwargs)
         # TODO: this method might be refactored as internal helper method for `update_outstation`
         try:
-            self.outstation_application.shutdown()
-            outstation_app_new = MyOutStationNew(**self.dnp3_outstation_config)
-            self.outstation_application = outstation_app_new
-            self.outstation_application.start()
+            _outstation = self._get_outstation(outstation)
+            _outstation.reset(_outstation.config)
             _log.info(f"Outstation has restarted")
         except Exception as e:
             _log.error(e)
 
     @RPC.export
-    def display_outstation_db(self) -> dict:
-        """expose db"""
-        return self.outstation_application.db_handler.db
+    @timed_method
+    def display_outstation_db(self, outstation: str = None) -> dict:
+        """expose db, note: cached until the next write
+        Note: only the dict copy is cached, i.e., VOLTTRON serializes the result on every call, and a write between
+            two calls costs a rebuild; the whole-database GET of the HTTP endpoint shares the serialized payload
+        """
+        target = self._get_outstation(outstation)
+        return self.snapshot_cache.get(("db", target.name), target.versions()["db"], target.db_copy).value
+
+    @RPC.export
+    @timed_method
+    def query_outstation_db(self, point_types: Union[str, List[str]] = None, indexes: Union[int, str, list] = None,
+                            offset: int = 0, limit: int = None, outstation: str = None) -> dict:
+        """query a filtered page of the database, i.e., only the requested points are serialized
+        point_types: optional, point type or list of point types, e.g., "Analog" or ["ai", "bo"], default to all
+        indexes: optional, index, list of indexes and/or inclusive [start, stop] ranges, e.g., [[0, 9], 15],
+            or a string of the same, e.g., "0-9,15", default to all
+        offset, limit: optional, page of the matched points, ordered by point type then index
+        outstation: optional, outstation name, default to the first outstation
+        return: {"points": {point_type: {index: val}}, "total": <number of matched points>,
+                 "offset": offset, "next_offset": <offset of the next page, None if last page>}
+        """
+        return self._get_outstation(outstation).query(point_types, indexes, offset, limit)
+
+    @RPC.export
+    @timed_method
+    def get_changes_since(self, seq: int = 0, epoch: str = None, limit: int = None, outstation: str = None) -> dict:
+        """the point changes after the sequence number `seq`, i.e., the delta since the caller's last poll
+        seq: the "seq" returned by the previous call, 0 for all the changes in the change log
+        epoch: optional, the "epoch" returned by the previous call, i.e., a different epoch (agent restart) resyncs
+        limit: optional, maximum number of changes, the following ones are returned by the next call ("more")
+        outstation: optional, outstation name, default to the first outstation
+        return: {"epoch": epoch, "seq": <seq of the next call>, "resync": bool, "more": bool,
+                 "changes": [[seq, point_type, index, value, flags, timestamp], ...]}, the latest change per point;
+            "resync" True if the caller fell behind the change log (i.e., "change_log_size"): read the full
+            database (e.g., `query_outstation_db`), then poll from the returned "seq"
+        """
+        return self._get_outstation(outstation).changes_since(seq, epoch, limit)
 
     @RPC.export
-    def get_outstation_config(self) -> dict:
-        """expose get_config"""
-        return self.outstation_application.get_config()
+    @timed_method
+    def get_outstation_config(self, outstation: str = None) -> dict:
+        """expose get_config, note: cached until the next config change"""
+        target = self._get_outstation(outstation)
+        return self.snapshot_cache.get(("config", target.name), target.versions()["config"], target.get_config).value
 
     @RPC.export
-    def is_outstation_connected(self) -> bool:
+    @timed_method
+    def is_outstation_connected(self, outstation: str = None) -> bool:
         """expose is_connected, note: status, property"""
-        return self.outstation_application.is_connected
+        return self._get_outstation(outstation).is_connected
 
     @RPC.export
-    def apply_update_analog_input(self, val: float, index: int) -> dict:
+    @timed_method
+    def apply_update_analog_input(self, val: float, index: int, response_mode: str = None,
+                                  outstation: str = None, flags: Union[int, str, list] = None,
+                                  timestamp: Union[float, str] = None) -> dict:
         """public interface to update analog-input point value
         val: float
         index: int, point index
+        response_mode: optional, one of "db", "entry", "ack", default to the agent "response_mode" setting
+        outstation: optional, outstation name, default to the first outstation
+        flags: optional, quality flags, int or names, e.g., "COMM_LOST" (offline), default to ONLINE
+        timestamp: optional, source timestamp, epoch seconds or ISO 8601, default to the receipt time
         """
         if not isinstance(val, float):
             raise f"val of type(val) should be float"
-        self.outstation_application.apply_update(opendnp3.Analog(value=val), index)
+        response = self._apply_point(ANALOG_INPUT, index, val, response_mode, outstation, flags, timestamp)
         _log.debug(f"Updated outstation analog-input index: {index}, val: {val}")
 
-        return self.outstation_application.db_handler.db
+        return response
 
     @RPC.export
-    def apply_update_analog_output(self, val: float, index: int) -> dict:
+    @timed_method
+    def apply_update_analog_output(self, val: float, index: int, response_mode: str = None,
+                                   outstation: str = None, flags: Union[int, str, list] = None,
+                                   timestamp: Union[float, str] = None) -> dict:
         """public interface to update analog-output point value
         val: float
         index: int, point index
+        response_mode: optional, one of "db", "entry", "ack", default to the agent "response_mode" setting
+        outstation: optional, outstation name, default to the first outstation
+        flags: optional, quality flags, int or names, e.g., "COMM_LOST" (offline), default to ONLINE
+        timestamp: optional, source timestamp, epoch seconds or ISO 8601, default to the receipt time
         """
 
         if not isinstance(val, float):
             raise f"val of type(val) should be float"
-        self.outstation_application.apply_update(opendnp3.AnalogOutputStatus(value=val), index)
+        response = self._apply_point(ANALOG_OUTPUT, index, val, response_mode, outstation, flags, timestamp)
         _log.debug(f"Updated outstation analog-output index: {index}, val: {val}")
 
-        return self.outstation_application.db_handler.db
+        return response
 
     @RPC.export
-    def apply_update_binary_input(self, val: bool, index: int):
+    @timed_method
+    def apply_update_binary_input(self, val: bool, index: int, response_mode: str = None,
+                                  outstation: str = None, flags: Union[int, str, list] = None,
+                                  timestamp: Union[float, str] = None) -> dict:
         """public interface to update binary-input point value
         val: bool
         index: int, point index
+        response_mode: optional, one of "db", "entry", "ack", default to the agent "response_mode" setting
+        outstation: optional, outstation name, default to the first outstation
+        flags: optional, quality flags, int or names, e.g., "COMM_LOST" (offline), default to ONLINE
+        timestamp: optional, source timestamp, epoch seconds or ISO 8601, default to the receipt time
         """
         if not isinstance(val, bool):
             raise f"val of type(val) should be bool"
-        self.outstation_application.apply_update(opendnp3.Binary(value=val), index)
+        response = self._apply_point(BINARY_INPUT, index, val, response_mode, outstation, flags, timestamp)
         _log.debug(f"Updated outstation binary-input index: {index}, val: {val}")
 
-        return self.outstation_application.db_handler.db
+        return response
 
     @RPC.export
-    def apply_update_binary_output(self, val: bool, index: int):
+    @timed_method
+    def apply_update_binary_output(self, val: bool, index: int, response_mode: str = None,
+                                   outstation: str = None, flags: Union[int, str, list] = None,
+                                   timestamp: Union[float, str] = None) -> dict:
         """public interface to update binary-output point value
         val: bool
         index: int, point index
+        response_mode: optional, one of "db", "entry", "ack", default to the agent "response_mode" setting
+        outstation: optional, outstation name, default to the first outstation
+        flags: optional, quality flags, int or names, e.g., "COMM_LOST" (offline), default to ONLINE
+        timestamp: optional, source timestamp, epoch seconds or ISO 8601, default to the receipt time
         """
         if not isinstance(val, bool):
             raise f"val of type(val) should be bool"
-        self.outstation_application.apply_update(opendnp3.BinaryOutputStatus(value=val), index)
+        response = self._apply_point(BINARY_OUTPUT, index, val, response_mode, outstation, flags, timestamp)
         _log.debug(f"Updated outstation binary-output index: {index}, val: {val}")
 
-        return self.outstation_application.db_handler.db
+        return response
+
+    @RPC.export
+    @timed_method
+    def apply_update_batch(self, updates: Union[list, dict], response_mode: str = None,
+                           outstation: str = None, flags: Union[int, str, list] = None,
+                           timestamp: Union[float, str] = None) -> dict:
+        """public interface to update many points of mixed types in one call
+        updates: list of [point_type, index, val], optionally followed by the quality flags and source timestamp,
+            e.g., [["Analog", 0, 1.2], ["bo", 1, True, "COMM_LOST", "2022-10-30T00:00:00Z"]],
+            or columnar dict with optional "flags" and "timestamps" lists,
+            e.g., {"types": ["ai", "bo"], "indexes": [0, 1], "values": [1.2, True], "timestamps": [1667088000, None]}
+            point_type: one of "Analog", "AnalogOutputStatus", "Binary", "BinaryOutputStatus",
+            or alias "ai", "ao", "bi", "bo".
+            flags: int or names, e.g., "ONLINE|LOCAL_FORCED", see `points.QUALITY_FLAGS`
+            timestamp: epoch seconds or ISO 8601
+        response_mode: optional, "entry" adds the changed entries, e.g., {"Analog": {0: 1.2}}, to the result
+        outstation: optional, outstation name, default to the first outstation
+        flags: optional, quality flags of the updates without their own, default to ONLINE
+        timestamp: optional, source timestamp of the updates without their own, default to the receipt time
+        return: {"applied": <number of updated points>, "errors": [[position, message], ...]}
+            plus, above the event buffer high watermark, "backpressure": {"occupancy": <pending events / capacity>,
+            "high_watermark": 0.8, "retry_after": <seconds, None while no master is connected>}, and "deferred":
+            <number of updates held> with the "coalesce" event_admission (see `dnp3_outstation.admission`)
+        """
+        response_mode = self._check_response_mode(response_mode or self.response_mode)
+        return self._get_outstation(outstation).apply_batch(updates, response_mode, flags=flags, timestamp=timestamp)
+
+    @RPC.export
+    @timed_method
+    def apply_update_by_name(self, updates: Dict[str, Any], response_mode: str = None,
+                             outstation: str = None) -> dict:
+        """public interface to update points by their name in the point registry (i.e., "point_map" csv)
+        updates: dict of point name -> val, e.g., {"ZoneTemperature": 72.1, "FanStatus": True}
+            Note: the point scaling is applied to analog values.
+        response_mode: optional, "entry" adds the changed entries, e.g., {"Analog": {0: 72.1}}, to the result
+        outstation: optional, outstation name, default to the first outstation
+        return: {"applied": <number of updated points>, "errors": [[name, message], ...]}
+        """
+        response_mode = self._check_response_mode(response_mode or self.response_mode)
+        return self._get_outstation(outstation).apply_by_name(updates, response_mode)
+
+    @RPC.export
+    @timed_method
+    def start_replay(self, path: str, speed: float = 1.0, batch_window: float = 0.0, start: Union[str, float] = None,
+                     lag_tolerance: float = DEFAULT_LAG_TOLERANCE, outstation: str = None) -> dict:
+        """replay a recorded csv or parquet file of timestamped point values, i.e., streamed and applied in
+        time-ordered batches at the recorded pace (see `dnp3_outstation.replay` for the file columns)
+        path: path of the file on the agent host
+        speed: optional, 1 for real time (default), N for N times faster, 0 for as fast as possible
+        batch_window: optional, seconds, the records within this window are applied as one batch, default 0
+            (i.e., one batch per timestamp)
+        start: optional, epoch seconds or ISO 8601, skip the records before this time
+        lag_tolerance: optional, seconds, a batch applied later than this behind schedule does not keep up
+        outstation: optional, outstation of the records without "outstation" column, default to the first one
+        return: the replay status, see `get_replay_status`
+        Note: one replay at a time, the replay runs in the background
+        """
+        if self._replay is not None and self._replay.state in ("running", "paused"):
+            raise RuntimeError(f"replay of {self._replay.path} in progress, stop it first")
+        default_outstation = self._get_outstation(outstation).name
+
+        def apply(name: Optional[str], batch: dict) -> int:
+            result = self._get_outstation(name or default_outstation).apply_batch(batch, "ack")
+            return len(result["errors"])
+
+        self._replay = ReplayEngine(path, apply, float(speed), float(batch_window),
+                                    None if start is None else parse_timestamp(start), float(lag_tolerance),
+                                    sleep=gevent.sleep)
+        gevent.spawn(self._replay.run)
+        return self._replay.status()
+
+    def _get_replay(self) -> ReplayEngine:
+        if self._replay is None:
+            raise RuntimeError("no replay, see start_replay")
+        return self._replay
+
+    @RPC.export
+    @timed_method
+    def pause_replay(self) -> dict:
+        """pause the replay, return the replay status"""
+        self._get_replay().pause()
+        return self._get_replay().status()
+
+    @RPC.export
+    @timed_method
+    def resume_replay(self) -> dict:
+        """resume the paused replay (i.e., the pace restarts from the next batch), return the replay status"""
+        self._get_replay().resume()
+        return self._get_replay().status()
+
+    @RPC.export
+    @timed_method
+    def seek_replay(self, timestamp: Union[str, float]) -> dict:
+        """continue the replay from the first record at or after `timestamp` (epoch seconds or ISO 8601),
+        forward or backward, return the replay status"""
+        self._get_replay().seek(timestamp)
+        return self._get_replay().status()
+
+    @RPC.export
+    @timed_method
+    def stop_replay(self) -> dict:
+        """stop the replay, return the replay status"""
+        self._get_replay().stop()
+        return self._get_replay().status()
+
+    @RPC.export
+    @timed_method
+    def get_replay_status(self) -> dict:
+        """status and report of the current (or last) replay, e.g.,
+        {"path": "/data/feeder.csv", "state": "running", "error": None, "speed": 10.0, "position": 1667088123.0,
+         "batches": 120, "updates": 4800, "rejected": 0, "late_batches": 0, "mean_lag_s": 0.002, "max_lag_s": 0.01,
+         "kept_up": True, "elapsed_s": 12.1, "achieved_speed": 9.98}
+        state: "running", "paused", "stopped", "finished" or "failed" (see "error")
+        position: timestamp of the last applied batch
+        kept_up: False if a batch was applied later than the lag tolerance behind schedule, None at max speed
+        achieved_speed: recorded seconds replayed per second, excluding the pauses
+        """
+        return self._get_replay().status()
 
     @RPC.export
+    @timed_method
     def update_outstation(self,
                           outstation_ip: str = None,
                           port: int = None,
                           master_id: int = None,
                           outstation_id: int = None,
+                          outstation: str = None,
                           **kwargs):
         """
         Update dnp3 outstation config and restart the application to take effect. By default,
         {'outstation_ip': '0.0.0.0', 'port': 20000, 'master_id': 2, 'outstation_id': 1}
+        outstation: optional, outstation name, default to the first outstation
+        kwargs: optional, the database config, i.e., "db_size", "event_buffer_size" and "point_config", and the
+            admission control config, i.e., "event_poll_interval", "event_high_watermark" and "event_admission"
         """
-        config = self._dnp3_outstation_config.copy()
+        _outstation = self._get_outstation(outstation)
+        config = _outstation.config.copy()
         for kwarg in [{"outstation_ip": outstation_ip},
                       {"port": port},
                       {"master_id": master_id}, {"outstation_id": outstation_id}]:
             if list(kwarg.values())[0] is not None:
                 config.update(kwarg)
-        self._dnp3_outstation_config = config
-        self.reset_outstation()
+        config_keys = DATABASE_CONFIG_KEYS + ADMISSION_CONFIG_KEYS
+        unknown = set(kwargs) - set(config_keys)
+        if unknown:
+            raise ValueError(f"unknown config keys {sorted(unknown)}, should be among {list(config_keys)}")
+        config.update(kwargs)
+        check_database_config(config)
+        _outstation.config = config
+        self.reset_outstation(_outstation.name)
 
 
 def main():
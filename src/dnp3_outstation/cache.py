@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Versioned snapshot cache, i.e., the database/config responses rebuilt at most once per version.
+
+The outstations bump a version (an int) on each write transaction (see `Outstation.versions`), a cached snapshot
+is valid as long as it was built from the current version (or a newer one, i.e., rebuilt by a concurrent reader).
+Concurrent readers of a stale snapshot wait for one rebuild, and share the snapshot, e.g., a serialized payload.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from dnp3_outstation.metrics import Metrics
+
+
+class Snapshot:
+    """A cached value and the version it was built from."""
+
+    __slots__ = ("value", "version")
+
+    def __init__(self, value: Any, version: int):
+        self.value = value
+        self.version = version
+
+
+class SnapshotCache:
+    """Snapshots by key (e.g., ("db", outstation name)), counted as "snapshot_cache.hits" and
+    "snapshot_cache.misses" in `metrics`.
+
+    lock_factory: lock serializing the rebuilds of a key, e.g., `gevent.lock.Semaphore`
+    """
+
+    def __init__(self, metrics: Optional[Metrics] = None, lock_factory: Callable = threading.Lock):
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.lock_factory = lock_factory
+        self._snapshots: Dict[Hashable, Snapshot] = {}
+        self._locks: Dict[Hashable, Any] = {}
+
+    def get(self, key: Hashable, version: int, build: Callable[[], Any]) -> Snapshot:
+        """the snapshot of `key` at `version`, built by `build` if missing or stale
+        Note: read the version before building, i.e., a write during the build invalidates the new snapshot.
+        """
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot.version >= version:
+            self.metrics.inc("snapshot_cache.hits")
+            return snapshot
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks.setdefault(key, self.lock_factory())
+        with lock:
+            # Note: a concurrent reader may have rebuilt it while this one waited
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.version >= version:
+                self.metrics.inc("snapshot_cache.hits")
+                return snapshot
+            self.metrics.inc("snapshot_cache.misses")
+            snapshot = self._snapshots[key] = Snapshot(build(), version)
+            return snapshot
+
+    def invalidate(self, key: Hashable = None):
+        """drop the snapshot of `key` (all snapshots if None)"""
+        if key is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(key, None)
+
+    def stats(self) -> dict:
+        counters = self.metrics.counters
+        hits, misses = counters.get("snapshot_cache.hits", 0), counters.get("snapshot_cache.misses", 0)
+        return {"snapshots": len(self._snapshots), "hits": hits, "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else None}
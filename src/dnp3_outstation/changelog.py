@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Bounded log of the point changes, numbered by a monotonically increasing sequence number.
+
+A client mirroring the database polls the changes since the last sequence number it has seen, i.e., the cost
+scales with the change rate rather than the database size. When the log no longer holds the changes the client
+needs (or the log was restarted, i.e., a different "epoch"), the client is told to resync from a full read.
+"""
+
+import threading
+import uuid
+from collections import deque
+from itertools import islice
+from typing import Any, Iterable, Optional, Tuple
+
+DEFAULT_CHANGE_LOG_SIZE = 100000
+
+# alias
+Change = Tuple[str, int, Any, int, float]  # (point_type, index, value, flags, timestamp)
+
+
+class ChangeLog:
+    """The last `maxlen` point changes, i.e., (seq, point_type, index, value, flags, timestamp) entries.
+
+    Thread-safe, i.e., the master commands are appended from the opendnp3 thread.
+    """
+
+    def __init__(self, maxlen: int = DEFAULT_CHANGE_LOG_SIZE):
+        if maxlen < 1:
+            raise ValueError(f"change log size {maxlen} should be positive")
+        self._entries = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.seq = 0  # sequence number of the last change
+        self.epoch = uuid.uuid4().hex[:12]
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def first_seq(self) -> int:
+        """sequence number of the oldest change in the log, i.e., seq + 1 if empty"""
+        return self.seq - len(self._entries) + 1
+
+    def extend(self, changes: Iterable[Change]):
+        with self._lock:
+            seq = self.seq
+            entries = self._entries
+            for change in changes:
+                seq += 1
+                entries.append((seq, *change))
+            self.seq = seq
+
+    def since(self, seq: int, epoch: str = None, limit: int = None, coalesce: bool = True) -> dict:
+        """the changes after `seq` (the last sequence number seen by the caller, 0 for all), at most `limit`
+        changes (i.e., the following ones in the next call), only the latest change of each point if `coalesce`
+        return: {"epoch": epoch, "seq": <sequence number to poll from next>, "resync": bool, "more": bool,
+                 "changes": [[seq, point_type, index, value, flags, timestamp], ...]}
+            "resync" True (without changes) if the changes after `seq` are no longer in the log, or `epoch` is not
+            the log epoch (i.e., the agent restarted): read the full database, then poll from the returned "seq".
+        """
+        if not isinstance(seq, int) or isinstance(seq, bool) or seq < 0:
+            raise ValueError(f"seq {seq!r} should be a non-negative int")
+        if limit is not None and (not isinstance(limit, int) or limit < 1):
+            raise ValueError(f"limit {limit!r} should be a positive int")
+        with self._lock:
+            current, first = self.seq, self.first_seq
+            result = {"epoch": self.epoch, "seq": current, "resync": False, "more": False, "changes": []}
+            if (epoch is not None and epoch != self.epoch) or seq > current or seq + 1 < first:
+                result["resync"] = True
+                return result
+            stop = len(self._entries) if limit is None else min(seq + 1 - first + limit, len(self._entries))
+            entries = list(islice(self._entries, seq + 1 - first, stop))
+        if entries:
+            result["seq"] = entries[-1][0]
+            result["more"] = result["seq"] < current
+        if coalesce:
+            latest = {}
+            for entry in entries:
+                latest[(entry[1], entry[2])] = entry
+            entries = sorted(latest.values())
+        result["changes"] = [list(entry) for entry in entries]
+        return result
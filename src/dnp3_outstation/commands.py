@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Handoff of the master control commands (select/operate) from the opendnp3 thread to the agent.
+
+The opendnp3 thread only appends a command record to a bounded deque and signals the consumer
+(e.g., a gevent async watcher, which is thread-safe and coalesces the signals), so a burst of commands
+never blocks the stack; the consumer drains the pending records as one batch.
+"""
+
+import math
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_COMMAND_TOPIC = "dnp3/commands"
+
+
+def command_record(outstation: str, command_type: str, point_type: Optional[str], index: int, value,
+                   status: str, op_type: Optional[str], received: float, previous=None) -> Dict:
+    """the published command message, e.g.,
+    {"outstation": "default", "command_type": "Operate", "point_type": "AnalogOutputStatus", "index": 0,
+     "value": 1.2, "previous": 0.8, "status": "SUCCESS", "op_type": "OperateType.DirectOperate",
+     "received": 1667102887.814}
+    previous: the point value before the command, None if unknown
+    """
+    return {"outstation": outstation, "command_type": command_type, "point_type": point_type, "index": index,
+            "value": value, "previous": previous, "status": status, "op_type": op_type, "received": received}
+
+
+class CommandQueue:
+    """Thread-safe, non-blocking and bounded queue of command records.
+    When full, the oldest record is dropped (and counted) rather than blocking the producer.
+    """
+
+    def __init__(self, maxlen: int = 10000, notify: Optional[Callable[[], None]] = None):
+        self._queue = deque(maxlen=maxlen)
+        self.notify = notify
+        self.num_received: int = 0
+        self.num_dropped: int = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    def put(self, record: Dict):
+        """called by the producer (i.e., the opendnp3 thread), O(1)"""
+        if len(self._queue) == self._queue.maxlen:
+            self.num_dropped += 1
+        self._queue.append(record)
+        self.num_received += 1
+        if self.notify is not None:
+            self.notify()
+
+    def drain(self) -> List[Dict]:
+        """pop all the pending records (in arrival order)"""
+        records = []
+        pop = self._queue.popleft
+        while True:
+            try:
+                records.append(pop())
+            except IndexError:
+                return records
+
+
+class LatencyStats:
+    """Latency summary over the last `window` samples (all samples if None), reported in milliseconds."""
+
+    def __init__(self, window: Optional[int] = 1000):
+        self._samples = deque(maxlen=window)
+        self.count: int = 0
+        self.max: float = 0.0
+
+    def add(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def summary(self) -> Dict:
+        if not self._samples:
+            return {"count": self.count}
+        samples = sorted(self._samples)
+        percentile = lambda p: samples[min(len(samples) - 1, math.ceil(p / 100 * len(samples)) - 1)] * 1e3
+        return {"count": self.count, "mean_ms": sum(samples) / len(samples) * 1e3, "p50_ms": percentile(50),
+                "p99_ms": percentile(99), "max_ms": self.max * 1e3}
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Outstation database config: database sizes, event buffer sizes, and per-point event class and static/event
+variations, parsed and validated from the agent config (i.e., without opendnp3, see `outstation_kwargs`).
+
+Config keys (agent-level, or per "outstations" entry):
+    "db_size": points per point type, an int for all types or per type, e.g., {"ai": 100, "bi": 50}
+    "event_buffer_size": event buffer capacity per point type, same format
+    "point_config": list of {"type", "indexes" (optional, default to all), "class" (0 .. 3, 0 for no event),
+        "static_variation", "event_variation"}, e.g.,
+        [{"type": "ai", "indexes": "0-9", "class": 1, "static_variation": "30.5", "event_variation": "32.7"}]
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from dnp3_outstation.points import ANALOG_INPUT, ANALOG_OUTPUT, BINARY_INPUT, BINARY_OUTPUT, POINT_TYPES, \
+    resolve_point_type
+from dnp3_outstation.query import parse_index_spec
+
+# config keys of the outstation database, i.e., applied by resetting the outstation
+DATABASE_CONFIG_KEYS = ("db_size", "event_buffer_size", "point_config")
+
+# dnp3-python (0.2.x) defaults, i.e., `MyOutStationNew` without db_sizes/event_buffer_config
+DEFAULT_DB_SIZE = 10
+DEFAULT_EVENT_BUFFER_SIZE = 10
+
+# opendnp3 default event class, and the dnp3-python default classes (i.e., `MyOutStationNew.configure_database`)
+DEFAULT_POINT_CLASS = 1
+LIBRARY_POINT_CLASSES = {
+    ANALOG_INPUT: {0: 2, 1: 2},
+    ANALOG_OUTPUT: {0: 2},
+    BINARY_INPUT: {0: 2, 1: 2, 2: 2},
+    BINARY_OUTPUT: {0: 2},
+}
+
+# opendnp3 `DatabaseSizes`/`EventBufferConfig` field and `DatabaseConfig` array per point type
+DB_SIZE_FIELDS = {
+    ANALOG_INPUT: "numAnalog",
+    ANALOG_OUTPUT: "numAnalogOutputStatus",
+    BINARY_INPUT: "numBinary",
+    BINARY_OUTPUT: "numBinaryOutputStatus",
+}
+EVENT_BUFFER_FIELDS = {
+    ANALOG_INPUT: "maxAnalogEvents",
+    ANALOG_OUTPUT: "maxAnalogOutputStatusEvents",
+    BINARY_INPUT: "maxBinaryEvents",
+    BINARY_OUTPUT: "maxBinaryOutputStatusEvents",
+}
+DB_CONFIG_ARRAYS = {
+    ANALOG_INPUT: "analog",
+    ANALOG_OUTPUT: "aoStatus",
+    BINARY_INPUT: "binary",
+    BINARY_OUTPUT: "boStatus",
+}
+
+# point type -> (static variation enum, its variations), (event variation enum, its variations)
+VARIATIONS = {
+    ANALOG_INPUT: (("StaticAnalogVariation", (30, range(1, 7))), ("EventAnalogVariation", (32, range(1, 9)))),
+    ANALOG_OUTPUT: (("StaticAnalogOutputStatusVariation", (40, range(1, 5))),
+                    ("EventAnalogOutputStatusVariation", (42, range(1, 9)))),
+    BINARY_INPUT: (("StaticBinaryVariation", (1, range(1, 3))), ("EventBinaryVariation", (2, range(1, 4)))),
+    BINARY_OUTPUT: (("StaticBinaryOutputStatusVariation", (10, range(2, 3))),
+                    ("EventBinaryOutputStatusVariation", (11, range(1, 3)))),
+}
+
+_VARIATION_PATTERN = re.compile(r"^(?:g(?:roup)?)?(\d+)(?:v(?:ar)?|\.)(\d+)$", re.IGNORECASE)
+
+
+class PointConfig(NamedTuple):
+    """per-point database config, None fields keep the dnp3-python default"""
+    point_type: str
+    ranges: Optional[List[Tuple[int, int]]]  # inclusive index ranges, None for all points
+    point_class: Optional[int]  # 0 .. 3
+    static_variation: Optional[str]  # enum member, e.g., "Group30Var5"
+    event_variation: Optional[str]  # enum member, e.g., "Group32Var7"
+
+
+def parse_sizes(sizes: Union[int, Dict[str, int], None], default: int, name: str) -> Dict[str, int]:
+    """size per point type from an int (all types) or a dict by point type (missing types default to `default`)"""
+    if sizes is None:
+        return {point_type: default for point_type in POINT_TYPES}
+    if isinstance(sizes, dict):
+        parsed = {point_type: default for point_type in POINT_TYPES}
+        for point_type, size in sizes.items():
+            parsed[resolve_point_type(point_type)] = size
+    else:
+        parsed = {point_type: sizes for point_type in POINT_TYPES}
+    for point_type, size in parsed.items():
+        if not isinstance(size, int) or isinstance(size, bool) or not 0 <= size <= 0xFFFF:
+            raise ValueError(f"{name} {size!r} of {point_type} should be an int within 0 .. 65535")
+    return parsed
+
+
+def parse_variation(point_type: str, variation: Union[str, None], event: bool) -> Optional[str]:
+    """the opendnp3 enum member of a static (or event) variation, e.g., "30.5", "g30v5" or "Group30Var5"
+    -> "Group30Var5", validated for the point type"""
+    if variation is None:
+        return None
+    _, (group, variations) = VARIATIONS[point_type][1 if event else 0]
+    match = _VARIATION_PATTERN.match(str(variation).strip())
+    if not match or int(match.group(1)) != group or int(match.group(2)) not in variations:
+        kind = "event" if event else "static"
+        raise ValueError(f"invalid {kind} variation {variation!r} of {point_type}, should be one of "
+                         f"{[f'{group}.{var}' for var in variations]}")
+    return f"Group{group}Var{int(match.group(2))}"
+
+
+def parse_point_config(entries: List[dict], db_sizes: Dict[str, int]) -> List[PointConfig]:
+    """validate the "point_config" entries, i.e., the indexes should be within the database size"""
+    point_configs = []
+    for entry in entries or []:
+        if not isinstance(entry, dict):
+            raise ValueError(f"point_config entry {entry!r} should be an object")
+        point_type = resolve_point_type(entry.get("type"))
+        ranges = None if entry.get("indexes") is None else parse_index_spec(entry["indexes"])
+        if ranges and ranges[-1][1] >= db_sizes[point_type]:
+            raise ValueError(f"point_config indexes {entry['indexes']!r} of {point_type} out of the database "
+                             f"size {db_sizes[point_type]}")
+        point_class = entry.get("class")
+        if point_class is not None and point_class not in (0, 1, 2, 3):
+            raise ValueError(f"point_config class {point_class!r} should be 0 (no event), 1, 2 or 3")
+        point_configs.append(PointConfig(point_type, ranges, point_class,
+                                         parse_variation(point_type, entry.get("static_variation"), event=False),
+                                         parse_variation(point_type, entry.get("event_variation"), event=True)))
+    return point_configs
+
+
+def iter_point_indexes(point_config: PointConfig, db_size: int):
+    """the indexes a point config applies to"""
+    if point_config.ranges is None:
+        return range(db_size)
+    return (index for start, stop in point_config.ranges for index in range(start, stop + 1))
+
+
+def applies_library_defaults(db_sizes: Dict[str, int]) -> bool:
+    """whether the database holds the points configured by the dnp3-python defaults"""
+    return all(db_sizes[point_type] > max(classes) for point_type, classes in LIBRARY_POINT_CLASSES.items())
+
+
+def point_classes(config: dict) -> Dict[str, bytearray]:
+    """the event class (0 .. 3) of each point per point type, i.e., the defaults and the "point_config" classes"""
+    db_sizes = parse_sizes(config.get("db_size"), DEFAULT_DB_SIZE, "db_size")
+    classes = {point_type: bytearray([DEFAULT_POINT_CLASS]) * size for point_type, size in db_sizes.items()}
+    if applies_library_defaults(db_sizes):
+        for point_type, library_classes in LIBRARY_POINT_CLASSES.items():
+            for index, point_class in library_classes.items():
+                classes[point_type][index] = point_class
+    for point_config in parse_point_config(config.get("point_config"), db_sizes):
+        if point_config.point_class is None:
+            continue
+        point_type_classes = classes[point_config.point_type]
+        for index in iter_point_indexes(point_config, db_sizes[point_config.point_type]):
+            point_type_classes[index] = point_config.point_class
+    return classes
+
+
+def check_database_config(config: dict):
+    """validate the "db_size", "event_buffer_size" and "point_config" of an outstation config, i.e., before
+    resetting the outstation with it"""
+    db_sizes = parse_sizes(config.get("db_size"), DEFAULT_DB_SIZE, "db_size")
+    parse_sizes(config.get("event_buffer_size"), DEFAULT_EVENT_BUFFER_SIZE, "event_buffer_size")
+    parse_point_config(config.get("point_config"), db_sizes)
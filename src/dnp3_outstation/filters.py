@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Per-point deadband and change-threshold filtering of outstation events."""
+
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from dnp3_outstation.points import ANALOG_TYPES, resolve_point_type
+
+# alias
+PointKey = Tuple[str, int]  # (point_type, index)
+
+
+class Deadband(NamedTuple):
+    absolute: float = 0.0  # minimum absolute change, analog only
+    percent: float = 0.0  # minimum change in percent of the last reported value, analog only
+    min_interval: float = 0.0  # minimum seconds between two reported values
+
+
+class DeadbandFilter:
+    """Decide whether a point update is reported as an event, based on the last reported value.
+
+    Config format (i.e., the agent config "deadbands" entry), e.g.,
+        [{"type": "Analog", "index": 0, "absolute": 0.5, "percent": 1.0, "min_interval": 5},
+         {"type": "Analog", "absolute": 0.1}]
+    An entry without "index" applies to every point of the type that has no entry of its own.
+
+    An analog change is reported when it exceeds all the configured deadbands, a binary change whenever the value
+    differs. A quality flags change is always reported, i.e., regardless of the deadbands and of "min_interval".
+    Points without deadband are always reported. All checks are O(1).
+    """
+
+    def __init__(self):
+        self._deadbands: Dict[PointKey, Deadband] = {}
+        self._type_deadbands: Dict[str, Deadband] = {}
+        self._last_reported: Dict[PointKey, Tuple[Any, Optional[int], float]] = {}  # (value, flags, monotonic time)
+        self.num_suppressed: int = 0
+
+    @classmethod
+    def from_config(cls, deadbands: List[dict]) -> "DeadbandFilter":
+        deadband_filter = cls()
+        for entry in deadbands:
+            deadband_filter.set(entry.get("type"), entry.get("index"),
+                                absolute=entry.get("absolute", 0.0),
+                                percent=entry.get("percent", 0.0),
+                                min_interval=entry.get("min_interval", 0.0))
+        return deadband_filter
+
+    def __len__(self):
+        return len(self._deadbands) + len(self._type_deadbands)
+
+    def set(self, point_type: str, index: Optional[int] = None,
+            absolute: float = 0.0, percent: float = 0.0, min_interval: float = 0.0):
+        """set the deadband of one point, or of all the points of `point_type` if index is None"""
+        deadband = Deadband(float(absolute), float(percent), float(min_interval))
+        if min(deadband) < 0:
+            raise ValueError(f"deadband {deadband} should not be negative")
+        point_type = resolve_point_type(point_type)
+        if index is None:
+            self._type_deadbands[point_type] = deadband
+        else:
+            self._deadbands[(point_type, index)] = deadband
+
+    def get(self, point_type: str, index: int) -> Optional[Deadband]:
+        deadband = self._deadbands.get((point_type, index))
+        if deadband is None:
+            deadband = self._type_deadbands.get(point_type)
+        return deadband
+
+    def check(self, point_type: str, index: int, value: Any, flags: int = None, now: float = None) -> bool:
+        """return True if the update should be reported, and if so, record it as the last reported value
+        flags: the quality flags of the update, a change of the flags is always reported"""
+        deadband = self.get(point_type, index)
+        if deadband is None:
+            return True
+        if now is None:
+            now = time.monotonic()
+        key = (point_type, index)
+        last = self._last_reported.get(key)
+        if last is not None:
+            last_value, last_flags, last_time = last
+            if flags == last_flags and not self._exceeds(point_type, deadband, value, now, last_value, last_time):
+                self.num_suppressed += 1
+                return False
+        self._last_reported[key] = (value, flags, now)
+        return True
+
+    @staticmethod
+    def _exceeds(point_type: str, deadband: Deadband, value: Any, now: float,
+                 last_value: Any, last_time: float) -> bool:
+        if now - last_time < deadband.min_interval:
+            return False
+        if point_type not in ANALOG_TYPES:
+            return value != last_value
+        change = abs(value - last_value)
+        if change == 0:
+            return False
+        if change <= deadband.absolute:
+            return False
+        if deadband.percent and change <= abs(last_value) * deadband.percent / 100:
+            return False
+        return True
+
+    def reset(self):
+        """forget the last reported values, i.e., the next update of every point is reported"""
+        self._last_reported.clear()
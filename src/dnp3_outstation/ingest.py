@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Pub/sub ingestion helpers: map VOLTTRON topics (e.g., platform driver `devices/.../all` publishes)
+to outstation points, and coalesce the updates between flushes.
+
+A subscription topic is either exact, or a pattern with the fnmatch wildcards "*", "?" and "[...]",
+e.g., "devices/campus/*/all" ("*" matches across "/"). The agent subscribes to the literal prefix of
+the patterns (i.e., up to the first wildcard), which should not be empty.
+"""
+
+import re
+from fnmatch import translate
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dnp3_outstation.points import resolve_point_type
+
+# alias
+PointKey = Tuple[str, int]  # (point_type, index)
+
+_WILDCARDS = re.compile(r"[*?\[]")
+
+
+def topic_prefix(topic: str) -> str:
+    """the pub/sub subscription prefix of a topic (pattern), i.e., up to the first wildcard"""
+    match = _WILDCARDS.search(topic)
+    return topic if match is None else topic[:match.start()]
+
+
+def subscription_prefixes(topics: Iterable[str]) -> List[str]:
+    """the distinct prefixes to subscribe to, without those covered by a shorter prefix,
+    i.e., a publish is delivered once per matching subscription"""
+    prefixes = []
+    for prefix in sorted({topic_prefix(topic) for topic in topics}):
+        if not prefixes or not prefix.startswith(prefixes[-1]):
+            prefixes.append(prefix)
+    return prefixes
+
+
+class TopicPatterns:
+    """Match the published topics against exact topics and patterns, the matches are cached per published topic."""
+
+    def __init__(self, topics: Iterable[str] = ()):
+        self._exact = set()
+        self._patterns: Dict[str, Any] = {}  # pattern -> compiled match
+        self._matches: Dict[str, List[str]] = {}
+        for topic in topics:
+            self.add(topic)
+
+    def add(self, topic: str):
+        if topic_prefix(topic) == topic:
+            self._exact.add(topic)
+        elif not topic_prefix(topic):
+            raise ValueError(f"topic pattern {topic!r} should start with a topic prefix, e.g., 'devices/*/all'")
+        else:
+            self._patterns[topic] = re.compile(translate(topic)).match
+        self._matches.clear()
+
+    def match(self, topic: str) -> List[str]:
+        """the topics and patterns matching a published topic, the exact topic first"""
+        matches = self._matches.get(topic)
+        if matches is None:
+            matches = [topic] if topic in self._exact else []
+            matches += [pattern for pattern, match in self._patterns.items() if match(topic)]
+            self._matches[topic] = matches
+        return matches
+
+
+class TopicPointMap:
+    """Precompiled lookup table: topic -> field -> (point_type, index)
+
+    Config format (i.e., the agent config "subscriptions" entry), e.g.,
+        [{"topic": "devices/campus/building/rtu1/all",
+          "points": {"ZoneTemperature": {"type": "Analog", "index": 0},
+                     "FanStatus": ["bi", 1]}}]
+    The "topic" may be a pattern, e.g., "devices/campus/*/rtu1/all", the fields of an exact topic take precedence
+    over those of the patterns.
+    """
+
+    def __init__(self):
+        self._map: Dict[str, Dict[str, PointKey]] = {}
+        self._patterns = TopicPatterns()
+        self._fields: Dict[str, Dict[str, PointKey]] = {}  # published topic -> fields of the matching topics
+
+    @classmethod
+    def from_config(cls, subscriptions: List[dict]) -> "TopicPointMap":
+        topic_map = cls()
+        for subscription in subscriptions:
+            topic = subscription.get("topic")
+            if not topic:
+                raise ValueError(f"subscription {subscription} requires a 'topic'")
+            for field, point in subscription.get("points", {}).items():
+                if isinstance(point, dict):
+                    point_type, index = point.get("type"), point.get("index")
+                else:
+                    point_type, index = point
+                topic_map.add(topic, field, point_type, index)
+        return topic_map
+
+    def add(self, topic: str, field: str, point_type: str, index: int):
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise ValueError(f"index {index!r} of {topic}/{field} should be int")
+        point = (resolve_point_type(point_type), index)
+        if topic not in self._map:
+            self._patterns.add(topic)
+        self._map.setdefault(topic, {})[field] = point
+        self._fields.clear()
+
+    def _topic_fields(self, topic: str) -> Dict[str, PointKey]:
+        fields = self._fields.get(topic)
+        if fields is None:
+            fields = {}
+            for matching_topic in reversed(self._patterns.match(topic)):
+                fields.update(self._map[matching_topic])
+            self._fields[topic] = fields
+        return fields
+
+    @property
+    def topics(self) -> List[str]:
+        return list(self._map)
+
+    def __len__(self):
+        return sum(len(fields) for fields in self._map.values())
+
+    def lookup(self, topic: str, field: str) -> Optional[PointKey]:
+        return self._topic_fields(topic).get(field)
+
+    def map_message(self, topic: str, message: Any) -> Iterator[Tuple[str, int, Any]]:
+        """Yield (point_type, index, value) of the mapped fields in a publish.
+        The message is either a `devices/.../all` message, i.e., [values, meta], or a dict of values.
+        Unmapped topics and fields are skipped.
+        """
+        fields = self._topic_fields(topic)
+        if not fields:
+            return
+        values = message[0] if isinstance(message, list) and message else message
+        if not isinstance(values, dict):
+            return
+        for field, value in values.items():
+            point = fields.get(field)
+            if point is not None:
+                yield point[0], point[1], value
+
+
+class UpdateCoalescer:
+    """Keep only the latest value per point between two drains."""
+
+    def __init__(self):
+        self._pending: Dict[PointKey, Any] = {}
+        self.num_coalesced: int = 0  # number of updates overridden by a later value
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, point_type: str, index: int, value: Any):
+        key = (point_type, index)
+        if key in self._pending:
+            self.num_coalesced += 1
+        self._pending[key] = value
+
+    def drain(self) -> List[list]:
+        """return the pending updates as [point_type, index, value] (i.e., a batch for `apply_update_batch`)"""
+        pending, self._pending = self._pending, {}
+        return [[point_type, index, value] for (point_type, index), value in pending.items()]
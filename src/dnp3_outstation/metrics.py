@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Low-overhead counters and fixed-bucket latency histograms.
+
+Recording is O(1) for counters and O(log(number of buckets)) for histograms, without allocation,
+so it can stay on the update hot path. Rates are derived when the metrics are read.
+"""
+
+import functools
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Sequence
+
+# upper bounds (milliseconds) of the latency histogram buckets, the last bucket is +Inf
+DEFAULT_LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Latency histogram with fixed buckets, i.e., the number of observations <= each upper bound (ms)."""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        ms = seconds * 1e3
+        self.counts[bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.sum += ms
+        if ms > self.max:
+            self.max = ms
+
+    def quantile(self, q: float) -> float:
+        """upper bound (ms) of the bucket holding the q-quantile, i.e., an upper estimate"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {"count": self.count, "sum_ms": self.sum, "max_ms": self.max,
+                "mean_ms": self.sum / self.count if self.count else 0.0,
+                "p50_ms": self.quantile(0.5), "p99_ms": self.quantile(0.99),
+                "buckets_ms": list(self.bounds) + ["+Inf"], "bucket_counts": list(self.counts)}
+
+
+class Metrics:
+    """Named counters and latency histograms.
+
+    Names are dotted, e.g., "rpc.apply_update_batch" (histogram), "updates.Analog" (counter).
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.start_time = time.monotonic()
+        self._last_read = (self.start_time, {})
+
+    def inc(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(self.bounds)
+        histogram.observe(seconds)
+
+    def snapshot(self) -> dict:
+        """the counters and histograms, with the counter rates (per second) since start and since the last
+        snapshot (i.e., "recent_rates")"""
+        now = time.monotonic()
+        # Note: copied first (atomic), i.e., the opendnp3 thread adds counters (e.g., "commands.*") meanwhile
+        counters = dict(self.counters)
+        histograms = dict(self.histograms)
+        uptime = now - self.start_time
+        last_time, last_counters = self._last_read
+        interval = now - last_time
+        self._last_read = (now, counters)
+        return {
+            "uptime_s": uptime,
+            "counters": dict(counters),
+            "rates": {name: count / uptime for name, count in counters.items()} if uptime > 0 else {},
+            "recent_rates": {name: (count - last_counters.get(name, 0)) / interval
+                             for name, count in counters.items()} if interval > 0 else {},
+            "histograms": {name: histogram.snapshot() for name, histogram in histograms.items()},
+        }
+
+
+def timed_method(method: Callable) -> Callable:
+    """Record the latency of each call of `method` in the `metrics` (i.e., a `Metrics`) of its instance,
+    as the "rpc.<method name>" histogram, and count the calls raising an error as "rpc.<method name>.errors".
+    Note: apply it under `@RPC.export`, i.e., the exported method is the timed one.
+    """
+    name = f"rpc.{method.__name__}"
+    errors_name = f"{name}.errors"
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        except Exception:
+            self.metrics.inc(errors_name)
+            raise
+        finally:
+            self.metrics.observe(name, time.perf_counter() - start)
+
+    return wrapper
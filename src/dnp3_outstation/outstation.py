@@ -0,0 +1,765 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""A DNP3 outstation hosted by the agent, i.e., a `MyOutStationNew` and its point map, filters and snapshot.
+
+Note: this module does not depend on the volttron message bus, the agent routes the RPCs and publishes to
+the hosted outstations by name.
+"""
+
+import logging
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from dnp3_python.dnp3station.outstation_new import MyOutStationNew
+from pydnp3 import opendnp3, asiodnp3
+
+from dnp3_outstation.admission import ADMISSION_POLICIES, DEFAULT_ADMISSION_POLICY, DEFAULT_HIGH_WATERMARK, \
+    EventBufferMonitor
+from dnp3_outstation.changelog import DEFAULT_CHANGE_LOG_SIZE, ChangeLog
+from dnp3_outstation.commands import command_record
+from dnp3_outstation.database import DB_CONFIG_ARRAYS, DB_SIZE_FIELDS, DEFAULT_DB_SIZE, DEFAULT_EVENT_BUFFER_SIZE, \
+    DEFAULT_POINT_CLASS, EVENT_BUFFER_FIELDS, VARIATIONS, PointConfig, applies_library_defaults, iter_point_indexes, \
+    parse_point_config, parse_sizes, point_classes
+from dnp3_outstation.filters import DeadbandFilter
+from dnp3_outstation.ingest import TopicPointMap, UpdateCoalescer
+from dnp3_outstation.metrics import Metrics
+from dnp3_outstation.points import (ANALOG_INPUT, ANALOG_OUTPUT, BINARY_INPUT, BINARY_OUTPUT, QUALITY_FLAGS,
+                                    coerce_point_value, iter_point_updates_with_metadata, parse_quality_flags,
+                                    parse_timestamp, resolve_point_type)
+from dnp3_outstation.query import IndexSpec, query_points
+from dnp3_outstation.registry import PointRegistry
+from dnp3_outstation.shm import DEFAULT_RING_CAPACITY, ShmRingBuffer
+from dnp3_outstation.snapshot import PointSnapshotStore
+from dnp3_outstation.store import PointStore
+
+_log = logging.getLogger(__name__)
+
+# point type -> opendnp3 measurement class
+MEASUREMENT_TYPES = {
+    ANALOG_INPUT: opendnp3.Analog,
+    ANALOG_OUTPUT: opendnp3.AnalogOutputStatus,
+    BINARY_INPUT: opendnp3.Binary,
+    BINARY_OUTPUT: opendnp3.BinaryOutputStatus,
+}
+
+# config keys passed to MyOutStationNew, the others are agent settings, e.g., "response_mode"
+OUTSTATION_CONFIG_KEYS = ("outstation_ip", "port", "master_id", "outstation_id")
+
+DEFAULT_OUTSTATION_NAME = "default"
+
+# point type -> (updates, events, suppressed) counter names, i.e., not formatted on the update hot path
+_UPDATE_COUNTERS = {point_type: (f"updates.{point_type}", f"events.{point_type}", f"suppressed.{point_type}")
+                    for point_type in MEASUREMENT_TYPES}
+
+
+def outstation_kwargs(config: dict) -> dict:
+    """pick the MyOutStationNew init kwargs from the agent config, i.e., plus the database sizes ("db_size"),
+    the event buffer sizes ("event_buffer_size") and the per-point class/variations ("point_config"),
+    see `dnp3_outstation.database`, i.e., only passed if configured, default to the dnp3-python defaults"""
+    kwargs = {key: val for key, val in config.items() if key in OUTSTATION_CONFIG_KEYS}
+    db_sizes = parse_sizes(config.get("db_size"), DEFAULT_DB_SIZE, "db_size")
+    kwargs["point_config"] = parse_point_config(config.get("point_config"), db_sizes)
+    kwargs["point_counts"] = db_sizes
+
+    if config.get("db_size") is not None:
+        kwargs["db_sizes"] = opendnp3.DatabaseSizes.AllTypes(count=0)
+        for point_type, size in db_sizes.items():
+            setattr(kwargs["db_sizes"], DB_SIZE_FIELDS[point_type], size)
+    if config.get("event_buffer_size") is not None:
+        event_buffer_sizes = parse_sizes(config["event_buffer_size"], DEFAULT_EVENT_BUFFER_SIZE, "event_buffer_size")
+        kwargs["event_buffer_config"] = opendnp3.EventBufferConfig().AllTypes(sizes=0)
+        for point_type, size in event_buffer_sizes.items():
+            setattr(kwargs["event_buffer_config"], EVENT_BUFFER_FIELDS[point_type], size)
+    return kwargs
+
+
+def configure_points(db_config, point_configs: List[PointConfig], point_counts: Dict[str, int]):
+    """apply the per-point event class and static/event variations to an opendnp3 `DatabaseConfig`
+    Note: later entries override the earlier ones"""
+    for point_config in point_configs:
+        points = getattr(db_config, DB_CONFIG_ARRAYS[point_config.point_type])
+        (static_enum, _), (event_enum, _) = VARIATIONS[point_config.point_type]
+        point_class = None if point_config.point_class is None else \
+            getattr(opendnp3.PointClass, f"Class{point_config.point_class}")
+        static_variation = None if point_config.static_variation is None else \
+            getattr(getattr(opendnp3, static_enum), point_config.static_variation)
+        event_variation = None if point_config.event_variation is None else \
+            getattr(getattr(opendnp3, event_enum), point_config.event_variation)
+        for index in iter_point_indexes(point_config, point_counts[point_config.point_type]):
+            if point_class is not None:
+                points[index].clazz = point_class
+            if static_variation is not None:
+                points[index].svariation = static_variation
+            if event_variation is not None:
+                points[index].evariation = event_variation
+
+
+# alias
+CommandCallback = Callable[[str, int, Any, Any, Optional[Exception], float], None]
+
+
+class OutstationApplication(MyOutStationNew):
+    """MyOutStationNew which reports the master commands, i.e., `process_point_value` (called from the opendnp3
+    thread) applies the command through `apply_update`, then `command_callback` is called with
+    (command_type, index, op_type, applied measurement or None, exception or None, receive time).
+    Note: the agent applies its own updates with `asiodnp3.UpdateBuilder`, not `apply_update`.
+    Note: the point values are kept in the `Outstation.point_store`, i.e., the dnp3-python database dict
+        (`db_handler.db`) is cleared and no longer filled.
+    point_config, point_counts: the per-point class/variations applied on top of the dnp3-python database config,
+        and the number of points per point type (i.e., the "db_size"), see `outstation_kwargs`
+    """
+
+    def __init__(self, command_callback: Optional[CommandCallback] = None,
+                 point_config: List[PointConfig] = (), point_counts: Dict[str, int] = None, **kwargs):
+        self.command_callback = command_callback
+        self._command_measurement = None
+        # Note: set before the MyOutStationNew init, which calls `configure_database`
+        self.point_config = list(point_config)
+        self.point_counts = point_counts
+        super().__init__(**kwargs)
+        self.db_handler.db.clear()
+
+    def configure_database(self, db_config):
+        # Note: the dnp3-python defaults assign the first few points, i.e., skipped if the database is smaller
+        counts = self.point_counts
+        if counts is None or applies_library_defaults(counts):
+            MyOutStationNew.configure_database(db_config)
+        if self.point_config:
+            configure_points(db_config, self.point_config, counts)
+
+    def process_point_value(self, command_type, command, index, op_type):
+        received = time.time()
+        self._command_measurement = None
+        error = None
+        try:
+            super().process_point_value(command_type, command, index, op_type)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if self.command_callback is not None:
+                try:
+                    self.command_callback(command_type, index, op_type, self._command_measurement, error, received)
+                except Exception as e:
+                    _log.error(f"Failed to process {command_type} command on index {index}: {e}")
+
+    def apply_update(self, measurement, index):
+        # Note: `MyOutStationNew.apply_update` without `db_handler.process`
+        self.outstation.Apply(asiodnp3.UpdateBuilder().Update(measurement, index).Build())
+        self._command_measurement = measurement
+
+
+def create_outstation_application(config: dict,
+                                  command_callback: Optional[CommandCallback] = None) -> MyOutStationNew:
+    outstation_application = OutstationApplication(command_callback=command_callback, **outstation_kwargs(config))
+    # Note: register this very instance for the command handler lookup (keyed by `ip-port`),
+    #  otherwise master commands of every outstation in the process are routed to the first one.
+    MyOutStationNew.add_outstation_app(outstation_id=outstation_application.outstation_app_id,
+                                       outstation_app=outstation_application)
+    return outstation_application
+
+
+def make_measurement(point_type: str, val: Any, flags: int = None, timestamp: float = None):
+    """the opendnp3 measurement of a (validated) point value, with the quality flags (default to ONLINE)
+    and the source timestamp (epoch seconds, default to none, i.e., the event is stamped on receipt)"""
+    measurement_type = MEASUREMENT_TYPES[point_type]
+    if flags is None and timestamp is None:
+        return measurement_type(value=val)
+    flags = QUALITY_FLAGS["ONLINE"] if flags is None else flags
+    if timestamp is None:
+        return measurement_type(val, flags)
+    return measurement_type(val, flags, opendnp3.DNPTime(int(timestamp * 1000)))
+
+
+def store_to_batch(point_store: PointStore) -> dict:
+    """convert the (set) points in a `PointStore` to a columnar batch with their quality flags and timestamps"""
+    batch = {"types": [], "indexes": [], "values": [], "flags": [], "timestamps": []}
+    for point_type, points in point_store.items():
+        for index, val, flags, timestamp in points.items_set():
+            batch["types"].append(point_type)
+            batch["indexes"].append(index)
+            batch["values"].append(val)
+            batch["flags"].append(flags)
+            batch["timestamps"].append(timestamp)
+    return batch
+
+
+class Outstation:
+    """One DNP3 outstation hosted by the agent.
+
+    config: the outstation config, i.e., "outstation_ip", "port", "master_id", "outstation_id" and the
+        per-outstation settings "point_map", "subscriptions", "deadbands", "snapshot_path" and "shm_ring".
+    """
+
+    def __init__(self, name: str, config: dict):
+        self.name = name
+        self.config = config
+        self.application: MyOutStationNew = create_outstation_application(config, self._on_command)
+        # the point values, i.e., in place of `db_handler.db`
+        self.point_store = PointStore(self.application.point_counts)
+        # called with the command records (from the opendnp3 thread), e.g., `CommandQueue.put`
+        self.event_sink: Optional[Callable[[dict], None]] = None
+
+        # tabular point registry, i.e., "point_map" csv
+        self.point_registry = self._load_point_registry(config.get("point_map"))
+
+        # pub/sub ingestion, i.e., topic fields mapped to outstation points
+        try:
+            self.topic_point_map = TopicPointMap.from_config(config.get("subscriptions", []))
+            for source_topic, source_field, point_type, index in self.point_registry.sources():
+                self.topic_point_map.add(source_topic, source_field, point_type, index)
+        except (TypeError, ValueError) as e:
+            _log.error(f"Invalid subscriptions config of outstation {name}, pub/sub ingestion is disabled: {e}")
+            self.topic_point_map = TopicPointMap()
+        self.update_coalescer = UpdateCoalescer()
+
+        # per-point deadbands, i.e., updates within the deadband do not create an event
+        # Note: "deadbands" config entries override the point registry deadbands
+        deadbands = [{"type": point_type, "index": index, "absolute": deadband}
+                     for point_type, index, deadband in self.point_registry.deadbands()]
+        deadbands.extend(config.get("deadbands", []))
+        try:
+            self.deadband_filter = DeadbandFilter.from_config(deadbands)
+        except (TypeError, ValueError) as e:
+            _log.error(f"Invalid deadbands config of outstation {name}, deadband filtering is disabled: {e}")
+            self.deadband_filter = DeadbandFilter()
+
+        # persistent point snapshot, i.e., warm restart
+        self.snapshot_store = None
+        snapshot_path = config.get("snapshot_path")
+        if snapshot_path:
+            try:
+                self.snapshot_store = PointSnapshotStore(snapshot_path)
+            except sqlite3.Error as e:
+                _log.error(f"Failed to open snapshot_path {snapshot_path}, the point snapshot is disabled: {e}")
+
+        # shared-memory ingestion ring, i.e., local producers write point update records, see `drain_ring`
+        self.ingest_ring: Optional[ShmRingBuffer] = None
+        ring_name = config.get("shm_ring")
+        if ring_name:
+            try:
+                self.ingest_ring = ShmRingBuffer.create(
+                    ring_name, int(config.get("shm_ring_capacity", DEFAULT_RING_CAPACITY)), replace=True)
+            except (OSError, ValueError) as e:
+                _log.error(f"Failed to create shm_ring {ring_name}, shared-memory ingestion is disabled: {e}")
+
+        # changed points since the last `drain_changes`, i.e., (point_type, index) -> [value, flags, timestamp],
+        # None if not watched (see `watch_changes`)
+        self.changes: Optional[Dict[Tuple[str, int], list]] = None
+        # bumped on each database write transaction and config change, i.e., cache validation, see `versions`
+        self.db_version = 0
+        self.config_version = 0
+        # numbered point changes, i.e., delta queries, see `changes_since`
+        self.change_log = ChangeLog(int(config.get("change_log_size", DEFAULT_CHANGE_LOG_SIZE)))
+        # event buffer occupancy estimate and admission control, see `dnp3_outstation.admission`
+        # Note: the deferred updates ("coalesce" admission) are (point_type, index) -> (measurement, timestamp)
+        self._deferred: Dict[Tuple[str, int], tuple] = {}
+        self._configure_event_buffers()
+
+        # usage statistics, i.e., python-side cost of this outstation
+        self.num_updates: int = 0
+        self.update_cpu_s: float = 0.0
+        # counters and latency histograms, see `get_metrics`
+        self.metrics = Metrics()
+        # channel statistics of the previous applications, i.e., before `reset`
+        self._connection_counts_base = {"opened": 0, "open_failed": 0, "closed": 0}
+
+    def _configure_event_buffers(self):
+        """(re)create the event buffer monitor and the admission settings from `self.config`"""
+        config = self.config
+        self.point_classes: Dict[str, bytearray] = point_classes(config)
+        capacities = parse_sizes(config.get("event_buffer_size"), DEFAULT_EVENT_BUFFER_SIZE, "event_buffer_size")
+        self.event_monitor = EventBufferMonitor(capacities, float(config.get("event_poll_interval", 0)))
+        self.high_watermark = float(config.get("event_high_watermark", DEFAULT_HIGH_WATERMARK))
+        self.admission = config.get("event_admission", DEFAULT_ADMISSION_POLICY)
+        if self.admission not in ADMISSION_POLICIES:
+            _log.error(f"Invalid event_admission {self.admission!r} of outstation {self.name}, should be one of "
+                       f"{ADMISSION_POLICIES}, using {DEFAULT_ADMISSION_POLICY!r}")
+            self.admission = DEFAULT_ADMISSION_POLICY
+
+    def _point_class(self, point_type: str, index: int) -> int:
+        classes = self.point_classes[point_type]
+        return classes[index] if index < len(classes) else DEFAULT_POINT_CLASS
+
+    @staticmethod
+    def _load_point_registry(point_map: str = None) -> PointRegistry:
+        """Load and compile the point registry csv, return an empty registry if not configured or invalid"""
+        if not point_map:
+            return PointRegistry()
+        start = time.perf_counter()
+        try:
+            point_registry = PointRegistry.from_csv(point_map)
+        except (OSError, ValueError) as e:
+            _log.error(f"Failed to load point_map {point_map}, the point registry is disabled: {e}")
+            return PointRegistry()
+        _log.info(f"Loaded {len(point_registry)} points from point_map {point_map} "
+                  f"in {time.perf_counter() - start:.3f} seconds")
+        return point_registry
+
+    @property
+    def db(self) -> dict:
+        """the legacy database dict, e.g., {"Analog": {0: 1.2, 1: None, ...}, ...}, built from the point store"""
+        return self.point_store.to_dict()
+
+    @property
+    def topics(self) -> List[str]:
+        """subscribed topics, i.e., the topics mapped to points of this outstation"""
+        return self.topic_point_map.topics
+
+    @property
+    def is_connected(self) -> bool:
+        return self.application.is_connected
+
+    def get_config(self) -> dict:
+        return self.application.get_config()
+
+    def versions(self) -> dict:
+        """the database and config versions, i.e., a cached `db` or `get_config` result is valid as long as
+        its version is current"""
+        return {"db": self.db_version, "config": self.config_version}
+
+    def db_copy(self) -> dict:
+        """a copy of the legacy database dict, i.e., not mutated by the following updates"""
+        return self.point_store.to_dict()
+
+    def query(self, point_types: Union[str, List[str]] = None, indexes: IndexSpec = None,
+              offset: int = 0, limit: int = None) -> dict:
+        """a filtered page of the database, see `query_points`"""
+        return query_points(self.point_store, point_types, indexes, offset, limit)
+
+    def start(self):
+        """restore the persisted snapshot (if any), then enable the outstation"""
+        if self.snapshot_store is not None:
+            self.restore_snapshot()
+        self.application.start()
+
+    def shutdown(self):
+        self.application.shutdown()
+        self.close()
+
+    def close(self):
+        """flush and close the snapshot store (if any), remove the ingestion ring (if any)"""
+        if self.snapshot_store is not None:
+            self.snapshot_store.close()
+        if self.ingest_ring is not None:
+            self.ingest_ring.close()
+            self.ingest_ring = None
+
+    def reset(self, config: dict = None):
+        """init a new MyOutStationNew from `config` (default to `self.config`), restore the database data
+        (as one batch) before the new outstation accepts connections"""
+        if config is not None:
+            self.config = config
+        saved_points = store_to_batch(self.point_store)
+        self.config_version += 1
+        self._connection_counts_base = self.connection_counts()
+        self.application.shutdown()
+        self.application = create_outstation_application(self.config, self._on_command)
+        # Note: rebuilt for the new "db_size", i.e., the saved points out of the new database fail to restore
+        self.point_store = PointStore(self.application.point_counts)
+        self.deadband_filter.reset()
+        # Note: the deferred updates are kept (unless out of the new database), i.e., applied within the new
+        #  event buffers
+        self._configure_event_buffers()
+        self._deferred = {(point_type, index): deferred for (point_type, index), deferred in self._deferred.items()
+                          if index < len(self.point_classes[point_type])}
+        result = self.apply_batch(saved_points, restore=True)
+        _log.info(f"Restored {result['applied']} points of outstation {self.name}, "
+                  f"{len(result['errors'])} points failed to restore")
+        self.application.start()
+
+    def apply_measurements(self, measurements: List[Tuple[str, int, Any]], restore: bool = False,
+                           timestamps: List[Optional[float]] = None):
+        """Apply (point_type, index, opendnp3 measurement) items as one opendnp3 update, i.e., one transaction.
+        Updates within the point deadband (see `DeadbandFilter`) refresh the static value without creating an event.
+        restore: if True, the items are restored (known) values, i.e., only refresh the static values,
+            without creating events nor marking them in the snapshot store
+        timestamps: optional, the source timestamp of each item (None for the receipt time), as kept in the
+            point store and the snapshot
+        """
+        start = time.process_time()
+        wall_start = time.perf_counter()
+        builder = asiodnp3.UpdateBuilder()
+        # per point type counts, i.e., one dict update per item, then one counter update per type
+        events: Dict[str, int] = {}
+        suppressed: Dict[str, int] = {}
+        # (point_type, event class) -> events, i.e., the event buffer occupancy estimate
+        class_events: Dict[Tuple[str, int], int] = {}
+        point_class = self._point_class
+        for point_type, index, measurement in measurements:
+            if not restore and self.deadband_filter.check(point_type, index, measurement.value,
+                                                          measurement.flags.value):
+                builder.Update(measurement, index)
+                events[point_type] = events.get(point_type, 0) + 1
+                key = (point_type, point_class(point_type, index))
+                class_events[key] = class_events.get(key, 0) + 1
+            else:
+                builder.Update(measurement, index, opendnp3.EventMode.Suppress)
+                suppressed[point_type] = suppressed.get(point_type, 0) + 1
+        self.application.outstation.Apply(builder.Build())
+        if class_events:
+            self.event_monitor.set_connected(self.is_connected)
+            self.event_monitor.record(class_events)
+        now = time.time()
+        if timestamps is None:
+            timestamps = [now] * len(measurements)
+        else:
+            timestamps = [now if timestamp is None else timestamp for timestamp in timestamps]
+        # one bulk write per point type
+        writes: Dict[str, tuple] = {}
+        for (point_type, index, measurement), timestamp in zip(measurements, timestamps):
+            write = writes.get(point_type)
+            if write is None:
+                write = writes[point_type] = ([], [], [], [])
+            write[0].append(index)
+            write[1].append(measurement.value)
+            write[2].append(measurement.flags.value)
+            write[3].append(timestamp)
+        point_store = self.point_store
+        for point_type, (indexes, values, flags, point_timestamps) in writes.items():
+            point_store[point_type].write_many(indexes, values, flags, point_timestamps)
+        # Note: bumped after the writes, i.e., a snapshot built during the writes is invalidated
+        self.db_version += 1
+        if self.snapshot_store is not None and not restore:
+            for (point_type, index, measurement), timestamp in zip(measurements, timestamps):
+                self.snapshot_store.mark(point_type, index, measurement.value, measurement.flags.value, timestamp)
+        if not restore:
+            self.change_log.extend((point_type, index, measurement.value, measurement.flags.value, timestamp)
+                                   for (point_type, index, measurement), timestamp in zip(measurements, timestamps))
+        changes = self.changes
+        if changes is not None and not restore:
+            for (point_type, index, measurement), timestamp in zip(measurements, timestamps):
+                changes[(point_type, index)] = [measurement.value, measurement.flags.value, timestamp]
+        self.num_updates += len(measurements)
+        self.update_cpu_s += time.process_time() - start
+        inc = self.metrics.inc
+        for point_type, count in events.items():
+            updates_name, events_name, _ = _UPDATE_COUNTERS[point_type]
+            inc(updates_name, count)
+            inc(events_name, count)
+        for point_type, count in suppressed.items():
+            updates_name, _, suppressed_name = _UPDATE_COUNTERS[point_type]
+            inc(updates_name, count)
+            inc(suppressed_name, count)
+        inc("transactions")
+        self.metrics.observe("apply", time.perf_counter() - wall_start)
+
+    def apply_batch(self, updates: Union[list, dict], response_mode: str = "ack", restore: bool = False,
+                    flags: Union[int, str, list] = None, timestamp: Union[float, str] = None) -> dict:
+        """Validate a batch of point updates, then apply the valid ones as one opendnp3 update.
+        Invalid items are skipped and reported as `[position, error message]`.
+        flags, timestamp: optional, the quality flags and source timestamp of the items without their own
+            (see `iter_point_updates_with_metadata`)
+        Note: the batch response never carries the full database, "entry" response_mode adds the changed entries.
+        """
+        default_flags = None if flags is None else parse_quality_flags(flags)
+        default_timestamp = None if timestamp is None else parse_timestamp(timestamp)
+        point_store = self.point_store
+        measurements = []
+        timestamps = []
+        positions = []
+        errors = []
+        for position, point_type, index, val, item_flags, item_timestamp in iter_point_updates_with_metadata(updates):
+            try:
+                point_type = resolve_point_type(point_type)
+                if index not in point_store[point_type]:
+                    raise ValueError(f"index {index!r} of {point_type} out of range")
+                val = coerce_point_value(point_type, val)
+                item_flags = default_flags if item_flags is None else parse_quality_flags(item_flags)
+                item_timestamp = default_timestamp if item_timestamp is None else parse_timestamp(item_timestamp)
+            except (TypeError, ValueError) as e:
+                errors.append([position, str(e)])
+                continue
+            measurements.append((point_type, index, make_measurement(point_type, val, item_flags, item_timestamp)))
+            timestamps.append(item_timestamp)
+            positions.append(position)
+
+        result = {"applied": 0, "errors": errors}
+        if measurements and not restore and self.admission != "hint":
+            measurements, timestamps = self._admit(measurements, timestamps, positions, result)
+        if measurements:
+            self.apply_measurements(measurements, restore, timestamps)
+        _log.debug(f"Updated outstation {self.name} with batch of {len(measurements)} points, "
+                   f"{len(errors)} errors")
+
+        result["applied"] = len(measurements)
+        if not restore:
+            occupancy = self.event_monitor.occupancy()
+            if occupancy >= self.high_watermark:
+                result["backpressure"] = {"occupancy": occupancy, "high_watermark": self.high_watermark,
+                                          "retry_after": self.event_monitor.retry_after()}
+        if response_mode == "entry":
+            entries = {}
+            for point_type, index, measurement in measurements:
+                entries.setdefault(point_type, {})[index] = measurement.value
+            result["entries"] = entries
+        return result
+
+    def _admit(self, measurements: List[Tuple[str, int, Any]], timestamps: List[Optional[float]],
+               positions: List[int], result: dict) -> tuple:
+        """admission control of the validated items of a batch (see `EventBufferMonitor.admit`), i.e., the items
+        beyond the high watermark are either deferred ("coalesce", counted in the result "deferred") or reported
+        in the result "errors" ("reject"), return the admitted (measurements, timestamps)"""
+        if self._deferred:
+            # Note: the deferred updates first, i.e., the newer updates of the same points override them
+            self.flush_deferred()
+        self.event_monitor.set_connected(self.is_connected)
+        admitted = self.event_monitor.admit([(point_type, self._point_class(point_type, index))
+                                             for point_type, index, _ in measurements], self.high_watermark)
+        admitted_measurements, admitted_timestamps = [], []
+        held = 0
+        for item, timestamp, position, ok in zip(measurements, timestamps, positions, admitted):
+            point_type, index, measurement = item
+            if ok:
+                admitted_measurements.append(item)
+                admitted_timestamps.append(timestamp)
+                if self._deferred:
+                    self._deferred.pop((point_type, index), None)
+                continue
+            held += 1
+            if self.admission == "coalesce":
+                if (point_type, index) in self._deferred:
+                    self.metrics.inc("admission.coalesced")
+                self._deferred[(point_type, index)] = (measurement, timestamp)
+            else:
+                result["errors"].append([position, f"event buffer of {point_type} above the high watermark "
+                                                   f"({self.high_watermark:.0%}), retry later"])
+        if held:
+            result["errors"].sort(key=lambda error: error[0])
+            self.metrics.inc("admission.deferred" if self.admission == "coalesce" else "admission.rejected", held)
+            if self.admission == "coalesce":
+                result["deferred"] = held
+        return admitted_measurements, admitted_timestamps
+
+    def flush_deferred(self) -> int:
+        """apply the deferred updates (i.e., "coalesce" admission) which fit under the high watermark as one batch,
+        return the number of applied updates"""
+        if not self._deferred:
+            return 0
+        self.event_monitor.set_connected(self.is_connected)
+        keys = list(self._deferred)
+        admitted = self.event_monitor.admit([(point_type, self._point_class(point_type, index))
+                                             for point_type, index in keys], self.high_watermark)
+        measurements, timestamps = [], []
+        for (point_type, index), ok in zip(keys, admitted):
+            if ok:
+                measurement, timestamp = self._deferred.pop((point_type, index))
+                measurements.append((point_type, index, measurement))
+                timestamps.append(timestamp)
+        if measurements:
+            self.apply_measurements(measurements, timestamps=timestamps)
+        return len(measurements)
+
+    def apply_by_name(self, updates: Dict[str, Any], response_mode: str = "ack") -> dict:
+        """apply point updates addressed by point name in the point registry, i.e., {name: val}"""
+        batch = []
+        names = []
+        errors = []
+        for name, val in updates.items():
+            point = self.point_registry.lookup(name)
+            if point is None:
+                errors.append([name, f"unknown point name {name!r}"])
+                continue
+            point_type, index = point
+            batch.append([point_type, index, self.point_registry.scale(point_type, index, val)])
+            names.append(name)
+        result = self.apply_batch(batch, response_mode)
+        result["errors"] = errors + [[names[position], message] for position, message in result["errors"]]
+        return result
+
+    def apply_point(self, point_type: str, index: int, val: Any, response_mode: str = "ack",
+                    flags: Union[int, str, list] = None, timestamp: Union[float, str] = None) -> dict:
+        """apply a single (validated) point update, then build the response according to `response_mode`,
+        raise ValueError if `index` is out of the database
+        flags: optional, the point quality flags, e.g., `COMM_LOST` or "COMM_LOST" (see `parse_quality_flags`),
+            default to the opendnp3 default (i.e., ONLINE)
+        timestamp: optional, the source timestamp, epoch seconds or ISO 8601, default to the receipt time
+        """
+        start = time.perf_counter()
+        if index not in self.point_store[point_type]:
+            raise ValueError(f"index {index!r} of {point_type} out of range")
+        flags = None if flags is None else parse_quality_flags(flags)
+        timestamp = None if timestamp is None else parse_timestamp(timestamp)
+        measurement = make_measurement(point_type, val, flags, timestamp)
+        self.apply_measurements([(point_type, index, measurement)], timestamps=[timestamp])
+        response = self.update_response(point_type, index, response_mode)
+        self.metrics.observe(f"apply_point.{point_type}", time.perf_counter() - start)
+        return response
+
+    def update_response(self, point_type: str, index: int, response_mode: str) -> dict:
+        """Build the apply_update_* RPC response according to `response_mode`
+        "db": the full database (legacy behavior), e.g., {"Analog": {0: 1.2, 1: None, ...}, "Binary": {...}, ...}
+        "entry": only the changed entry, e.g., {"Analog": {0: 1.2}}
+        "ack": acknowledgement only, i.e., {"applied": 1}
+        """
+        if response_mode == "db":
+            return self.db
+        if response_mode == "entry":
+            return {point_type: {index: self.point_store[point_type].get(index)}}
+        return {"applied": 1}
+
+    def _on_command(self, command_type: str, index: int, op_type: Any, measurement: Any,
+                    error: Optional[Exception], received: float):
+        """mirror the point updated on a master command, then hand the command record over to `event_sink`
+        (called from the opendnp3 thread)"""
+        self.metrics.inc(f"commands.{command_type}")
+        if error is not None:
+            self.metrics.inc("commands.errors")
+        point_type = value = previous = None
+        if measurement is not None:
+            point_type, value = type(measurement).__name__, measurement.value
+            if point_type in self.point_store:
+                previous = self.point_store[point_type].get(index)
+                self.point_store[point_type].write(index, value, measurement.flags.value)
+                if self.snapshot_store is not None:
+                    self.snapshot_store.mark(point_type, index, value, measurement.flags.value)
+                self.change_log.extend([(point_type, index, value, measurement.flags.value, received)])
+                self.event_monitor.record({(point_type, self._point_class(point_type, index)): 1})
+                self.db_version += 1
+                changes = self.changes
+                if changes is not None:
+                    changes[(point_type, index)] = [value, measurement.flags.value, received]
+        if self.event_sink is not None:
+            status = "SUCCESS" if error is None else f"FAILED: {error}"
+            self.event_sink(command_record(self.name, command_type, point_type, index, value, status,
+                                           None if op_type is None else str(op_type), received, previous))
+
+    def ingest(self, topic: str, message: Any, coalesce: bool = False):
+        """map a pub/sub message to outstation points (scaled by the point registry),
+        then either apply them as one batch or hold them until the next `flush_coalesced`"""
+        updates = ((point_type, index, self.point_registry.scale(point_type, index, val))
+                   for point_type, index, val in self.topic_point_map.map_message(topic, message))
+        if coalesce:
+            for point_type, index, val in updates:
+                self.update_coalescer.add(point_type, index, val)
+            return
+        result = self.apply_batch(list(updates))
+        if result["errors"]:
+            _log.warning(f"Failed to apply updates from topic {topic} to outstation {self.name}: "
+                         f"{result['errors']}")
+
+    def flush_coalesced(self):
+        """apply the latest value per point received since the last flush as one batch"""
+        if not len(self.update_coalescer):
+            return
+        result = self.apply_batch(self.update_coalescer.drain())
+        if result["errors"]:
+            _log.warning(f"Failed to apply coalesced updates to outstation {self.name}: {result['errors']}")
+
+    def drain_ring(self, max_records: int = None) -> int:
+        """apply the pending records of the ingestion ring (at most `max_records`) as one batch,
+        return the number of drained records"""
+        if self.ingest_ring is None:
+            return 0
+        batch = self.ingest_ring.read_batch(max_records)
+        num_records = len(batch["types"])
+        if not num_records:
+            return 0
+        self.metrics.inc("ring.records", num_records)
+        result = self.apply_batch(batch)
+        if result["errors"]:
+            self.metrics.inc("ring.errors", len(result["errors"]))
+            _log.warning(f"Failed to apply ring records to outstation {self.name}: {result['errors'][:10]}")
+        return num_records
+
+    def changes_since(self, seq: int = 0, epoch: str = None, limit: int = None) -> dict:
+        """the point changes after the sequence number `seq`, or a resync hint, see `ChangeLog.since`"""
+        return self.change_log.since(seq, epoch, limit)
+
+    def watch_changes(self, enabled: bool = True):
+        """start (or stop) tracking the changed points, see `drain_changes`"""
+        if not enabled:
+            self.changes = None
+        elif self.changes is None:
+            self.changes = {}
+
+    def drain_changes(self) -> dict:
+        """the points changed since the last call (latest value per point) and the connection state, i.e.,
+        {"points": [[point_type, index, value, flags, timestamp], ...], "connected": bool}"""
+        changes = self.changes
+        if changes is not None:
+            # Note: swap first, i.e., the master commands (opendnp3 thread) write to the new dict
+            self.changes = {}
+        points = [[point_type, index, *change] for (point_type, index), change in list((changes or {}).items())]
+        return {"points": points, "connected": self.is_connected}
+
+    def restore_snapshot(self):
+        """bulk-load the persisted point values into the outstation (as one batch)"""
+        start = time.perf_counter()
+        batch = {"types": [], "indexes": [], "values": [], "flags": [], "timestamps": []}
+        for point_type, index, val, flags, timestamp in self.snapshot_store.load():
+            batch["types"].append(point_type)
+            batch["indexes"].append(index)
+            batch["values"].append(val)
+            batch["flags"].append(flags)
+            batch["timestamps"].append(timestamp)
+        result = self.apply_batch(batch, restore=True)
+        _log.info(f"Restored {result['applied']} points from snapshot {self.snapshot_store.path} "
+                  f"in {time.perf_counter() - start:.3f} seconds, {len(result['errors'])} points failed to restore")
+
+    def flush_snapshot(self):
+        if self.snapshot_store is None:
+            return
+        try:
+            self.snapshot_store.flush()
+        except sqlite3.Error as e:
+            _log.error(f"Failed to write the point snapshot of outstation {self.name}: {e}")
+
+    def connection_counts(self) -> dict:
+        """master connections accepted ("opened"), failed and closed (i.e., disconnects) since the agent started,
+        from the opendnp3 channel statistics"""
+        base = self._connection_counts_base
+        try:
+            channel = self.application.channel.GetStatistics().channel
+        except AttributeError:
+            return dict(base)
+        return {"opened": base["opened"] + channel.numOpen, "open_failed": base["open_failed"] + channel.numOpenFail,
+                "closed": base["closed"] + channel.numClose}
+
+    def get_metrics(self) -> dict:
+        """counters (i.e., updates, events and suppressed updates per point type, transactions, ring records,
+        master commands and admission control), their rates, the latency histograms (i.e., "apply" per transaction,
+        "apply_point.<point type>"), the master connection counts, the estimated event buffer occupancy (see
+        `EventBufferMonitor.snapshot`, plus the number of "deferred" updates) and the ingestion ring state (if any)"""
+        metrics = self.metrics.snapshot()
+        metrics["connections"] = self.connection_counts()
+        self.event_monitor.set_connected(self.is_connected)
+        metrics["event_buffers"] = self.event_monitor.snapshot()
+        metrics["event_buffers"]["deferred"] = len(self._deferred)
+        ring = self.ingest_ring
+        if ring is not None:
+            metrics["ingest_ring"] = {"name": ring.name, "capacity": ring.capacity, "pending": len(ring),
+                                      "written": ring.head, "dropped": ring.dropped}
+        return metrics
+
+    def stats(self) -> dict:
+        """python-side usage of this outstation, i.e., number of points, updates, cpu and memory"""
+        return {
+            "points": self.point_store.num_points,
+            "registry_points": len(self.point_registry),
+            "num_updates": self.num_updates,
+            "update_cpu_s": self.update_cpu_s,
+            "store_memory_bytes": self.point_store.nbytes,
+            "is_connected": self.is_connected,
+        }
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Point type helpers shared by the outstation agent.
+
+Point types are named after the opendnp3 measurement classes, which are also the keys
+of the outstation database (i.e., `MyOutStationNew.db_handler.db`).
+"""
+
+import datetime
+from typing import Any, Iterator, List, Tuple, Union
+
+ANALOG_INPUT = "Analog"
+ANALOG_OUTPUT = "AnalogOutputStatus"
+BINARY_INPUT = "Binary"
+BINARY_OUTPUT = "BinaryOutputStatus"
+
+POINT_TYPES = (ANALOG_INPUT, ANALOG_OUTPUT, BINARY_INPUT, BINARY_OUTPUT)
+ANALOG_TYPES = (ANALOG_INPUT, ANALOG_OUTPUT)
+BINARY_TYPES = (BINARY_INPUT, BINARY_OUTPUT)
+
+# Note: short aliases follow the vdnp3_outstation cli menu, i.e., <ai>, <ao>, <bi>, <bo>
+POINT_TYPE_ALIASES = {
+    "ai": ANALOG_INPUT,
+    "ao": ANALOG_OUTPUT,
+    "bi": BINARY_INPUT,
+    "bo": BINARY_OUTPUT,
+}
+POINT_TYPE_ALIASES.update({point_type.lower(): point_type for point_type in POINT_TYPES})
+
+# DNP3 quality flags (i.e., opendnp3 `AnalogQuality` and `BinaryQuality`)
+# Note: 0x20 is OVERRANGE for analog points and CHATTER_FILTER for binary points
+QUALITY_FLAGS = {
+    "ONLINE": 0x01,
+    "RESTART": 0x02,
+    "COMM_LOST": 0x04,
+    "REMOTE_FORCED": 0x08,
+    "LOCAL_FORCED": 0x10,
+    "OVERRANGE": 0x20,
+    "CHATTER_FILTER": 0x20,
+    "REFERENCE_ERR": 0x40,
+}
+
+# alias
+PointUpdate = Tuple[int, Any, Any, Any]
+PointUpdateWithMetadata = Tuple[int, Any, Any, Any, Any, Any]
+
+
+def resolve_point_type(point_type: str) -> str:
+    """Resolve a point type name or alias (e.g., "ai", "analog") to its canonical name (e.g., "Analog")."""
+    try:
+        return POINT_TYPE_ALIASES[point_type.lower()]
+    except (AttributeError, KeyError):
+        raise ValueError(f"unknown point type {point_type!r}, should be one of {list(POINT_TYPE_ALIASES)}")
+
+
+def coerce_point_value(point_type: str, value: Any) -> Union[float, bool]:
+    """Validate `value` against the (canonical) point type.
+    Analog values accept int or float and are returned as float,
+    binary values accept bool or 0/1 and are returned as bool.
+    """
+    if point_type in ANALOG_TYPES:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"value {value!r} of {point_type} should be float")
+        return float(value)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    raise TypeError(f"value {value!r} of {point_type} should be bool")
+
+
+def parse_value_text(text: str) -> Any:
+    """Parse a point value from text (e.g., a csv cell) to bool, int or float,
+    e.g., "true" -> True, "1" -> 1, "1.5" -> 1.5, kept as str otherwise (i.e., rejected by `coerce_point_value`).
+    """
+    text = text.strip()
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_quality_flags(flags: Union[int, str, List[str]]) -> int:
+    """Parse DNP3 quality flags, i.e., an int (0 .. 255), or flag names as a list or a "|" separated string,
+    e.g., "ONLINE|LOCAL_FORCED" -> 0x11, ["COMM_LOST"] -> 0x04 (i.e., offline)
+    """
+    if isinstance(flags, int) and not isinstance(flags, bool):
+        if not 0 <= flags <= 0xFF:
+            raise ValueError(f"quality flags {flags} should be within 0 .. 255")
+        return flags
+    names = flags.split("|") if isinstance(flags, str) else flags
+    if not isinstance(names, list):
+        raise TypeError(f"quality flags {flags!r} should be an int or flag names, e.g., 'ONLINE|LOCAL_FORCED'")
+    value = 0
+    for name in names:
+        try:
+            value |= QUALITY_FLAGS[str(name).strip().upper()]
+        except KeyError:
+            raise ValueError(f"unknown quality flag {name!r}, should be one of {list(QUALITY_FLAGS)}")
+    return value
+
+
+def parse_timestamp(value: Union[str, int, float, datetime.datetime]) -> float:
+    """epoch seconds from a number, a datetime or a numeric or ISO 8601 string (naive is UTC)"""
+    if isinstance(value, datetime.datetime):
+        timestamp = value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    else:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+        try:
+            timestamp = datetime.datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        except ValueError:
+            raise ValueError(f"invalid timestamp {value!r}, should be epoch seconds or ISO 8601")
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+    return timestamp.timestamp()
+
+
+def iter_point_updates_with_metadata(updates: Union[list, dict]) -> Iterator[PointUpdateWithMetadata]:
+    """Iterate over a batch of point updates, yield (position, point_type, index, value, flags, timestamp).
+
+    The batch is either row based, i.e., a list of `[point_type, index, value]`, optionally followed by the
+    quality flags and the source timestamp, e.g., `["ai", 0, 1.5, "COMM_LOST", 1667088000.0]`
+    (or dict with the keys "type", "index", "value", "flags" and "timestamp"),
+    or columnar, i.e., `{"types": [...], "indexes": [...], "values": [...]}` with optional "flags" and
+    "timestamps" lists. Missing flags and timestamps are None.
+    Note: the yielded items are NOT validated, see `resolve_point_type`, `coerce_point_value`,
+        `parse_quality_flags` and `parse_timestamp`.
+    """
+    if isinstance(updates, dict):
+        keys = ["types", "indexes", "values"] + [key for key in ("flags", "timestamps") if key in updates]
+        columns = [updates.get(key) for key in keys]
+        if any(not isinstance(column, list) for column in columns):
+            raise ValueError(f"columnar updates require {', '.join(repr(key) for key in keys)} lists")
+        if len(set(len(column) for column in columns)) != 1:
+            raise ValueError(f"columnar updates require {', '.join(repr(key) for key in keys)} of the same length")
+        flags = updates.get("flags") or [None] * len(columns[0])
+        timestamps = updates.get("timestamps") or [None] * len(columns[0])
+        for position, item in enumerate(zip(*columns[:3], flags, timestamps)):
+            yield (position,) + item
+        return
+
+    for position, item in enumerate(updates):
+        if isinstance(item, dict):
+            yield (position, item.get("type"), item.get("index"), item.get("value"), item.get("flags"),
+                   item.get("timestamp"))
+        elif isinstance(item, (list, tuple)) and 3 <= len(item) <= 5:
+            yield (position,) + tuple(item) + (None,) * (5 - len(item))
+        else:
+            yield position, None, None, item, None, None
+
+
+def iter_point_updates(updates: Union[list, dict]) -> Iterator[PointUpdate]:
+    """Iterate over a batch of point updates, yield (position, point_type, index, value),
+    i.e., `iter_point_updates_with_metadata` without the quality flags and timestamps.
+    """
+    for position, point_type, index, value, _, _ in iter_point_updates_with_metadata(updates):
+        yield position, point_type, index, value
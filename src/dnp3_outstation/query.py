@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Filtered and paginated queries of the outstation database, i.e., only the requested slice is serialized."""
+
+from collections.abc import Mapping
+from typing import List, Optional, Sequence, Tuple, Union
+
+from dnp3_outstation.points import POINT_TYPES, resolve_point_type
+
+# alias
+IndexSpec = Union[int, str, list]
+
+
+def parse_index_spec(indexes: IndexSpec) -> List[Tuple[int, int]]:
+    """Parse an index filter into sorted, merged, inclusive (start, stop) ranges.
+
+    The filter is an index, a list of indexes and/or inclusive [start, stop] ranges, e.g., [[0, 9], 15],
+    or a string of the same, e.g., "0-9,15".
+    """
+    if isinstance(indexes, str):
+        items = []
+        for part in indexes.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            start, sep, stop = part.partition("-")
+            try:
+                items.append([int(start), int(stop)] if sep else int(start))
+            except ValueError:
+                raise ValueError(f"invalid index range {part!r}, e.g., '0-9,15'")
+    elif isinstance(indexes, list):
+        items = indexes
+    else:
+        items = [indexes]
+
+    ranges = []
+    for item in items:
+        if isinstance(item, int) and not isinstance(item, bool):
+            ranges.append((item, item))
+        elif (isinstance(item, (list, tuple)) and len(item) == 2
+              and all(isinstance(i, int) and not isinstance(i, bool) for i in item) and item[0] <= item[1]):
+            ranges.append((item[0], item[1]))
+        else:
+            raise ValueError(f"invalid index {item!r}, should be an int or an inclusive [start, stop] range")
+
+    merged = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def _index_runs(points: Mapping, ranges: Optional[List[Tuple[int, int]]]) -> List[Sequence[int]]:
+    """the (sorted) indexes of `points` within `ranges` (all if None), as runs of indexes.
+    Note: for a dense mapping (i.e., `points.dense`, indexes 0 .. len - 1) the runs are `range` objects,
+        thus counting and paging do not iterate over the matched points.
+    """
+    if getattr(points, "dense", False):
+        last = len(points) - 1
+        if ranges is None:
+            return [range(last + 1)]
+        return [range(max(start, 0), min(stop, last) + 1) for start, stop in ranges if start <= last and stop >= 0]
+    if ranges is None:
+        return [sorted(points)]
+    runs = []
+    for start, stop in ranges:
+        if stop - start + 1 > len(points):
+            # note: wide range over a small database, filter the existing indexes instead
+            runs.append(sorted(index for index in points if start <= index <= stop))
+        else:
+            runs.append([index for index in range(start, stop + 1) if index in points])
+    return runs
+
+
+def query_points(db: dict, point_types: Union[str, List[str], None] = None, indexes: IndexSpec = None,
+                 offset: int = 0, limit: Optional[int] = None) -> dict:
+    """Select the points of `db` (i.e., a `PointStore`, or a `db_handler.db` shaped dict) by point type(s) and index filter,
+    ordered by point type then index, and return the page [offset, offset + limit).
+
+    return: {"points": {point_type: {index: val}}, "total": <number of matched points>,
+             "offset": offset, "next_offset": <offset of the next page, None if last page>}
+    """
+    if isinstance(point_types, str):
+        point_types = [point_types]
+    types = POINT_TYPES if point_types is None else [resolve_point_type(point_type) for point_type in point_types]
+    ranges = None if indexes is None else parse_index_spec(indexes)
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError(f"offset {offset!r} should be a non-negative int")
+    if limit is not None and (not isinstance(limit, int) or limit < 0):
+        raise ValueError(f"limit {limit!r} should be a non-negative int")
+
+    selected = {}
+    total = 0
+    stop = None if limit is None else offset + limit
+    for point_type in dict.fromkeys(types):
+        points = db.get(point_type, {})
+        for run in _index_runs(points, ranges):
+            # the part of the run within the page [offset, stop)
+            first = max(offset - total, 0)
+            last = len(run) if stop is None else max(min(stop - total, len(run)), 0)
+            page = run[first:last]
+            if page and isinstance(page, range) and hasattr(points, "read_many"):
+                # i.e., a bulk read of the `PointArray` slice
+                selected.setdefault(point_type, {}).update(zip(page, points.read_many(page)))
+            else:
+                for index in page:
+                    selected.setdefault(point_type, {})[index] = points[index]
+            total += len(run)
+
+    next_offset = stop if stop is not None and stop < total else None
+    return {"points": selected, "total": total, "offset": offset, "next_offset": next_offset}
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Tabular (csv) point registry, compiled into indexed lookup structures.
+
+Example csv (the header is required, columns other than name, type and index are optional),
+
+    name,type,index,scaling,deadband,source_topic,source_field
+    ZoneTemperature,Analog,0,1.0,0.5,devices/campus/building/rtu1/all,ZoneTemperature
+    FanStatus,Binary,0,,,devices/campus/building/rtu1/all,
+"""
+
+import csv
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from dnp3_outstation.points import ANALOG_TYPES, POINT_TYPES, resolve_point_type
+
+# alias
+PointKey = Tuple[str, int]  # (point_type, index)
+
+REQUIRED_COLUMNS = ("name", "type", "index")
+
+
+class PointRow(NamedTuple):
+    name: str
+    point_type: str
+    index: int
+    scaling: float = 1.0
+    deadband: float = 0.0
+    source_topic: str = ""
+    source_field: str = ""
+
+
+def iter_point_rows(lines: Iterable[str]) -> Iterator[PointRow]:
+    """Parse the registry csv row by row, i.e., without loading the whole file."""
+    reader = csv.reader(lines)
+    header = [column.strip().lower() for column in next(reader, [])]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"point registry is missing columns {missing}")
+    positions = {column: header.index(column) for column in PointRow._fields if column in header}
+    positions["point_type"] = header.index("type")
+
+    def _get(row: List[str], column: str) -> str:
+        position = positions.get(column)
+        return row[position].strip() if position is not None and position < len(row) else ""
+
+    for line_num, row in enumerate(reader, start=2):
+        if not row or not any(row):
+            continue
+        try:
+            name = _get(row, "name")
+            if not name:
+                raise ValueError("empty name")
+            yield PointRow(name=name,
+                           point_type=resolve_point_type(_get(row, "point_type")),
+                           index=int(_get(row, "index")),
+                           scaling=float(_get(row, "scaling") or 1.0),
+                           deadband=float(_get(row, "deadband") or 0.0),
+                           source_topic=_get(row, "source_topic"),
+                           source_field=_get(row, "source_field") or name)
+        except ValueError as e:
+            raise ValueError(f"point registry line {line_num}: {e}")
+
+
+class PointRegistry:
+    """Point registry compiled into
+    - name -> (point_type, index), i.e., a dict
+    - point_type -> index -> metadata, i.e., arrays indexed by point index
+    so that lookups on the update path are O(1).
+    """
+
+    def __init__(self, rows: Iterable[PointRow] = ()):
+        self._points: Dict[str, PointKey] = {}
+        self._names: Dict[str, List[Optional[str]]] = {point_type: [] for point_type in POINT_TYPES}
+        self._scaling: Dict[str, array] = {point_type: array("d") for point_type in POINT_TYPES}
+        self._deadband: Dict[str, array] = {point_type: array("d") for point_type in POINT_TYPES}
+        self._sources: List[Tuple[str, str, str, int]] = []  # (source_topic, source_field, point_type, index)
+        for row in rows:
+            self.add(row)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "PointRegistry":
+        with open(path, newline="") as f:
+            return cls(iter_point_rows(f))
+
+    def add(self, row: PointRow):
+        if row.name in self._points:
+            raise ValueError(f"duplicated point name {row.name!r}")
+        if row.index < 0:
+            raise ValueError(f"index {row.index} of {row.name!r} should not be negative")
+        names = self._names[row.point_type]
+        if row.index < len(names) and names[row.index] is not None:
+            raise ValueError(f"{row.point_type} index {row.index} is used by both "
+                             f"{names[row.index]!r} and {row.name!r}")
+        self._grow(row.point_type, row.index + 1)
+        self._points[row.name] = (row.point_type, row.index)
+        names[row.index] = row.name
+        self._scaling[row.point_type][row.index] = row.scaling
+        self._deadband[row.point_type][row.index] = row.deadband
+        if row.source_topic:
+            self._sources.append((row.source_topic, row.source_field, row.point_type, row.index))
+
+    def _grow(self, point_type: str, size: int):
+        names = self._names[point_type]
+        if size <= len(names):
+            return
+        num = size - len(names)
+        names.extend([None] * num)
+        self._scaling[point_type].extend([1.0] * num)
+        self._deadband[point_type].extend([0.0] * num)
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, name: str):
+        return name in self._points
+
+    def lookup(self, name: str) -> Optional[PointKey]:
+        """name -> (point_type, index)"""
+        return self._points.get(name)
+
+    def name(self, point_type: str, index: int) -> Optional[str]:
+        names = self._names[point_type]
+        return names[index] if 0 <= index < len(names) else None
+
+    def scale(self, point_type: str, index: int, value):
+        """apply the point scaling to an analog value, binary values are returned as is"""
+        if point_type not in ANALOG_TYPES or isinstance(value, bool) or not isinstance(value, (int, float)):
+            return value
+        scaling = self._scaling[point_type]
+        return value * scaling[index] if 0 <= index < len(scaling) else value
+
+    def deadbands(self) -> Iterator[Tuple[str, int, float]]:
+        """yield (point_type, index, absolute deadband) of the points with a deadband"""
+        for point_type, deadbands in self._deadband.items():
+            for index, deadband in enumerate(deadbands):
+                if deadband > 0:
+                    yield point_type, index, deadband
+
+    def sources(self) -> List[Tuple[str, str, str, int]]:
+        """(source_topic, source_field, point_type, index) of the points with a source topic"""
+        return list(self._sources)
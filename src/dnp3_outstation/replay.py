@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Replay of recorded, timestamped point values (csv or parquet) into the hosted outstations.
+
+The file is streamed through a generator pipeline (rows -> records -> time-ordered batches), i.e., never loaded
+in memory, and the batches are applied at the recorded pace scaled by `speed` (e.g., 1 for real time, 10 for 10x),
+or as fast as possible (speed 0).
+
+File columns: "timestamp" (epoch seconds or ISO 8601), "type", "index", "value" and, optionally, "outstation"
+(default to the replay outstation), e.g.,
+    timestamp,type,index,value
+    2022-10-30T00:00:00+00:00,ai,0,1.5
+    2022-10-30T00:00:01+00:00,bo,2,1
+"""
+
+import csv
+import logging
+import time
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Union
+
+from dnp3_outstation.points import parse_timestamp, parse_value_text
+
+_log = logging.getLogger(__name__)
+
+REPLAY_COLUMNS = ("timestamp", "type", "index", "value")
+
+# seconds, replay batches applied later than this behind schedule count as "late"
+DEFAULT_LAG_TOLERANCE = 1.0
+
+# seconds, maximum sleep between two checks of pause/seek/stop
+_POLL_INTERVAL = 0.1
+
+
+class ReplayRecord(NamedTuple):
+    timestamp: float
+    outstation: Optional[str]
+    point_type: Any
+    index: Any
+    value: Any
+
+
+def _iter_csv_rows(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        missing = set(REPLAY_COLUMNS) - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"replay file {path} requires the columns {REPLAY_COLUMNS}, missing {sorted(missing)}")
+        for row in reader:
+            row["index"] = parse_value_text(row["index"])
+            row["value"] = parse_value_text(row["value"])
+            yield row
+
+
+def _iter_parquet_rows(path: str, batch_size: int = 10000) -> Iterator[Dict[str, Any]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("replay of parquet files requires pyarrow, i.e., `pip install pyarrow`")
+    parquet_file = pq.ParquetFile(path)
+    missing = set(REPLAY_COLUMNS) - set(parquet_file.schema_arrow.names)
+    if missing:
+        raise ValueError(f"replay file {path} requires the columns {REPLAY_COLUMNS}, missing {sorted(missing)}")
+    # Note: one row group slice at a time, i.e., the memory is bounded by `batch_size` rows
+    for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield from record_batch.to_pylist()
+
+
+def iter_records(path: str, start: float = None) -> Iterator[ReplayRecord]:
+    """stream the records of a csv or parquet (by extension) replay file, skipping those before `start`"""
+    rows = _iter_parquet_rows(path) if path.lower().endswith(".parquet") else _iter_csv_rows(path)
+    for row in rows:
+        timestamp = parse_timestamp(row["timestamp"])
+        if start is not None and timestamp < start:
+            continue
+        yield ReplayRecord(timestamp, row.get("outstation") or None, row["type"], row["index"], row["value"])
+
+
+def iter_replay_batches(records: Iterator[ReplayRecord], batch_window: float = 0.0) -> Iterator[tuple]:
+    """group consecutive records within `batch_window` seconds of the first record of the batch, yield
+    (timestamp of the batch, {outstation: columnar batch}), i.e., one transaction per outstation.
+    Note: a record older than the previous one (i.e., out of order) joins the current batch.
+    """
+    batch_time = None
+    batches: Dict[Optional[str], dict] = {}
+    for record in records:
+        if batch_time is not None and record.timestamp > batch_time + batch_window:
+            yield batch_time, batches
+            batch_time, batches = None, {}
+        if batch_time is None:
+            batch_time = record.timestamp
+        batch = batches.setdefault(record.outstation, {"types": [], "indexes": [], "values": []})
+        batch["types"].append(record.point_type)
+        batch["indexes"].append(record.index)
+        batch["values"].append(record.value)
+    if batch_time is not None:
+        yield batch_time, batches
+
+
+class ReplayEngine:
+    """Apply the batches of a replay file at the recorded pace, with pause, resume, seek and stop,
+    and report whether the replay kept up with the requested speed.
+
+    apply: called with (outstation name or None, columnar batch), returns the number of rejected updates
+    speed: replay speed, i.e., 1 for real time, N for N times faster, 0 for as fast as possible
+    Note: `run` blocks until the end of the file (or `stop`), pass a cooperative `sleep` (e.g., `gevent.sleep`)
+        to run it in a greenlet.
+    """
+
+    def __init__(self, path: str, apply: Callable[[Optional[str], dict], int], speed: float = 1.0,
+                 batch_window: float = 0.0, start: float = None, lag_tolerance: float = DEFAULT_LAG_TOLERANCE,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        if speed < 0:
+            raise ValueError(f"speed {speed} should be non-negative, 0 for as fast as possible")
+        if batch_window < 0:
+            raise ValueError(f"batch_window {batch_window} should be non-negative")
+        self.path = path
+        self.apply = apply
+        self.speed = speed
+        self.batch_window = batch_window
+        self.lag_tolerance = lag_tolerance
+        self.clock = clock
+        self.sleep = sleep
+
+        self.state = "ready"  # "running", "paused", "stopped", "finished" or "failed"
+        self.error: Optional[str] = None
+        self.position: Optional[float] = start  # timestamp of the last applied batch
+        self._seek_to: Optional[float] = start
+        self._anchor = None  # (clock, data timestamp) the pace is measured from
+        self._last_time: Optional[float] = None  # timestamp of the last batch since the last seek
+        self._started: Optional[float] = None
+        self._ended: Optional[float] = None
+        self._paused_time = 0.0
+
+        self.num_batches = 0
+        self.num_updates = 0
+        self.num_rejected = 0
+        self.num_late = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self._data_time = 0.0  # recorded seconds replayed
+
+    def pause(self):
+        if self.state == "running":
+            self.state = "paused"
+
+    def resume(self):
+        if self.state == "paused":
+            self.state = "running"
+
+    def stop(self):
+        if self.state in ("ready", "running", "paused"):
+            self.state = "stopped"
+
+    def seek(self, timestamp: Union[str, float]):
+        """continue the replay from the first record at or after `timestamp` (forward or backward)"""
+        self._seek_to = parse_timestamp(timestamp)
+
+    def run(self):
+        self.state = "running"
+        self._started = self.clock()
+        try:
+            self._run()
+        except Exception as e:
+            self.state, self.error = "failed", str(e)
+            _log.error(f"Replay of {self.path} failed: {e}")
+        else:
+            if self.state == "running":
+                self.state = "finished"
+        finally:
+            self._ended = self.clock()
+
+    def _run(self):
+        batches = None
+        while self.state in ("running", "paused"):
+            if self._seek_to is not None:
+                batches = iter_replay_batches(iter_records(self.path, self._seek_to), self.batch_window)
+                self._seek_to, self._anchor, self._last_time = None, None, None
+            elif batches is None:
+                batches = iter_replay_batches(iter_records(self.path), self.batch_window)
+            batch = next(batches, None)
+            if batch is None:
+                return
+            timestamp, outstation_batches = batch
+            if not self._wait_until_due(timestamp):
+                continue  # i.e., seek or stop, the pending batch is dropped
+            self._apply(timestamp, outstation_batches)
+            # Note: yield after every batch, i.e., `_wait_until_due` does not sleep at speed 0 or once behind
+            # schedule, the pause/seek/stop calls (and the other greenlets) would wait until the end of the file
+            self.sleep(0)
+
+    def _wait_until_due(self, timestamp: float) -> bool:
+        """wait until the batch at `timestamp` is due (or as long as paused), False if interrupted by seek/stop"""
+        while True:
+            if self.state not in ("running", "paused") or self._seek_to is not None:
+                return False
+            if self.state == "paused":
+                self._anchor = None  # i.e., the pace restarts on resume
+                paused = self.clock()
+                self.sleep(_POLL_INTERVAL)
+                self._paused_time += self.clock() - paused
+                continue
+            if self._anchor is None:
+                self._anchor = (self.clock(), timestamp)
+            if not self.speed:
+                return True
+            delay = self._due(timestamp) - self.clock()
+            if delay <= 0:
+                return True
+            self.sleep(min(delay, _POLL_INTERVAL))
+
+    def _due(self, timestamp: float) -> float:
+        anchor_clock, anchor_time = self._anchor
+        return anchor_clock + (timestamp - anchor_time) / self.speed
+
+    def _apply(self, timestamp: float, outstation_batches: Dict[Optional[str], dict]):
+        now = self.clock()
+        if self.speed:
+            lag = max(now - self._due(timestamp), 0.0)
+            self.total_lag += lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.lag_tolerance:
+                self.num_late += 1
+        for outstation, batch in outstation_batches.items():
+            self.num_rejected += self.apply(outstation, batch)
+            self.num_updates += len(batch["types"])
+        if self._last_time is not None and timestamp > self._last_time:
+            self._data_time += timestamp - self._last_time
+        self._last_time = self.position = timestamp
+        self.num_batches += 1
+
+    def status(self) -> dict:
+        """the replay state and report, i.e., "kept_up" is False if a batch was applied later than the lag
+        tolerance behind schedule (None at max speed), and "achieved_speed" is the recorded seconds replayed per
+        second of replay (excluding the pauses)"""
+        elapsed = 0.0
+        if self._started is not None:
+            elapsed = (self.clock() if self._ended is None else self._ended) - self._started - self._paused_time
+        return {
+            "path": self.path,
+            "state": self.state,
+            "error": self.error,
+            "speed": self.speed,
+            "position": self.position,
+            "batches": self.num_batches,
+            "updates": self.num_updates,
+            "rejected": self.num_rejected,
+            "late_batches": self.num_late,
+            "mean_lag_s": self.total_lag / self.num_batches if self.num_batches else 0.0,
+            "max_lag_s": self.max_lag,
+            "kept_up": self.num_late == 0 if self.speed else None,
+            "elapsed_s": elapsed,
+            "achieved_speed": self._data_time / elapsed if elapsed > 0 else None,
+        }
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Routing table of the master control commands to the platform driver device points (i.e., `set_point`)."""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from dnp3_outstation.points import ANALOG_OUTPUT, BINARY_OUTPUT, resolve_point_type
+
+DEFAULT_DRIVER_IDENTITY = "platform.driver"
+DEFAULT_COMMAND_TIMEOUT = 5.0
+
+# opendnp3 quality flag, i.e., the downstream device did not accept the command
+COMM_LOST = 0x04
+
+
+class Route(NamedTuple):
+    path: str  # device path, e.g., "campus/building/rtu1"
+    point: str  # device point name, e.g., "ZoneCoolingTemperatureSetPoint"
+    timeout: float  # seconds to wait for the set_point result
+
+
+class CommandRouter:
+    """Precompiled lookup table: (outstation, point_type, index) -> `Route`
+
+    Config format (i.e., the agent config "command_routes" entry), e.g.,
+        [{"type": "ao", "index": 0, "path": "campus/building/rtu1", "point": "ZoneCoolingTemperatureSetPoint",
+          "timeout": 10},
+         {"outstation": "feeder2", "type": "bo", "index": 1, "path": "campus/building/rtu2", "point": "FanStatus"}]
+    An entry without "outstation" applies to every hosted outstation without a route of its own.
+    Only the output points (i.e., "AnalogOutputStatus" and "BinaryOutputStatus") are commanded by a master.
+    """
+
+    def __init__(self, default_timeout: float = DEFAULT_COMMAND_TIMEOUT):
+        self.default_timeout = default_timeout
+        self._routes: Dict[Tuple[Optional[str], str, int], Route] = {}
+
+    @classmethod
+    def from_config(cls, routes: List[dict], default_timeout: float = DEFAULT_COMMAND_TIMEOUT) -> "CommandRouter":
+        router = cls(default_timeout)
+        for route in routes:
+            router.add(route.get("type"), route.get("index"), route.get("path"), route.get("point"),
+                       route.get("timeout"), route.get("outstation"))
+        return router
+
+    def __len__(self):
+        return len(self._routes)
+
+    def add(self, point_type: str, index: int, path: str, point: str, timeout: float = None,
+            outstation: str = None):
+        point_type = resolve_point_type(point_type)
+        if point_type not in (ANALOG_OUTPUT, BINARY_OUTPUT):
+            raise ValueError(f"command route of {point_type} should be an output point type")
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise ValueError(f"index {index!r} of the command route should be int")
+        if not path or not point:
+            raise ValueError(f"command route {point_type} {index} requires a 'path' and a 'point'")
+        timeout = self.default_timeout if timeout is None else float(timeout)
+        if timeout <= 0:
+            raise ValueError(f"timeout {timeout} of the command route should be positive")
+        self._routes[(outstation, point_type, index)] = Route(path, point, timeout)
+
+    def lookup(self, outstation: str, point_type: str, index: int) -> Optional[Route]:
+        route = self._routes.get((outstation, point_type, index))
+        if route is None:
+            route = self._routes.get((None, point_type, index))
+        return route
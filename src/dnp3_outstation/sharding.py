@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Shard the hosted outstations across a pool of worker processes.
+
+The agent stays the single VIP front end, each worker process hosts its share of the outstations,
+and the agent forwards the outstation method calls to the owning worker over a pipe.
+Calls to the same worker are sent as one message (i.e., one round trip per worker, not per call),
+thus batched updates amortize the IPC cost.
+The outstation events (i.e., master command records, see `Outstation.event_sink`) are forwarded in batches
+over a second, one-way pipe.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dnp3_outstation.commands import CommandQueue
+
+_log = logging.getLogger(__name__)
+
+# alias
+Call = Tuple[str, str, tuple, dict]  # (outstation name, method, args, kwargs)
+
+
+def shard_assignments(names: List[str], num_workers: int) -> List[List[str]]:
+    """assign the outstations to `num_workers` workers round-robin (in config order)"""
+    if num_workers < 1:
+        raise ValueError(f"num_workers {num_workers} should be at least 1")
+    shards = [[] for _ in range(min(num_workers, len(names)))]
+    for position, name in enumerate(names):
+        shards[position % len(shards)].append(name)
+    return shards
+
+
+def _forward_events(events: CommandQueue, pending: threading.Event, events_conn):
+    """worker thread: send the pending events as one batch per wake-up, i.e., the producer never blocks"""
+    while True:
+        pending.wait()
+        pending.clear()
+        batch = events.drain()
+        if not batch:
+            continue
+        try:
+            events_conn.send(batch)
+        except (BrokenPipeError, OSError):
+            return
+
+
+def _worker_main(conn, events_conn, factory: Callable, configs: Dict[str, dict]):
+    """worker process loop: host the outstations, then serve the calls until a None message (or EOF)"""
+    try:
+        outstations = {name: factory(name, config) for name, config in configs.items()}
+    except Exception as e:
+        conn.send(e)
+        return
+    pending = threading.Event()
+    events = CommandQueue(notify=pending.set)
+    for outstation in outstations.values():
+        if hasattr(outstation, "event_sink"):
+            outstation.event_sink = events.put
+    threading.Thread(target=_forward_events, args=(events, pending, events_conn), daemon=True).start()
+    conn.send(os.getpid())
+    try:
+        while True:
+            try:
+                calls = conn.recv()
+            except EOFError:
+                break
+            if calls is None:
+                break
+            results = []
+            for name, method, args, kwargs in calls:
+                try:
+                    attr = getattr(outstations[name], method)
+                    results.append((True, attr(*args, **kwargs) if callable(attr) else attr))
+                except Exception as e:
+                    results.append((False, e))
+            conn.send(results)
+    finally:
+        for outstation in outstations.values():
+            close = getattr(outstation, "close", None)
+            if close is not None:
+                close()
+        conn.close()
+
+
+class ShardWorker:
+    """Agent-side handle of one worker process.
+
+    wait_read: optional, called with the pipe file descriptor before each (blocking) receive,
+        e.g., `gevent.socket.wait_read` to yield to the other greenlets while the worker is busy.
+    lock_factory: lock guarding the request/response round trip, e.g., `gevent.lock.Semaphore`.
+    """
+
+    def __init__(self, index: int, factory: Callable, configs: Dict[str, dict], context,
+                 wait_read: Optional[Callable[[int], Any]] = None, lock_factory: Callable = threading.Lock):
+        self.index = index
+        self.names = list(configs)
+        self.pid: Optional[int] = None
+        self._conn, child_conn = context.Pipe()
+        self._events_conn, child_events_conn = context.Pipe(duplex=False)
+        self._process = context.Process(target=_worker_main,
+                                        args=(child_conn, child_events_conn, factory, configs),
+                                        name=f"dnp3-outstation-worker-{index}", daemon=True)
+        self._child_conns = (child_conn, child_events_conn)
+        self._wait_read = wait_read
+        self.lock = lock_factory()
+
+    def start(self):
+        """start the worker process and wait until its outstations are created"""
+        self._process.start()
+        for child_conn in self._child_conns:
+            child_conn.close()
+        ready = self._recv()
+        if isinstance(ready, Exception):
+            self._process.join()
+            raise ready
+        self.pid = ready
+
+    def send(self, calls: List[Call]):
+        self._conn.send(calls)
+
+    def _recv(self) -> Any:
+        if self._wait_read is not None:
+            self._wait_read(self._conn.fileno())
+        return self._conn.recv()
+
+    def recv(self) -> List[Tuple[bool, Any]]:
+        return self._recv()
+
+    def recv_events(self) -> List[Any]:
+        """wait for the next batch of events, raise EOFError once the worker exits"""
+        if self._wait_read is not None:
+            self._wait_read(self._events_conn.fileno())
+        return self._events_conn.recv()
+
+    def close(self, timeout: float = 10):
+        if self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._conn.close()
+        self._events_conn.close()
+
+
+class ShardPool:
+    """Outstations sharded across `num_workers` worker processes.
+
+    factory: picklable callable (e.g., the `Outstation` class) called in the worker as `factory(name, config)`.
+    start_method: multiprocessing start method, "spawn" by default, i.e., the workers do not inherit the
+        agent's (gevent/opendnp3) threads and sockets.
+    """
+
+    def __init__(self, factory: Callable, configs: Dict[str, dict], num_workers: int,
+                 wait_read: Optional[Callable[[int], Any]] = None, lock_factory: Callable = threading.Lock,
+                 start_method: str = "spawn"):
+        context = multiprocessing.get_context(start_method)
+        self.workers: List[ShardWorker] = []
+        self._worker_of: Dict[str, ShardWorker] = {}
+        for index, names in enumerate(shard_assignments(list(configs), num_workers)):
+            worker = ShardWorker(index, factory, {name: configs[name] for name in names}, context,
+                                 wait_read, lock_factory)
+            self.workers.append(worker)
+            self._worker_of.update({name: worker for name in names})
+
+    def start(self):
+        try:
+            for worker in self.workers:
+                worker.start()
+        except Exception:
+            self.close()
+            raise
+        _log.info(f"Started {len(self.workers)} outstation workers, pids {[w.pid for w in self.workers]}")
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+
+    def worker_of(self, name: str) -> ShardWorker:
+        try:
+            return self._worker_of[name]
+        except KeyError:
+            raise ValueError(f"unknown outstation {name!r}, should be one of {list(self._worker_of)}")
+
+    def call(self, name: str, method: str, *args, **kwargs) -> Any:
+        """call `method` of outstation `name` in its worker, return the result or raise the worker exception"""
+        return self.call_many([(name, method, args, kwargs)])[0]
+
+    def call_many(self, calls: List[Call]) -> List[Any]:
+        """Send the calls grouped per worker (one message each), then collect the results in call order,
+        i.e., the workers process their share in parallel.
+        Note: the first exception raised by a call is re-raised after all the results are received.
+        """
+        grouped: Dict[int, List[int]] = {}
+        for position, (name, method, args, kwargs) in enumerate(calls):
+            grouped.setdefault(self.worker_of(name).index, []).append(position)
+        workers = [self.workers[index] for index in sorted(grouped)]  # lock order, i.e., no deadlock
+
+        results: List[Any] = [None] * len(calls)
+        error: Optional[Exception] = None
+        for worker in workers:
+            worker.lock.acquire()
+        try:
+            for worker in workers:
+                worker.send([calls[position] for position in grouped[worker.index]])
+            for worker in workers:
+                for position, (ok, result) in zip(grouped[worker.index], worker.recv()):
+                    results[position] = result
+                    if not ok and error is None:
+                        error = result
+        finally:
+            for worker in reversed(workers):
+                worker.lock.release()
+        if error is not None:
+            raise error
+        return results
+
+
+class RemoteOutstation:
+    """Agent-side proxy of an outstation hosted by a `ShardPool` worker, i.e., the `Outstation` interface
+    used by the agent, forwarded over IPC."""
+
+    def __init__(self, pool: ShardPool, name: str, config: dict, topics: List[str]):
+        self.pool = pool
+        self.name = name
+        self.config = config
+        self.topics = topics
+
+    def _call(self, method: str, *args, **kwargs) -> Any:
+        return self.pool.call(self.name, method, *args, **kwargs)
+
+    @property
+    def db(self) -> dict:
+        return self._call("db")
+
+    @property
+    def is_connected(self) -> bool:
+        return self._call("is_connected")
+
+    def get_config(self) -> dict:
+        return self._call("get_config")
+
+    def versions(self) -> dict:
+        return self._call("versions")
+
+    def db_copy(self) -> dict:
+        return self._call("db_copy")
+
+    def query(self, point_types=None, indexes=None, offset: int = 0, limit: int = None) -> dict:
+        return self._call("query", point_types, indexes, offset, limit)
+
+    def start(self):
+        self._call("start")
+
+    def close(self):
+        self._call("close")
+
+    def reset(self, config: dict = None):
+        if config is not None:
+            self.config = config
+        self._call("reset", self.config)
+
+    def apply_point(self, point_type: str, index: int, val: Any, response_mode: str = "ack",
+                    flags=None, timestamp=None) -> dict:
+        return self._call("apply_point", point_type, index, val, response_mode, flags, timestamp)
+
+    def apply_batch(self, updates, response_mode: str = "ack", flags=None, timestamp=None) -> dict:
+        return self._call("apply_batch", updates, response_mode, flags=flags, timestamp=timestamp)
+
+    def apply_by_name(self, updates: Dict[str, Any], response_mode: str = "ack") -> dict:
+        return self._call("apply_by_name", updates, response_mode)
+
+    def ingest(self, topic: str, message: Any, coalesce: bool = False):
+        self._call("ingest", topic, message, coalesce)
+
+    def flush_coalesced(self):
+        self._call("flush_coalesced")
+
+    def flush_snapshot(self):
+        self._call("flush_snapshot")
+
+    def flush_deferred(self) -> int:
+        return self._call("flush_deferred")
+
+    def get_metrics(self) -> dict:
+        return self._call("get_metrics")
+
+    def changes_since(self, seq: int = 0, epoch: str = None, limit: int = None) -> dict:
+        return self._call("changes_since", seq, epoch, limit)
+
+    def watch_changes(self, enabled: bool = True):
+        self._call("watch_changes", enabled)
+
+    def drain_changes(self) -> dict:
+        return self._call("drain_changes")
+
+    def stats(self) -> dict:
+        worker = self.pool.worker_of(self.name)
+        return {**self._call("stats"), "worker": worker.index, "worker_pid": worker.pid}
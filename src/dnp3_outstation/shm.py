@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Shared-memory ring buffer of point updates, i.e., an ingestion channel for producers on the agent host.
+
+The ring is a `multiprocessing.shared_memory` segment of a header and `capacity` fixed-size records
+(point type, quality flags, index, value, timestamp). It has a single producer (which only advances "head")
+and a single consumer (which only advances "tail"), thus needs no lock: the producer writes the records before
+publishing the new head, and the consumer decodes the records before releasing them with the new tail.
+A full ring rejects the records (counted as "dropped") rather than overwriting unread ones.
+
+Producer, e.g., a data acquisition process:
+    ring = ShmRingBuffer.attach("dnp3_ingest")
+    ring.write([("ai", 0, 72.1, None, None), ("bi", 3, True, "COMM_LOST", 1667088000.0)])
+"""
+
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dnp3_outstation.points import BINARY_TYPES, POINT_TYPES, parse_quality_flags, parse_timestamp, resolve_point_type
+
+_MAGIC = b"DNP3RING"
+_VERSION = 1
+# magic, version, record size, capacity, head, tail, dropped
+_HEADER = struct.Struct("<8sIIQQQQ")
+_HEADER_SIZE = 64
+_HEAD_OFFSET, _TAIL_OFFSET, _DROPPED_OFFSET = 24, 32, 40
+_COUNTER = struct.Struct("<Q")
+
+# point type code, flags, has_flags/has_timestamp mask, index, value, timestamp (epoch seconds)
+RECORD = struct.Struct("<BBBxIdd")
+_HAS_FLAGS, _HAS_TIMESTAMP = 0x01, 0x02
+
+# point type -> code, i.e., the position in POINT_TYPES
+_TYPE_CODES = {point_type: code for code, point_type in enumerate(POINT_TYPES)}
+
+DEFAULT_RING_CAPACITY = 65536
+
+# alias
+RingRecord = Tuple[Any, int, Any, Any, Optional[float]]  # (point_type, index, value, flags, timestamp)
+
+
+class ShmRingBuffer:
+    """Single producer, single consumer ring of point update records in shared memory."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        magic, version, record_size, capacity = _HEADER.unpack_from(shm.buf, 0)[:4]
+        if magic != _MAGIC or version != _VERSION or record_size != RECORD.size:
+            raise ValueError(f"shared memory {shm.name} is not a version {_VERSION} point update ring")
+        self.capacity = capacity
+        self._records = shm.buf[_HEADER_SIZE:_HEADER_SIZE + capacity * RECORD.size]
+
+    @classmethod
+    def create(cls, name: Optional[str] = None, capacity: int = DEFAULT_RING_CAPACITY,
+               replace: bool = False) -> "ShmRingBuffer":
+        """create the segment (i.e., the consumer side), `name` None for a random name,
+        `replace` to remove an existing segment of the same name first (e.g., left by a killed process)"""
+        if capacity < 1:
+            raise ValueError(f"capacity {capacity} should be positive")
+        size = _HEADER_SIZE + capacity * RECORD.size
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            if not replace:
+                raise
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, _VERSION, RECORD.size, capacity, 0, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "ShmRingBuffer":
+        """attach to an existing segment (i.e., the producer side)"""
+        # Note: an attached segment should not be tracked, i.e., unlinked by the resource tracker when this process
+        # exits, nor unregistered from the tracker shared with the creator process (e.g., spawned processes)
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)  # python >= 3.13
+        except TypeError:
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args: None
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _counter(self, offset: int) -> int:
+        return _COUNTER.unpack_from(self.shm.buf, offset)[0]
+
+    @property
+    def head(self) -> int:
+        """number of records written since creation"""
+        return self._counter(_HEAD_OFFSET)
+
+    @property
+    def tail(self) -> int:
+        """number of records consumed since creation"""
+        return self._counter(_TAIL_OFFSET)
+
+    @property
+    def dropped(self) -> int:
+        """number of records rejected because the ring was full"""
+        return self._counter(_DROPPED_OFFSET)
+
+    def __len__(self):
+        """number of pending records"""
+        return self.head - self.tail
+
+    def write(self, records: Iterable[RingRecord]) -> int:
+        """(producer) append (point_type, index, value, flags, timestamp) records, flags and timestamp may be None,
+        return the number of written records, i.e., the others were rejected because the ring is full"""
+        head, tail = self.head, self.tail
+        buf, capacity, pack_into, size = self._records, self.capacity, RECORD.pack_into, RECORD.size
+        written = rejected = 0
+        for point_type, index, value, flags, timestamp in records:
+            if head - tail >= capacity:
+                rejected += 1
+                continue
+            mask = 0
+            if flags is not None:
+                flags, mask = parse_quality_flags(flags), _HAS_FLAGS
+            if timestamp is not None:
+                timestamp, mask = parse_timestamp(timestamp), mask | _HAS_TIMESTAMP
+            pack_into(buf, (head % capacity) * size, _TYPE_CODES[resolve_point_type(point_type)], flags or 0, mask,
+                      index, value, timestamp or 0.0)
+            head += 1
+            written += 1
+        # Note: publish the records to the consumer
+        _COUNTER.pack_into(self.shm.buf, _HEAD_OFFSET, head)
+        if rejected:
+            _COUNTER.pack_into(self.shm.buf, _DROPPED_OFFSET, self.dropped + rejected)
+        return written
+
+    def read_batch(self, max_records: Optional[int] = None) -> Dict[str, List]:
+        """(consumer) pop the pending records (at most `max_records`) as a columnar batch, i.e.,
+        {"types": [...], "indexes": [...], "values": [...], "flags": [...], "timestamps": [...]}
+        (see `Outstation.apply_batch`), binary values are returned as bool"""
+        head, tail = self.head, self.tail
+        count = head - tail if max_records is None else min(head - tail, max_records)
+        batch = {"types": [], "indexes": [], "values": [], "flags": [], "timestamps": []}
+        if count <= 0:
+            return batch
+        start = tail % self.capacity
+        stop = start + count
+        chunks = [(start, min(stop, self.capacity))]
+        if stop > self.capacity:
+            chunks.append((0, stop - self.capacity))
+        types, indexes, values = batch["types"], batch["indexes"], batch["values"]
+        flags_column, timestamps = batch["flags"], batch["timestamps"]
+        for first, last in chunks:
+            for code, flags, mask, index, value, timestamp in RECORD.iter_unpack(
+                    self._records[first * RECORD.size:last * RECORD.size]):
+                point_type = POINT_TYPES[code]
+                types.append(point_type)
+                indexes.append(index)
+                values.append(bool(value) if point_type in BINARY_TYPES else value)
+                flags_column.append(flags if mask & _HAS_FLAGS else None)
+                timestamps.append(timestamp if mask & _HAS_TIMESTAMP else None)
+        # Note: release the records to the producer
+        _COUNTER.pack_into(self.shm.buf, _TAIL_OFFSET, tail + count)
+        return batch
+
+    def close(self):
+        """detach, and remove the segment if created by this process"""
+        self._records.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Persistent on-disk snapshot of the outstation point values (sqlite in WAL mode), for warm restart."""
+
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, Tuple
+
+from dnp3_outstation.points import BINARY_TYPES
+
+# alias
+PointKey = Tuple[str, int]  # (point_type, index)
+PointRecord = Tuple[str, int, Any, int, float]  # (point_type, index, value, flags, timestamp)
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS points (
+    point_type TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    value REAL,
+    flags INTEGER,
+    timestamp REAL,
+    PRIMARY KEY (point_type, idx)
+) WITHOUT ROWID
+"""
+
+_UPSERT = "INSERT OR REPLACE INTO points (point_type, idx, value, flags, timestamp) VALUES (?, ?, ?, ?, ?)"
+
+
+class PointSnapshotStore:
+    """Point values and qualities persisted in a sqlite database.
+
+    Changed points are marked in memory (i.e., the latest value per point), and written by `flush`,
+    so the write cost is bounded by the number of changed points, not the database size.
+    Thread-safe, i.e., the master commands are marked from the opendnp3 thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_CREATE_TABLE)
+        self._conn.commit()
+        self._dirty: Dict[PointKey, Tuple[Any, int, float]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """number of changed points not flushed yet"""
+        return len(self._dirty)
+
+    def mark(self, point_type: str, index: int, value: Any, flags: int = 0, timestamp: float = None):
+        """record a changed point, O(1)"""
+        entry = (value, flags, time.time() if timestamp is None else timestamp)
+        with self._lock:
+            self._dirty[(point_type, index)] = entry
+
+    def flush(self) -> int:
+        """write the changed points in one transaction, return the number of written points
+        Raises sqlite3.Error if the transaction fails, the changed points are then kept for the next flush"""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            dirty, self._dirty = self._dirty, {}
+        try:
+            with self._conn:
+                self._conn.executemany(_UPSERT, ((point_type, index, float(value), flags, timestamp)
+                                                 for (point_type, index), (value, flags, timestamp) in dirty.items()))
+        except sqlite3.Error:
+            # Note: kept for the next flush, the points marked meanwhile are newer
+            with self._lock:
+                for key, entry in dirty.items():
+                    self._dirty.setdefault(key, entry)
+            raise
+        return len(dirty)
+
+    def load(self) -> Iterator[PointRecord]:
+        """yield the persisted (point_type, index, value, flags, timestamp), binary values are returned as bool"""
+        cursor = self._conn.execute("SELECT point_type, idx, value, flags, timestamp FROM points")
+        for point_type, index, value, flags, timestamp in cursor:
+            if point_type in BINARY_TYPES:
+                value = bool(value)
+            yield point_type, index, value, flags, timestamp
+
+    def clear(self):
+        with self._lock:
+            self._dirty.clear()
+        with self._conn:
+            self._conn.execute("DELETE FROM points")
+
+    def close(self):
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Compact, array-backed store of the outstation point values, i.e., in place of the nested dict of
+dnp3-python (`db_handler.db`), which the outstation no longer fills.
+
+Per point type, the values are kept in a float64 array (analog) or a bitset (binary), with parallel
+quality flag (uint8) and timestamp (float64) arrays, and a bitset of the points that were set
+(i.e., `None` in `db_handler.db`). A point costs ~17 bytes (analog) or ~9 bytes (binary),
+instead of the python objects of a nested dict.
+"""
+
+import time
+from array import array
+from collections.abc import Mapping
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from dnp3_outstation.points import ANALOG_TYPES, POINT_TYPES, resolve_point_type
+
+
+# the 8 bits of each byte value, i.e., the bitset decoding table
+_BYTE_BITS = [tuple(bool(byte >> bit & 1) for bit in range(8)) for byte in range(256)]
+
+
+def _get_bit(bits: bytearray, index: int) -> bool:
+    return bool(bits[index >> 3] & (1 << (index & 7)))
+
+
+def _set_bit_range(bits: bytearray, start: int, stop: int):
+    """set the bits start .. stop - 1, i.e., whole bytes at once"""
+    first_byte, last_byte = (start + 7) >> 3, stop >> 3
+    if first_byte >= last_byte:
+        for index in range(start, stop):
+            bits[index >> 3] |= 1 << (index & 7)
+        return
+    for index in range(start, first_byte << 3):
+        bits[index >> 3] |= 1 << (index & 7)
+    bits[first_byte:last_byte] = b"\xff" * (last_byte - first_byte)
+    for index in range(last_byte << 3, stop):
+        bits[index >> 3] |= 1 << (index & 7)
+
+
+def _set_bit(bits: bytearray, index: int, value: bool):
+    if value:
+        bits[index >> 3] |= 1 << (index & 7)
+    else:
+        bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+
+class PointArray(Mapping):
+    """The points of one type, i.e., a read-only `index -> value` mapping (unset points read as None),
+    like `db_handler.db[point_type]`, with bulk read/write."""
+
+    dense = True  # i.e., indexes 0 .. size - 1, see `query_points`
+
+    def __init__(self, point_type: str, size: int = 0):
+        self.point_type = point_type
+        self.is_analog = point_type in ANALOG_TYPES
+        self.size = 0
+        self.values = array("d") if self.is_analog else bytearray()  # bitset if binary
+        self.flags = array("B")
+        self.timestamps = array("d")
+        self._is_set = bytearray()
+        self.resize(size)
+
+    def resize(self, size: int):
+        """grow to `size` points (i.e., indexes 0 .. size - 1), never shrinks"""
+        grow = size - self.size
+        if grow <= 0:
+            return
+        num_bytes = (size + 7) // 8
+        if self.is_analog:
+            self.values.extend(array("d", bytes(8 * grow)))
+        else:
+            self.values.extend(bytes(num_bytes - len(self.values)))
+        self._is_set.extend(bytes(num_bytes - len(self._is_set)))
+        self.flags.extend(bytes(grow))
+        self.timestamps.extend(array("d", bytes(8 * grow)))
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.size))
+
+    def __contains__(self, index: Any) -> bool:
+        return isinstance(index, int) and not isinstance(index, bool) and 0 <= index < self.size
+
+    def __getitem__(self, index: int) -> Any:
+        if index not in self:
+            raise KeyError(index)
+        if not _get_bit(self._is_set, index):
+            return None
+        return self.values[index] if self.is_analog else _get_bit(self.values, index)
+
+    def is_set(self, index: int) -> bool:
+        return _get_bit(self._is_set, index)
+
+    def _check_range(self, start: int, stop: int):
+        """raise IndexError unless the indexes start .. stop - 1 are within the array, i.e., never grows on write"""
+        if start < 0 or stop > self.size:
+            raise IndexError(f"{self.point_type} index out of range 0 .. {self.size - 1}")
+
+    def write(self, index: int, value: Any, flags: int = 1, timestamp: float = None):
+        """write one point, raise IndexError if `index` is out of range"""
+        self._check_range(index, index + 1)
+        if self.is_analog:
+            self.values[index] = value
+        else:
+            _set_bit(self.values, index, value)
+        _set_bit(self._is_set, index, True)
+        self.flags[index] = flags
+        self.timestamps[index] = time.time() if timestamp is None else timestamp
+
+    def write_many(self, indexes: List[int], values: List[Any], flags: Union[int, Sequence[int]] = 1,
+                   timestamp: Union[float, Sequence[float], None] = None):
+        """bulk write, i.e., one quality flag and timestamp for all the points, or one per point (sequences)"""
+        if not indexes:
+            return
+        self._check_range(min(indexes), max(indexes) + 1)
+        if isinstance(flags, int):
+            flags = [flags] * len(indexes)
+        if timestamp is None or isinstance(timestamp, (int, float)):
+            timestamp = [time.time() if timestamp is None else timestamp] * len(indexes)
+        is_set, point_flags, timestamps = self._is_set, self.flags, self.timestamps
+        if self.is_analog:
+            point_values = self.values
+            for index, value, point_flag, point_timestamp in zip(indexes, values, flags, timestamp):
+                point_values[index] = value
+                is_set[index >> 3] |= 1 << (index & 7)
+                point_flags[index] = point_flag
+                timestamps[index] = point_timestamp
+        else:
+            for index, value, point_flag, point_timestamp in zip(indexes, values, flags, timestamp):
+                _set_bit(self.values, index, value)
+                is_set[index >> 3] |= 1 << (index & 7)
+                point_flags[index] = point_flag
+                timestamps[index] = point_timestamp
+
+    def write_range(self, start: int, values: List[Any], flags: int = 1, timestamp: float = None):
+        """bulk write of the contiguous indexes start .. start + len(values) - 1, i.e., slice assignments"""
+        stop = start + len(values)
+        self._check_range(start, stop)
+        timestamp = time.time() if timestamp is None else timestamp
+        if self.is_analog:
+            self.values[start:stop] = array("d", values)
+        else:
+            bits = self.values
+            for index, value in zip(range(start, stop), values):
+                if value:
+                    bits[index >> 3] |= 1 << (index & 7)
+                else:
+                    bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+        _set_bit_range(self._is_set, start, stop)
+        self.flags[start:stop] = array("B", [flags]) * len(values)
+        self.timestamps[start:stop] = array("d", [timestamp]) * len(values)
+
+    def read_range(self, start: int = 0, stop: int = None) -> List[Any]:
+        """bulk read of the indexes start .. stop - 1 (default to the last point), unset points read as None,
+        i.e., the bitsets are decoded one byte (8 points) at a time"""
+        stop = self.size if stop is None else stop
+        self._check_range(start, stop)
+        if start >= stop:
+            return []
+        first_byte, last_byte = start >> 3, (stop + 7) >> 3
+        num_values = stop - start
+        if self.is_analog:
+            values = self.values[start:stop].tolist()
+        else:
+            offset = start - (first_byte << 3)
+            values = list(chain.from_iterable(map(_BYTE_BITS.__getitem__, self.values[first_byte:last_byte])))
+            values = values[offset:offset + num_values]
+        for byte_index, byte in enumerate(self._is_set[first_byte:last_byte], first_byte):
+            if byte == 0xFF:
+                continue
+            low, high = max((byte_index << 3) - start, 0), min((byte_index << 3) + 8 - start, num_values)
+            if not byte:
+                values[low:high] = [None] * (high - low)
+                continue
+            for position in range(low, high):
+                if not byte >> ((position + start) & 7) & 1:
+                    values[position] = None
+        return values
+
+    def read_many(self, indexes: Iterable[int]) -> List[Any]:
+        if isinstance(indexes, range) and indexes.step == 1:
+            return self.read_range(indexes.start, indexes.stop) if indexes else []
+        return [self[index] for index in indexes]
+
+    def to_dict(self) -> Dict[int, Any]:
+        """the `db_handler.db[point_type]` shaped dict, e.g., {0: 1.2, 1: None, ...}"""
+        return dict(enumerate(self.read_range()))
+
+    def items_set(self) -> Iterator[tuple]:
+        """yield (index, value, flags, timestamp) of the points that were set"""
+        for index in range(self.size):
+            if _get_bit(self._is_set, index):
+                value = self.values[index] if self.is_analog else _get_bit(self.values, index)
+                yield index, value, self.flags[index], self.timestamps[index]
+
+    @property
+    def nbytes(self) -> int:
+        values_bytes = len(self.values) * (self.values.itemsize if self.is_analog else 1)
+        return (values_bytes + len(self._is_set) + len(self.flags) * self.flags.itemsize
+                + len(self.timestamps) * self.timestamps.itemsize)
+
+
+class PointStore(Mapping):
+    """Point type -> `PointArray`, i.e., a read-only view with the same shape as `db_handler.db`."""
+
+    def __init__(self, sizes: Dict[str, int] = None):
+        sizes = sizes or {}
+        self._arrays: Dict[str, PointArray] = {point_type: PointArray(point_type, sizes.get(point_type, 0))
+                                               for point_type in POINT_TYPES}
+
+    @classmethod
+    def from_db(cls, db: dict) -> "PointStore":
+        """a store with the sizes and (set) values of a `db_handler.db`"""
+        store = cls({point_type: len(points) for point_type, points in db.items() if point_type in POINT_TYPES})
+        for point_type, points in db.items():
+            if point_type not in POINT_TYPES:
+                continue
+            indexes = [index for index, val in points.items() if val is not None]
+            store[point_type].write_many(indexes, [points[index] for index in indexes])
+        return store
+
+    def __getitem__(self, point_type: str) -> PointArray:
+        return self._arrays[point_type]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._arrays)
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def write(self, point_type: str, index: int, value: Any, flags: int = 1, timestamp: float = None):
+        self._arrays[resolve_point_type(point_type)].write(index, value, flags, timestamp)
+
+    def read(self, point_type: str, index: int) -> Optional[Any]:
+        return self._arrays[resolve_point_type(point_type)].get(index)
+
+    def to_dict(self) -> dict:
+        """the `db_handler.db` shaped dict, e.g., {"Analog": {0: 1.2, 1: None, ...}, ...}"""
+        return {point_type: points.to_dict() for point_type, points in self._arrays.items()}
+
+    @property
+    def num_points(self) -> int:
+        return sum(len(points) for points in self._arrays.values())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(points.nbytes for points in self._arrays.values())
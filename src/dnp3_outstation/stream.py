@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""Push stream of point changes, master commands and connection state changes, i.e., one bounded queue per client.
+
+Point changes are coalesced per point (i.e., a client slower than the changes receives the latest value of each
+changed point), and the other events are kept in arrival order up to a bound (the oldest are dropped, and counted).
+Publishing is O(number of clients) dict/deque operations and never waits for a client, so a slow client can never
+create backpressure into the update path.
+"""
+
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_STREAM_MAX_POINTS = 100000
+DEFAULT_STREAM_MAX_EVENTS = 1000
+
+# alias
+PointChange = Tuple[str, int, Any, int, float]  # (point_type, index, value, flags, timestamp)
+
+
+class ClientQueue:
+    """Bounded queue of one stream client, the pending point changes (latest value per point, in first change order)
+    and events.
+
+    notify: optional, called when the queue becomes non-empty, e.g., to wake up the client sender
+    """
+
+    def __init__(self, client_id: str, max_points: int = DEFAULT_STREAM_MAX_POINTS,
+                 max_events: int = DEFAULT_STREAM_MAX_EVENTS, notify: Optional[Callable[[], None]] = None):
+        self.client_id = client_id
+        self.max_points = max_points
+        self._points: "OrderedDict[Tuple[str, str, int], list]" = OrderedDict()
+        self._events = deque(maxlen=max_events)
+        self.notify = notify
+        self.seq = 0  # number of messages popped
+        self.num_coalesced = 0
+        self.num_dropped = 0
+
+    def __len__(self):
+        return len(self._points) + len(self._events)
+
+    def put_points(self, outstation: str, changes: Iterable[PointChange]):
+        was_empty = not len(self)
+        points = self._points
+        for point_type, index, value, flags, timestamp in changes:
+            key = (outstation, point_type, index)
+            if key in points:
+                points[key][3:] = (value, flags, timestamp)
+                self.num_coalesced += 1
+                continue
+            if len(points) >= self.max_points:
+                points.popitem(last=False)
+                self.num_dropped += 1
+            points[key] = [outstation, point_type, index, value, flags, timestamp]
+        if was_empty and len(self) and self.notify is not None:
+            self.notify()
+
+    def put_event(self, event: Dict):
+        was_empty = not len(self)
+        if len(self._events) == self._events.maxlen:
+            self.num_dropped += 1
+        self._events.append(event)
+        if was_empty and self.notify is not None:
+            self.notify()
+
+    def pop_message(self) -> Optional[Dict]:
+        """the pending point changes and events as one message, None if nothing is pending, e.g.,
+        {"seq": 1, "points": [{"outstation": "default", "type": "Analog", "index": 0, "value": 1.5, "flags": 1,
+         "timestamp": 1667088000.0}], "events": [{"event": "connection", "outstation": "default",
+         "connected": true}], "dropped": 0}
+        "dropped": the total number of point changes and events dropped so far (i.e., beyond the queue bounds)
+        """
+        if not len(self):
+            return None
+        points = [dict(zip(("outstation", "type", "index", "value", "flags", "timestamp"), point))
+                  for point in self._points.values()]
+        self._points.clear()
+        events = list(self._events)
+        self._events.clear()
+        self.seq += 1
+        return {"seq": self.seq, "points": points, "events": events, "dropped": self.num_dropped}
+
+    def stats(self) -> Dict:
+        return {"pending": len(self), "sent": self.seq, "coalesced": self.num_coalesced,
+                "dropped": self.num_dropped}
+
+
+class ChangeStream:
+    """The stream clients, i.e., fan-out of the point changes and events to the client queues."""
+
+    def __init__(self, max_points: int = DEFAULT_STREAM_MAX_POINTS, max_events: int = DEFAULT_STREAM_MAX_EVENTS):
+        self.max_points = max_points
+        self.max_events = max_events
+        self.clients: Dict[str, ClientQueue] = {}
+
+    def __len__(self):
+        return len(self.clients)
+
+    def subscribe(self, client_id: str, notify: Optional[Callable[[], None]] = None) -> ClientQueue:
+        if client_id in self.clients:
+            raise ValueError(f"stream client {client_id!r} already subscribed")
+        client = self.clients[client_id] = ClientQueue(client_id, self.max_points, self.max_events, notify)
+        return client
+
+    def unsubscribe(self, client_id: str) -> Optional[ClientQueue]:
+        return self.clients.pop(client_id, None)
+
+    def publish_points(self, outstation: str, changes: List[PointChange]):
+        if not changes:
+            return
+        for client in self.clients.values():
+            client.put_points(outstation, changes)
+
+    def publish_event(self, event: Dict):
+        for client in self.clients.values():
+            client.put_event(event)
+
+    def stats(self) -> Dict:
+        return {client_id: client.stats() for client_id, client in self.clients.items()}
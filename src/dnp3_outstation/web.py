@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Installable Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2022 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+"""HTTP bulk update and query endpoints, i.e., the request and response handling of the agent web endpoints.
+
+Update bodies (a json array or json lines, i.e., NDJSON, of update rows or objects, see `apply_update_batch`) are
+decoded one item at a time and applied in chunks of `batch_size` updates, and query responses are encoded one page
+of points at a time, so a request of tens of thousands of points never holds them all as python objects.
+"""
+
+import io
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import parse_qs
+
+DEFAULT_WEB_BATCH_SIZE = 10000
+DEFAULT_WEB_PAGE_SIZE = 5000
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+JSON_CONTENT_TYPE = "application/json"
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def parse_query_string(query_string: str) -> Dict[str, str]:
+    """query parameters, i.e., the last value of each parameter"""
+    return {key: values[-1] for key, values in parse_qs(query_string or "").items()}
+
+
+def iter_json_array(text: str) -> Iterator[Any]:
+    """yield the items of a json array one at a time, i.e., without decoding the whole array"""
+    length = len(text)
+    pos = _skip_whitespace(text, 0)
+    if pos >= length or text[pos] != "[":
+        raise ValueError("the body should be a json array")
+    pos = _skip_whitespace(text, pos + 1)
+    if pos < length and text[pos] == "]":
+        return
+    while True:
+        item, pos = _decoder.raw_decode(text, pos)
+        yield item
+        pos = _skip_whitespace(text, pos)
+        if pos >= length:
+            raise ValueError("unterminated json array")
+        if text[pos] == "]":
+            if _skip_whitespace(text, pos + 1) < length:
+                raise ValueError(f"extra data after the json array at position {pos + 1}")
+            return
+        if text[pos] != ",":
+            raise ValueError(f"expecting ',' or ']' at position {pos}")
+        pos = _skip_whitespace(text, pos + 1)
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def iter_ndjson(text: str) -> Iterator[Any]:
+    """yield the items of json lines, blank lines are skipped"""
+    for line_num, line in enumerate(io.StringIO(text), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"line {line_num}: invalid json: {e}")
+
+
+def iter_body_items(body: Union[str, bytes], content_type: str = None) -> Iterator[Any]:
+    """the update items of a request body, json lines if the content type says so (or if the body is not
+    a json array), otherwise a json array"""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    if "ndjson" in (content_type or "") or not body.lstrip(_WHITESPACE).startswith("["):
+        return iter_ndjson(body)
+    return iter_json_array(body)
+
+
+def apply_bulk_updates(apply_batch: Callable[[list], dict], items: Iterable[Any],
+                       batch_size: int = DEFAULT_WEB_BATCH_SIZE) -> dict:
+    """apply the update items in chunks of `batch_size` (i.e., one transaction per chunk), `apply_batch` returns
+    the `Outstation.apply_batch` result, the error positions are reported relative to the whole body
+    return: {"applied": n, "errors": [[position, error message], ...], "transactions": n}, and "error" if the body
+        is malformed, i.e., the items before the malformed one are applied, plus the "deferred" count and the
+        (latest) "backpressure" hint of the chunks, if any
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size {batch_size} should be positive")
+    result = {"applied": 0, "errors": [], "transactions": 0}
+    chunk: List[Any] = []
+    position = 0
+
+    def flush():
+        chunk_result = apply_batch(chunk)
+        result["applied"] += chunk_result["applied"]
+        result["errors"].extend([position - len(chunk) + item_position, error]
+                                for item_position, error in chunk_result["errors"])
+        result["transactions"] += 1
+        if chunk_result.get("deferred"):
+            result["deferred"] = result.get("deferred", 0) + chunk_result["deferred"]
+        if "backpressure" in chunk_result:
+            result["backpressure"] = chunk_result["backpressure"]
+        chunk.clear()
+
+    items = iter(items)
+    while True:
+        try:
+            item = next(items)
+        except StopIteration:
+            break
+        except ValueError as e:
+            result["error"] = f"malformed body after {position} items: {e}"
+            break
+        chunk.append(item)
+        position += 1
+        if len(chunk) == batch_size:
+            flush()
+    if chunk:
+        flush()
+    return result
+
+
+def iter_query_json(query: Callable[..., dict], point_types: Optional[List[str]] = None, indexes: Any = None,
+                    offset: int = 0, limit: Optional[int] = None,
+                    page_size: int = DEFAULT_WEB_PAGE_SIZE) -> Iterator[bytes]:
+    """encode the query result (same shape as `query_points`) one page of `page_size` points at a time,
+    `query` is called with (point_types, indexes, offset, limit), e.g., `Outstation.query`"""
+    yield b'{"points": {'
+    current_type = None
+    page = None
+    for page in _iter_query_pages(query, point_types, indexes, offset, limit, page_size):
+        for point_type, points in page["points"].items():
+            if point_type != current_type:
+                yield (b"}, " if current_type is not None else b"") + json.dumps(point_type).encode() + b": {"
+                current_type = point_type
+                separator = b""
+            else:
+                separator = b", "
+            yield separator + json.dumps(points)[1:-1].encode()
+    if current_type is not None:
+        yield b"}"
+    total = page["total"] if page is not None else 0
+    next_offset = offset + limit if limit is not None and offset + limit < total else None
+    yield f'}}, "total": {total}, "offset": {offset}, "next_offset": {json.dumps(next_offset)}}}'.encode()
+
+
+def iter_query_ndjson(query: Callable[..., dict], point_types: Optional[List[str]] = None, indexes: Any = None,
+                      offset: int = 0, limit: Optional[int] = None,
+                      page_size: int = DEFAULT_WEB_PAGE_SIZE) -> Iterator[bytes]:
+    """encode the queried points as json lines, i.e., {"type": point type, "index": index, "value": val}"""
+    for page in _iter_query_pages(query, point_types, indexes, offset, limit, page_size):
+        yield "".join(json.dumps({"type": point_type, "index": index, "value": val}) + "\n"
+                      for point_type, points in page["points"].items()
+                      for index, val in points.items()).encode()
+
+
+def _iter_query_pages(query: Callable[..., dict], point_types, indexes, offset: int, limit: Optional[int],
+                      page_size: int) -> Iterator[dict]:
+    if page_size < 1:
+        raise ValueError(f"page_size {page_size} should be positive")
+    stop = None if limit is None else offset + limit
+    while True:
+        page_limit = page_size if stop is None else min(page_size, stop - offset)
+        page = query(point_types, indexes, offset, page_limit)
+        yield page
+        offset = page["next_offset"]
+        if offset is None or (stop is not None and offset >= stop):
+            return
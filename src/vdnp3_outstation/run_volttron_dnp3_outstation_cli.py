@@ -1,6 +1,12 @@
 import logging
 import sys
 import argparse
+import functools
+import json
+import time
+
+import gevent
+import gevent.lock
 
 # from pydnp3 import opendnp3
 # from dnp3_python.dnp3station.outstation_new import MyOutStationNew
@@ -9,6 +15,8 @@ from time import sleep
 from volttron.client.vip.agent import build_agent
 from dnp3_outstation.agent import Dnp3OutstationAgent
 from volttron.client.vip.agent import Agent
+from dnp3_outstation.commands import LatencyStats
+from vdnp3_outstation.scripted import FORMATS, detect_format, iter_batches, iter_updates, send_delay
 
 DNP3_AGENT_ID = "dnp3_outstation"
 
@@ -33,6 +41,22 @@ def setup_args(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
     parser.add_argument("-aid", "--agent-identity", action="store", default=DNP3_AGENT_ID, type=str,
                         metavar="<peer-name>",
                         help=f"specify agent identity (parsed as peer-name for rpc call), default '{DNP3_AGENT_ID}'.")
+    # scripted mode
+    parser.add_argument("-i", "--input", action="store", default=None, type=str, metavar="<path>",
+                        help="scripted mode: send the point updates of a csv or json lines file ('-' for stdin) "
+                             "instead of the interactive menu.")
+    parser.add_argument("--format", action="store", default=None, choices=FORMATS,
+                        help="input format, default by file extension (json lines for stdin).")
+    parser.add_argument("--batch-size", action="store", default=1000, type=int,
+                        help="updates per apply_update_batch call, default 1000.")
+    parser.add_argument("--rate", action="store", default=0, type=float, metavar="<updates/s>",
+                        help="target rate in updates per second, default 0 (as fast as possible).")
+    parser.add_argument("--pipeline", action="store", default=8, type=int,
+                        help="maximum number of in-flight RPC calls, default 8.")
+    parser.add_argument("--outstation", action="store", default=None, type=str,
+                        help="name of the hosted outstation to update, default to the agent default.")
+    parser.add_argument("--timeout", action="store", default=30, type=float,
+                        help="seconds to wait for an RPC result, default 30.")
 
     return parser
 
@@ -63,6 +87,55 @@ def check_agent_id_existence(agent_id: str, vip_agent: Agent):
 
 
 
+def run_scripted(vip_agent: Agent, peer: str, args: argparse.Namespace) -> dict:
+    """send the updates of `args.input` as pipelined apply_update_batch calls (at most `args.pipeline` in flight,
+    paced to `args.rate` if set), then return the report, i.e., achieved rate and RPC latency percentiles"""
+    fmt = args.format or detect_format(args.input)
+    stream = sys.stdin if args.input == "-" else open(args.input, newline="")
+    peer_method = Dnp3OutstationAgent.apply_update_batch.__name__
+    in_flight = gevent.lock.BoundedSemaphore(args.pipeline)
+    latency = LatencyStats(window=None)
+    report = {"updates": 0, "applied": 0, "errors": 0, "failed_calls": 0}
+
+    def on_result(result, sent: float, num_updates: int):
+        latency.add(time.perf_counter() - sent)
+        if result.successful():
+            report["applied"] += result.value.get("applied", 0)
+            report["errors"] += len(result.value.get("errors", []))
+        else:
+            report["failed_calls"] += 1
+            _log.error(f"apply_update_batch of {num_updates} updates failed: {result.exception}")
+        in_flight.release()
+
+    def expire(result):
+        if not result.ready():
+            result.set_exception(gevent.Timeout(args.timeout))
+
+    start = time.perf_counter()
+    try:
+        for batch in iter_batches(iter_updates(stream, fmt), args.batch_size):
+            gevent.sleep(send_delay(start, time.perf_counter(), report["updates"], args.rate))
+            in_flight.acquire()
+            num_updates = len(batch["types"])
+            sent = time.perf_counter()
+            result = vip_agent.vip.rpc.call(peer, peer_method, batch, response_mode="ack",
+                                            outstation=args.outstation)
+            result.rawlink(functools.partial(on_result, sent=sent, num_updates=num_updates))
+            gevent.spawn_later(args.timeout, expire, result)
+            report["updates"] += num_updates
+        # wait for the in-flight calls
+        for _ in range(args.pipeline):
+            in_flight.acquire()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    elapsed = time.perf_counter() - start
+
+    report.update({"elapsed_s": elapsed, "updates_per_s": report["updates"] / elapsed if elapsed else 0.0,
+                   "calls": latency.count, "latency": latency.summary()})
+    return report
+
+
 def main(parser=None, *args, **kwargs):
     if parser is None:
         # Initialize parser
@@ -81,10 +154,15 @@ def main(parser=None, *args, **kwargs):
     # print(f"========= peer {peer}")
     check_agent_id_existence(peer, a)
 
-    def get_db_helper():
-        _peer_method = Dnp3OutstationAgent.display_outstation_db.__name__
-        _db_print = a.vip.rpc.call(peer, _peer_method).get(timeout=10)
-        return _db_print
+    if args.input:
+        print(json.dumps(run_scripted(a, peer, args), indent=2))
+        return
+
+    def get_db_helper(point_type: str = None):
+        # Note: query only the displayed point type, instead of the full database
+        _peer_method = Dnp3OutstationAgent.query_outstation_db.__name__
+        _db_print = a.vip.rpc.call(peer, _peer_method, point_types=point_type).get(timeout=10)
+        return _db_print.get("points")
 
     def get_config_helper():
         _peer_method = Dnp3OutstationAgent.get_outstation_config.__name__
@@ -136,7 +214,7 @@ def main(parser=None, *args, **kwargs):
                     method = Dnp3OutstationAgent.apply_update_analog_input
                     peer_method = method.__name__  # i.e., "apply_update_analog_input"
                     response = a.vip.rpc.call(peer, peer_method, p_val, index).get(timeout=10)
-                    result = {"Analog": get_db_helper().get("Analog")}
+                    result = get_db_helper("Analog")
                     print(result)
                     sleep(2)
                 except Exception as e:
@@ -155,7 +233,7 @@ def main(parser=None, *args, **kwargs):
                     method = Dnp3OutstationAgent.apply_update_analog_output
                     peer_method = method.__name__  # i.e., "apply_update_analog_input"
                     response = a.vip.rpc.call(peer, peer_method, p_val, index).get(timeout=10)
-                    result = {"AnalogOutputStatus": get_db_helper().get("AnalogOutputStatus")}
+                    result = get_db_helper("AnalogOutputStatus")
                     print(result)
                     sleep(2)
                 except Exception as e:
@@ -177,7 +255,7 @@ def main(parser=None, *args, **kwargs):
                     method = Dnp3OutstationAgent.apply_update_binary_input
                     peer_method = method.__name__
                     response = a.vip.rpc.call(peer, peer_method, p_val, index).get(timeout=10)
-                    result = {"Binary": get_db_helper().get("Binary")}
+                    result = get_db_helper("Binary")
                     print(result)
                     sleep(2)
                 except Exception as e:
@@ -199,7 +277,7 @@ def main(parser=None, *args, **kwargs):
                     method = Dnp3OutstationAgent.apply_update_binary_output
                     peer_method = method.__name__
                     response = a.vip.rpc.call(peer, peer_method, p_val, index).get(timeout=10)
-                    result = {"BinaryOutputStatus": get_db_helper().get("BinaryOutputStatus")}
+                    result = get_db_helper("BinaryOutputStatus")
                     print(result)
                     sleep(2)
                 except Exception as e:
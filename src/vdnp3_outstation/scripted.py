@@ -0,0 +1,82 @@
+"""
+Scripted (non-interactive) mode of the CLI, i.e., point updates read from a csv or json lines file (or stdin),
+sent to the agent as `apply_update_batch` RPCs.
+
+Input formats:
+    csv: a header with the columns type, index and value, e.g.,
+        type,index,value
+        ai,0,1.5
+        bo,2,1
+    jsonl: one update per line, either an object or a [type, index, value] list, e.g.,
+        {"type": "ai", "index": 0, "value": 1.5}
+        ["bo", 2, true]
+Note: this module only parses, batches and paces the updates, the RPCs are sent by the CLI.
+"""
+import csv
+import json
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple
+
+from dnp3_outstation.points import parse_value_text
+
+FORMATS = ("csv", "jsonl")
+
+# alias
+Update = Tuple[Any, Any, Any]  # (point_type, index, value), validated by the agent
+
+
+def detect_format(path: str) -> str:
+    """input format by file extension, json lines for stdin (i.e., "-") and unknown extensions"""
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def iter_updates(stream: IO[str], fmt: str) -> Iterator[Update]:
+    """yield (point_type, index, value) from a csv or json lines stream, blank lines are skipped"""
+    if fmt not in FORMATS:
+        raise ValueError(f"input format {fmt!r} should be one of {FORMATS}")
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        missing = {"type", "index", "value"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"csv input requires the columns type, index and value, missing {sorted(missing)}")
+        for row in reader:
+            yield row["type"].strip(), parse_value_text(row["index"]), parse_value_text(row["value"])
+        return
+
+    for line_num, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"line {line_num}: invalid json {line!r}: {e}")
+        if isinstance(item, dict):
+            yield item.get("type"), item.get("index"), item.get("value")
+        elif isinstance(item, list) and len(item) == 3:
+            yield item[0], item[1], item[2]
+        else:
+            raise ValueError(f"line {line_num}: {line!r} should be an object or a [type, index, value] list")
+
+
+def iter_batches(updates: Iterable[Update], batch_size: int) -> Iterator[Dict[str, List]]:
+    """group the updates in columnar batches (see `apply_update_batch`) of up to `batch_size` updates"""
+    if batch_size < 1:
+        raise ValueError(f"batch_size {batch_size} should be positive")
+    batch = {"types": [], "indexes": [], "values": []}
+    for point_type, index, value in updates:
+        batch["types"].append(point_type)
+        batch["indexes"].append(index)
+        batch["values"].append(value)
+        if len(batch["types"]) == batch_size:
+            yield batch
+            batch = {"types": [], "indexes": [], "values": []}
+    if batch["types"]:
+        yield batch
+
+
+def send_delay(start: float, now: float, num_sent: int, rate: float) -> float:
+    """seconds to wait before sending the next batch, i.e., `num_sent` updates were sent since `start`
+    at the target `rate` (updates per second), 0 if no rate (i.e., as fast as possible) or behind schedule"""
+    if not rate:
+        return 0.0
+    return max(start + num_sent / rate - now, 0.0)
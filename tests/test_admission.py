@@ -0,0 +1,80 @@
+"""
+Unit tests for the event buffer occupancy estimate and admission control, no volttron instance required.
+"""
+import pytest
+
+from dnp3_outstation.admission import EventBufferMonitor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_monitor(poll_interval: float = 10.0, capacity: int = 10):
+    clock = FakeClock()
+    monitor = EventBufferMonitor({"Analog": capacity, "Binary": capacity}, poll_interval, clock=clock)
+    monitor.set_connected(True)
+    return monitor, clock
+
+
+def test_occupancy_per_class():
+    monitor, clock = make_monitor()
+    monitor.record({("Analog", 1): 4, ("Analog", 2): 2, ("Binary", 3): 1, ("Binary", 0): 5})
+    snapshot = monitor.snapshot()
+    assert snapshot["classes"] == {"1": 4, "2": 2, "3": 1}
+    assert snapshot["types"]["Analog"] == {"pending": 6, "capacity": 10, "occupancy": 0.6}
+    assert monitor.occupancy() == 0.6
+
+    # verify: the (modeled) master poll reads the pending events
+    clock.now = 5.0
+    monitor.record({("Analog", 1): 1})
+    clock.now = 10.0
+    assert monitor.snapshot()["classes"] == {"1": 1, "2": 0, "3": 0}
+    assert monitor.retry_after() == 5.0
+    clock.now = 15.0
+    assert monitor.occupancy() == 0.0
+
+
+def test_overflow_drops_oldest():
+    monitor, clock = make_monitor()
+    monitor.record({("Analog", 2): 8})
+    monitor.record({("Analog", 1): 5})
+    snapshot = monitor.snapshot()
+    assert snapshot["lost"]["Analog"] == 3
+    assert snapshot["types"]["Analog"]["pending"] == 10
+    assert snapshot["classes"] == {"1": 5, "2": 5, "3": 0}
+
+
+def test_disconnected_accumulates_until_connect():
+    monitor, clock = make_monitor()
+    monitor.set_connected(False)
+    monitor.record({("Binary", 1): 4})
+    clock.now = 100.0
+    assert monitor.occupancy() == 0.4
+    assert monitor.retry_after() is None
+    monitor.set_connected(True)
+    assert monitor.occupancy() == 0.0
+
+
+def test_unsolicited_reporting():
+    monitor, clock = make_monitor(poll_interval=0)
+    monitor.record({("Analog", 1): 12})
+    assert monitor.snapshot()["lost"]["Analog"] == 2
+    clock.now = 0.001
+    assert monitor.occupancy() == 0.0
+
+
+def test_admit_within_headroom():
+    monitor, clock = make_monitor()
+    monitor.record({("Analog", 1): 6})
+    admitted = monitor.admit([("Analog", 1), ("Analog", 0), ("Analog", 2), ("Analog", 1), ("Binary", 1)], 0.8)
+    assert admitted == [True, True, True, False, True]
+
+
+def test_invalid_poll_interval():
+    with pytest.raises(ValueError):
+        EventBufferMonitor({"Analog": 10}, poll_interval=-1)
@@ -0,0 +1,46 @@
+"""
+Unit tests for the versioned snapshot cache, no volttron instance required.
+"""
+import threading
+import time
+
+from dnp3_outstation.cache import SnapshotCache
+
+
+def test_rebuild_on_new_version():
+    cache = SnapshotCache()
+    builds = []
+
+    def build():
+        builds.append(True)
+        return {"Analog": {0: len(builds)}}
+
+    first = cache.get(("db", "default"), 1, build)
+    assert cache.get(("db", "default"), 1, build) is first
+    assert len(builds) == 1
+    assert cache.get(("db", "default"), 2, build).value == {"Analog": {0: 2}}
+    # Note: a snapshot newer than the version read by the caller is valid
+    assert cache.get(("db", "default"), 1, build).version == 2
+    assert cache.get(("config", "default"), 2, build).value == {"Analog": {0: 3}}
+    assert cache.stats() == {"snapshots": 2, "hits": 2, "misses": 3, "hit_rate": 0.4}
+    cache.invalidate(("db", "default"))
+    assert cache.get(("db", "default"), 2, build).value == {"Analog": {0: 4}}
+
+
+def test_concurrent_readers_share_one_build():
+    cache = SnapshotCache()
+    builds = []
+
+    def build():
+        builds.append(True)
+        time.sleep(0.05)
+        return b'{"Analog": {}}'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("db", 1, build))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
+    assert all(snapshot is results[0] for snapshot in results)
@@ -0,0 +1,52 @@
+"""
+Unit tests for the numbered change log (delta queries), no volttron instance required.
+"""
+import pytest
+
+from dnp3_outstation.changelog import ChangeLog
+
+
+def test_changes_since():
+    log = ChangeLog(maxlen=10)
+    assert log.since(0)["changes"] == []
+    log.extend([("Analog", 0, 1.5, 1, 10.0), ("Analog", 1, 2.5, 1, 10.0)])
+    log.extend([("Analog", 0, 3.5, 1, 11.0)])
+    result = log.since(0)
+    assert result["seq"] == 3 and not result["resync"] and not result["more"]
+    assert result["changes"] == [[2, "Analog", 1, 2.5, 1, 10.0], [3, "Analog", 0, 3.5, 1, 11.0]]
+    assert len(log.since(0, coalesce=False)["changes"]) == 3
+    assert log.since(2)["changes"] == [[3, "Analog", 0, 3.5, 1, 11.0]]
+    assert log.since(3)["changes"] == []
+
+
+def test_changes_since_limit():
+    log = ChangeLog(maxlen=10)
+    log.extend([("Binary", index, True, 1, 0.0) for index in range(5)])
+    result = log.since(1, limit=2)
+    assert [change[0] for change in result["changes"]] == [2, 3]
+    assert result["seq"] == 3 and result["more"]
+    result = log.since(result["seq"], limit=2)
+    assert [change[0] for change in result["changes"]] == [4, 5]
+    assert not result["more"]
+
+
+def test_resync():
+    log = ChangeLog(maxlen=3)
+    log.extend([("Analog", index, float(index), 1, 0.0) for index in range(5)])
+    assert log.first_seq == 3
+    assert log.since(2)["changes"][0][0] == 3
+    result = log.since(1)
+    assert result["resync"] and result["seq"] == 5 and result["changes"] == []
+    assert log.since(6)["resync"]  # i.e., from a previous epoch
+    assert log.since(4, epoch="other")["resync"]
+    assert not log.since(4, epoch=log.epoch)["resync"]
+
+
+def test_invalid_arguments():
+    log = ChangeLog()
+    with pytest.raises(ValueError):
+        log.since(-1)
+    with pytest.raises(ValueError):
+        log.since(0, limit=0)
+    with pytest.raises(ValueError):
+        ChangeLog(maxlen=0)
@@ -0,0 +1,39 @@
+"""
+Unit tests for the master command handoff, no volttron instance required.
+"""
+import threading
+
+from dnp3_outstation.commands import CommandQueue, LatencyStats, command_record
+
+
+def test_command_queue_drain_in_order():
+    notified = []
+    queue = CommandQueue(maxlen=3, notify=lambda: notified.append(1))
+    for index in range(5):
+        queue.put(command_record("default", "Operate", "AnalogOutputStatus", index, 1.0, "SUCCESS", None, 0.0))
+    assert len(notified) == 5
+    assert queue.num_received == 5 and queue.num_dropped == 2
+    assert [record["index"] for record in queue.drain()] == [2, 3, 4]
+    assert queue.drain() == []
+
+
+def test_command_queue_concurrent_producer():
+    queue = CommandQueue()
+    producer = threading.Thread(target=lambda: [queue.put({"index": index}) for index in range(10000)])
+    producer.start()
+    drained = []
+    while producer.is_alive() or len(queue):
+        drained.extend(record["index"] for record in queue.drain())
+    producer.join()
+    drained.extend(record["index"] for record in queue.drain())
+    assert drained == list(range(10000))
+
+
+def test_latency_stats():
+    stats = LatencyStats(window=100)
+    assert stats.summary() == {"count": 0}
+    for ms in range(1, 101):
+        stats.add(ms / 1e3)
+    summary = stats.summary()
+    assert summary["count"] == 100
+    assert round(summary["p50_ms"]) == 50 and round(summary["p99_ms"]) == 99 and round(summary["max_ms"]) == 100
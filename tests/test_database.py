@@ -0,0 +1,64 @@
+"""
+Unit tests for the outstation database config (sizes, event buffers, point classes), no volttron instance required.
+"""
+import pytest
+
+from dnp3_outstation.database import (DEFAULT_DB_SIZE, PointConfig, check_database_config, iter_point_indexes,
+                                      parse_point_config, parse_sizes, parse_variation, point_classes)
+
+
+def test_parse_sizes():
+    assert parse_sizes(None, DEFAULT_DB_SIZE, "db_size") == \
+        {"Analog": 10, "AnalogOutputStatus": 10, "Binary": 10, "BinaryOutputStatus": 10}
+    assert set(parse_sizes(100, DEFAULT_DB_SIZE, "db_size").values()) == {100}
+    assert parse_sizes({"ai": 100, "binary": 20}, 10, "event_buffer_size") == \
+        {"Analog": 100, "AnalogOutputStatus": 10, "Binary": 20, "BinaryOutputStatus": 10}
+    for sizes in (-1, 70000, "100", {"ai": 1.5}, True):
+        with pytest.raises(ValueError):
+            parse_sizes(sizes, DEFAULT_DB_SIZE, "db_size")
+    with pytest.raises(ValueError):
+        parse_sizes({"counter": 10}, DEFAULT_DB_SIZE, "db_size")
+
+
+def test_parse_variation():
+    assert parse_variation("Analog", "30.5", event=False) == "Group30Var5"
+    assert parse_variation("Analog", "g32v7", event=True) == "Group32Var7"
+    assert parse_variation("BinaryOutputStatus", "Group10Var2", event=False) == "Group10Var2"
+    assert parse_variation("Binary", None, event=True) is None
+    for point_type, variation, event in [("Analog", "32.7", False), ("Analog", "30.7", False),
+                                         ("Binary", "2.4", True), ("Analog", "thirty", False)]:
+        with pytest.raises(ValueError):
+            parse_variation(point_type, variation, event)
+
+
+def test_parse_point_config():
+    db_sizes = parse_sizes({"ai": 20}, DEFAULT_DB_SIZE, "db_size")
+    point_configs = parse_point_config([{"type": "ai", "indexes": "0-9,15", "class": 1, "event_variation": "32.7"},
+                                        {"type": "bi", "class": 0}], db_sizes)
+    assert point_configs == [PointConfig("Analog", [(0, 9), (15, 15)], 1, None, "Group32Var7"),
+                             PointConfig("Binary", None, 0, None, None)]
+    assert list(iter_point_indexes(point_configs[0], 20)) == list(range(10)) + [15]
+    assert list(iter_point_indexes(point_configs[1], 5)) == list(range(5))
+    assert parse_point_config(None, db_sizes) == []
+    for entries in ([{"type": "ai", "indexes": 20}], [{"type": "bi", "class": 4}], ["ai"], [{"class": 1}]):
+        with pytest.raises(ValueError):
+            parse_point_config(entries, db_sizes)
+
+
+def test_check_database_config():
+    check_database_config({"db_size": 10, "event_buffer_size": {"ai": 1000},
+                           "point_config": [{"type": "ao", "indexes": [[0, 9]], "class": 2}]})
+    with pytest.raises(ValueError):
+        check_database_config({"db_size": 10, "point_config": [{"type": "ao", "indexes": [[0, 10]]}]})
+
+
+def test_point_classes():
+    classes = point_classes({"db_size": {"ai": 10, "bi": 2},
+                             "point_config": [{"type": "ai", "indexes": "5-9", "class": 3}, {"type": "ao", "class": 0}]})
+    # Note: the dnp3-python defaults are skipped, i.e., the database holds less than 3 binary inputs
+    assert list(classes["Analog"]) == [1] * 5 + [3] * 5
+    assert list(classes["AnalogOutputStatus"]) == [0] * 10
+    assert list(classes["Binary"]) == [1, 1]
+    classes = point_classes({})
+    assert list(classes["Analog"]) == [2, 2] + [1] * 8
+    assert list(classes["Binary"]) == [2, 2, 2] + [1] * 7
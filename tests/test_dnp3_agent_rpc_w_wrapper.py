@@ -248,3 +248,216 @@ def test_outstation_update_config_with_restart(vip_agent, dnp3_outstation_agent)
     port_new = rs.get("port")
     # print(f"========= port_new {port_new}")
     assert port_new == port_to_set
+
+
+def test_outstation_apply_update_batch(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    method = Dnp3OutstationAgent.apply_update_batch
+    peer_method = method.__name__  # "apply_update_batch"
+    val_ai, val_bo = random.random(), random.choice([True, False])
+    updates = [["Analog", 5, val_ai], ["bo", 6, val_bo], ["Binary", 100, True], ["ao", 1, "not-a-float"]]
+    rs = vip_agent.vip.rpc.call(peer, peer_method, updates).get(timeout=5)
+    print(datetime.datetime.now(), "rs: ", rs)
+    assert rs.get("applied") == 2
+    assert [position for position, _ in rs.get("errors")] == [2, 3]
+
+    # verify
+    rs = vip_agent.vip.rpc.call(peer, "display_outstation_db").get(timeout=5)
+    assert rs.get("Analog").get("5") == val_ai
+    assert rs.get("BinaryOutputStatus").get("6") == val_bo
+
+
+def test_outstation_apply_update_batch_columnar(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    method = Dnp3OutstationAgent.apply_update_batch
+    peer_method = method.__name__  # "apply_update_batch"
+    vals = [random.random() for _ in range(3)]
+    updates = {"types": ["ai", "ai", "ao"], "indexes": [7, 8, 7], "values": vals}
+    rs = vip_agent.vip.rpc.call(peer, peer_method, updates).get(timeout=5)
+    print(datetime.datetime.now(), "rs: ", rs)
+    assert rs == {"applied": 3, "errors": []}
+
+    # verify
+    rs = vip_agent.vip.rpc.call(peer, "display_outstation_db").get(timeout=5)
+    assert [rs.get("Analog").get("7"), rs.get("Analog").get("8"), rs.get("AnalogOutputStatus").get("7")] == vals
+
+
+def test_outstation_apply_update_batch_flags_timestamps(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    method = Dnp3OutstationAgent.apply_update_batch
+    peer_method = method.__name__  # "apply_update_batch"
+    val = random.random()
+    updates = {"types": ["ai", "ai", "bi"], "indexes": [0, 1, 2], "values": [val, val, True],
+               "flags": ["COMM_LOST", None, "NOT-A-FLAG"], "timestamps": ["2022-10-30T00:00:00Z", None, None]}
+    rs = vip_agent.vip.rpc.call(peer, peer_method, updates, timestamp=1667088000.0).get(timeout=5)
+    print(datetime.datetime.now(), "rs: ", rs)
+    assert rs.get("applied") == 2
+    assert [position for position, _ in rs.get("errors")] == [2]
+
+    # verify
+    rs = vip_agent.vip.rpc.call(peer, "query_outstation_db", point_types="ai", indexes=[0, 1]).get(timeout=5)
+    assert rs.get("points") == {"Analog": {"0": val, "1": val}}
+
+
+@pytest.mark.parametrize("response_mode", ["entry", "ack"])
+def test_outstation_apply_update_response_mode(vip_agent, dnp3_outstation_agent, response_mode):
+    peer = dnp3_vip_identity
+    method = Dnp3OutstationAgent.apply_update_analog_input
+    peer_method = method.__name__  # "apply_update_analog_input"
+    val, index = random.random(), random.choice(range(5))
+    rs = vip_agent.vip.rpc.call(peer, peer_method, val, index, response_mode=response_mode).get(timeout=5)
+    print(datetime.datetime.now(), "rs: ", rs)
+
+    # verify
+    if response_mode == "entry":
+        assert rs == {"Analog": {str(index): val}}
+    else:
+        assert rs == {"applied": 1}
+
+
+def test_outstation_reset_preserves_db(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    val, index = random.random(), random.choice(range(5))
+    vip_agent.vip.rpc.call(peer, "apply_update_analog_output", val, index).get(timeout=5)
+
+    method = Dnp3OutstationAgent.reset_outstation
+    peer_method = method.__name__  # "reset_outstation"
+    vip_agent.vip.rpc.call(peer, peer_method).get(timeout=10)
+
+    # verify
+    rs = vip_agent.vip.rpc.call(peer, "display_outstation_db").get(timeout=5)
+    assert rs.get("AnalogOutputStatus").get(str(index)) == val
+
+
+def test_outstation_stats(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    outstations = vip_agent.vip.rpc.call(peer, "list_outstations").get(timeout=5)
+    assert len(outstations) == 1
+
+    method = Dnp3OutstationAgent.get_outstation_stats
+    peer_method = method.__name__  # "get_outstation_stats"
+    rs = vip_agent.vip.rpc.call(peer, peer_method).get(timeout=5)
+
+    # verify
+    assert set(rs.get("outstations")) == set(outstations)
+    assert rs.get("process").get("max_rss_kb") > 0
+    assert "publish_latency" in rs.get("commands")
+
+
+def test_outstation_metrics(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    vip_agent.vip.rpc.call(peer, "apply_update_analog_input", random.random(), 0).get(timeout=5)
+
+    method = Dnp3OutstationAgent.get_metrics
+    peer_method = method.__name__  # "get_metrics"
+    rs = vip_agent.vip.rpc.call(peer, peer_method).get(timeout=5)
+
+    # verify
+    assert rs.get("agent").get("histograms").get("rpc.apply_update_analog_input").get("count") >= 1
+    metrics = next(iter(rs.get("outstations").values()))
+    assert metrics.get("counters").get("updates.Analog") >= 1
+    assert "opened" in metrics.get("connections")
+
+
+def test_outstation_db_cache(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    val, index = random.random(), random.choice(range(5))
+    vip_agent.vip.rpc.call(peer, "apply_update_analog_input", val, index).get(timeout=5)
+    vip_agent.vip.rpc.call(peer, "display_outstation_db").get(timeout=5)
+    rs = vip_agent.vip.rpc.call(peer, "display_outstation_db").get(timeout=5)
+    assert rs.get("Analog").get(str(index)) == val
+
+    # verify: the next write invalidates the cached database
+    val = val + 1
+    vip_agent.vip.rpc.call(peer, "apply_update_analog_input", val, index).get(timeout=5)
+    rs = vip_agent.vip.rpc.call(peer, "display_outstation_db").get(timeout=5)
+    assert rs.get("Analog").get(str(index)) == val
+    rs = vip_agent.vip.rpc.call(peer, "get_metrics").get(timeout=5)
+    assert rs.get("snapshot_cache").get("hits") >= 1
+
+
+def test_outstation_changes_since(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    method = Dnp3OutstationAgent.get_changes_since
+    peer_method = method.__name__  # "get_changes_since"
+    rs = vip_agent.vip.rpc.call(peer, peer_method).get(timeout=5)
+    seq, epoch = rs.get("seq"), rs.get("epoch")
+
+    val, index = random.random(), random.choice(range(5))
+    vip_agent.vip.rpc.call(peer, "apply_update_analog_input", val, index).get(timeout=5)
+    rs = vip_agent.vip.rpc.call(peer, peer_method, seq, epoch).get(timeout=5)
+
+    # verify
+    assert not rs.get("resync")
+    assert rs.get("seq") == seq + 1
+    assert [change[1:4] for change in rs.get("changes")] == [["Analog", index, val]]
+    rs = vip_agent.vip.rpc.call(peer, peer_method, seq, "previous-epoch").get(timeout=5)
+    assert rs.get("resync")
+
+
+def test_outstation_query_db(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    val, index = random.random(), random.choice(range(5))
+    vip_agent.vip.rpc.call(peer, "apply_update_analog_input", val, index).get(timeout=5)
+
+    method = Dnp3OutstationAgent.query_outstation_db
+    peer_method = method.__name__  # "query_outstation_db"
+    rs = vip_agent.vip.rpc.call(peer, peer_method, point_types="ai", indexes=[index]).get(timeout=5)
+
+    # verify
+    assert rs.get("points") == {"Analog": {str(index): val}}
+    assert rs.get("total") == 1
+    rs = vip_agent.vip.rpc.call(peer, peer_method, offset=0, limit=2).get(timeout=5)
+    assert rs.get("next_offset") == 2
+
+
+def test_outstation_update_database_config(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    point_config = [{"type": "ai", "indexes": "0-4", "class": 1, "static_variation": "30.5",
+                     "event_variation": "32.7"}]
+    vip_agent.vip.rpc.call(peer, "update_outstation", db_size={"ai": 20}, event_buffer_size=100,
+                           point_config=point_config).get(timeout=10)
+
+    # verify: the database is resized, i.e., the new analog inputs accept updates
+    rs = vip_agent.vip.rpc.call(peer, "display_outstation_db").get(timeout=5)
+    assert len(rs.get("Analog")) == 20
+    val = random.random()
+    rs = vip_agent.vip.rpc.call(peer, "apply_update_analog_input", val, 19).get(timeout=5)
+    assert rs.get("Analog").get("19") == val
+
+
+def test_outstation_event_buffer_admission(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    vip_agent.vip.rpc.call(peer, "update_outstation", db_size={"ai": 20}, event_buffer_size=10,
+                           event_high_watermark=0.5, event_admission="reject").get(timeout=10)
+    updates = {"types": ["ai"] * 10, "indexes": list(range(10)), "values": [random.random() for _ in range(10)]}
+    rs = vip_agent.vip.rpc.call(peer, "apply_update_batch", updates).get(timeout=5)
+
+    # verify: no master polls the events, i.e., the updates beyond the high watermark are rejected
+    assert rs.get("applied") == 5
+    assert [position for position, _ in rs.get("errors")] == [5, 6, 7, 8, 9]
+    assert rs.get("backpressure").get("occupancy") == 0.5
+    rs = vip_agent.vip.rpc.call(peer, "get_metrics").get(timeout=5)
+    metrics = next(iter(rs.get("outstations").values()))
+    assert metrics.get("event_buffers").get("types").get("Analog").get("pending") == 5
+    assert metrics.get("counters").get("admission.rejected") == 5
+    vip_agent.vip.rpc.call(peer, "update_outstation", event_admission="hint").get(timeout=10)
+
+
+def test_outstation_apply_update_out_of_range(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    for index in (10 ** 7, -1, True):
+        with pytest.raises(Exception):
+            vip_agent.vip.rpc.call(peer, "apply_update_analog_input", 1.0, index).get(timeout=5)
+
+
+def test_outstation_apply_update_batch_bool_index(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    val = random.random()
+    rs = vip_agent.vip.rpc.call(peer, "apply_update_batch", [["ai", 0, val], ["ai", True, 2.0]]).get(timeout=5)
+    assert rs.get("applied") == 1
+    assert [position for position, _ in rs.get("errors")] == [1]
+
+    # verify
+    rs = vip_agent.vip.rpc.call(peer, "query_outstation_db", point_types="ai", indexes=[0, 1]).get(timeout=5)
+    assert rs.get("points").get("Analog").get("0") == val
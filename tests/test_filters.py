@@ -0,0 +1,58 @@
+"""
+Unit tests for the deadband filter, no volttron instance required.
+"""
+import pytest
+
+from dnp3_outstation.filters import DeadbandFilter
+
+
+def test_no_deadband_always_reports():
+    deadband_filter = DeadbandFilter()
+    assert all(deadband_filter.check("Analog", 0, 1.0) for _ in range(3))
+
+
+def test_absolute_deadband():
+    deadband_filter = DeadbandFilter.from_config([{"type": "ai", "index": 0, "absolute": 0.5}])
+    assert deadband_filter.check("Analog", 0, 10.0, now=0)
+    assert not deadband_filter.check("Analog", 0, 10.4, now=1)
+    assert deadband_filter.check("Analog", 0, 10.6, now=2)
+    assert not deadband_filter.check("Analog", 0, 10.2, now=3)  # compared with the last reported value, i.e., 10.6
+    assert deadband_filter.num_suppressed == 2
+
+
+def test_percent_deadband_per_type():
+    deadband_filter = DeadbandFilter.from_config([{"type": "Analog", "percent": 1.0}])
+    assert deadband_filter.check("Analog", 3, 100.0, now=0)
+    assert not deadband_filter.check("Analog", 3, 100.9, now=1)
+    assert deadband_filter.check("Analog", 3, 101.5, now=2)
+    assert deadband_filter.check("AnalogOutputStatus", 3, 100.1, now=3)  # other type has no deadband
+
+
+def test_min_interval_and_binary_change():
+    deadband_filter = DeadbandFilter.from_config([{"type": "Binary", "index": 1, "min_interval": 5}])
+    assert deadband_filter.check("Binary", 1, True, now=0)
+    assert not deadband_filter.check("Binary", 1, False, now=1)
+    assert not deadband_filter.check("Binary", 1, True, now=6)  # unchanged
+    assert deadband_filter.check("Binary", 1, False, now=7)
+
+
+def test_quality_change_always_reported():
+    deadband_filter = DeadbandFilter.from_config([{"type": "Analog", "index": 0, "absolute": 1.0, "min_interval": 5},
+                                                  {"type": "bo", "index": 1}])
+    assert deadband_filter.check("Analog", 0, 10.0, 0x01, now=0)
+    assert not deadband_filter.check("Analog", 0, 10.2, 0x01, now=6)
+    # i.e., ONLINE -> COMM_LOST within the deadband and the min interval, then back to ONLINE
+    assert deadband_filter.check("Analog", 0, 10.2, 0x04, now=7)
+    assert deadband_filter.check("Analog", 0, 10.2, 0x01, now=8)
+    assert not deadband_filter.check("Analog", 0, 10.4, 0x01, now=20)
+    assert deadband_filter.check("BinaryOutputStatus", 1, True, 0x01, now=0)
+    assert deadband_filter.check("BinaryOutputStatus", 1, True, 0x05, now=1)
+
+
+def test_reset_and_invalid_config():
+    deadband_filter = DeadbandFilter.from_config([{"type": "ai", "index": 0, "absolute": 1}])
+    deadband_filter.check("Analog", 0, 1.0, now=0)
+    deadband_filter.reset()
+    assert deadband_filter.check("Analog", 0, 1.0, now=1)
+    with pytest.raises(ValueError):
+        DeadbandFilter.from_config([{"type": "ai", "index": 0, "absolute": -1}])
@@ -0,0 +1,67 @@
+"""
+Unit tests for the pub/sub ingestion helpers, no volttron instance required.
+"""
+import pytest
+
+from dnp3_outstation.ingest import TopicPatterns, TopicPointMap, UpdateCoalescer, subscription_prefixes
+
+TOPIC = "devices/campus/building/rtu1/all"
+
+
+@pytest.fixture
+def topic_point_map():
+    return TopicPointMap.from_config([{"topic": TOPIC,
+                                       "points": {"ZoneTemperature": {"type": "ai", "index": 0},
+                                                  "FanStatus": ["Binary", 1]}}])
+
+
+def test_topic_point_map_lookup(topic_point_map):
+    assert topic_point_map.topics == [TOPIC]
+    assert len(topic_point_map) == 2
+    assert topic_point_map.lookup(TOPIC, "ZoneTemperature") == ("Analog", 0)
+    assert topic_point_map.lookup(TOPIC, "Unmapped") is None
+
+
+def test_topic_point_map_all_message(topic_point_map):
+    message = [{"ZoneTemperature": 72.5, "FanStatus": True, "Unmapped": 1}, {"ZoneTemperature": {"units": "F"}}]
+    assert list(topic_point_map.map_message(TOPIC, message)) == [("Analog", 0, 72.5), ("Binary", 1, True)]
+    assert list(topic_point_map.map_message("devices/other/all", message)) == []
+
+
+def test_topic_point_map_invalid_config():
+    with pytest.raises(ValueError):
+        TopicPointMap.from_config([{"topic": TOPIC, "points": {"ZoneTemperature": ["counter", 0]}}])
+    with pytest.raises(ValueError):
+        TopicPointMap.from_config([{"topic": TOPIC, "points": {"ZoneTemperature": ["ai", True]}}])
+
+
+def test_topic_point_map_patterns():
+    topic_point_map = TopicPointMap.from_config([
+        {"topic": "devices/campus/*/all", "points": {"ZoneTemperature": ["ai", 1], "FanStatus": ["bi", 2]}},
+        {"topic": TOPIC, "points": {"ZoneTemperature": ["ai", 0]}}])
+    message = [{"ZoneTemperature": 72.5, "FanStatus": True}, {}]
+    # i.e., the exact topic takes precedence over the pattern
+    assert list(topic_point_map.map_message(TOPIC, message)) == [("Analog", 0, 72.5), ("Binary", 2, True)]
+    assert topic_point_map.lookup("devices/campus/building/rtu2/all", "ZoneTemperature") == ("Analog", 1)
+    assert list(topic_point_map.map_message("devices/other/rtu2/all", message)) == []
+
+    with pytest.raises(ValueError):
+        TopicPointMap.from_config([{"topic": "*/all", "points": {"ZoneTemperature": ["ai", 0]}}])
+
+
+def test_topic_patterns_subscription_prefixes():
+    topics = [TOPIC, "devices/campus/*/all", "devices/campus/building/rtu?/all", "analysis/rtu[12]"]
+    assert subscription_prefixes(topics) == ["analysis/rtu", "devices/campus/"]
+    topic_patterns = TopicPatterns(topics)
+    assert topic_patterns.match(TOPIC) == [TOPIC, "devices/campus/*/all", "devices/campus/building/rtu?/all"]
+    assert topic_patterns.match("analysis/rtu3") == []
+
+
+def test_update_coalescer_keeps_latest():
+    coalescer = UpdateCoalescer()
+    coalescer.add("Analog", 0, 1.0)
+    coalescer.add("Analog", 0, 2.0)
+    coalescer.add("Binary", 0, True)
+    assert coalescer.num_coalesced == 1
+    assert coalescer.drain() == [["Analog", 0, 2.0], ["Binary", 0, True]]
+    assert len(coalescer) == 0
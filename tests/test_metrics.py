@@ -0,0 +1,81 @@
+"""
+Unit tests for the counters and latency histograms, no volttron instance required.
+"""
+import threading
+
+import pytest
+
+from dnp3_outstation.metrics import Histogram, Metrics, timed_method
+
+
+def test_histogram_buckets():
+    histogram = Histogram(bounds=(1, 10, 100))
+    for ms in (0.5, 1, 5, 50, 500):
+        histogram.observe(ms / 1e3)
+    snapshot = histogram.snapshot()
+    assert snapshot["bucket_counts"] == [2, 1, 1, 1]
+    assert snapshot["buckets_ms"] == [1, 10, 100, "+Inf"]
+    assert snapshot["count"] == 5 and snapshot["max_ms"] == pytest.approx(500)
+    assert snapshot["p50_ms"] == 10 and snapshot["p99_ms"] == pytest.approx(500)
+
+
+def test_histogram_empty():
+    assert Histogram().snapshot()["p99_ms"] == 0.0
+
+
+def test_metrics_counters_and_rates():
+    metrics = Metrics()
+    metrics.inc("updates.Analog", 10)
+    metrics.inc("updates.Analog")
+    metrics.observe("apply", 0.002)
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"updates.Analog": 11}
+    assert snapshot["rates"]["updates.Analog"] > 0
+    assert snapshot["histograms"]["apply"]["count"] == 1
+
+    # recent rates are since the previous snapshot
+    assert metrics.snapshot()["recent_rates"]["updates.Analog"] == 0
+
+
+def test_metrics_snapshot_while_adding_counters():
+    metrics = Metrics()
+
+    def add_counters():
+        # i.e., as the opendnp3 thread counting the master commands
+        for index in range(20000):
+            metrics.inc(f"commands.{index}")
+            metrics.observe(f"command.{index}", 0.001)
+
+    thread = threading.Thread(target=add_counters)
+    thread.start()
+    while thread.is_alive():
+        snapshot = metrics.snapshot()
+        assert snapshot["rates"].keys() == snapshot["counters"].keys()
+    thread.join()
+    assert len(metrics.snapshot()["counters"]) == 20000
+
+
+class Service:
+
+    def __init__(self):
+        self.metrics = Metrics()
+
+    @timed_method
+    def ok(self, val):
+        return val
+
+    @timed_method
+    def fail(self):
+        raise ValueError("fail")
+
+
+def test_timed_method():
+    service = Service()
+    assert service.ok(1) == 1
+    with pytest.raises(ValueError):
+        service.fail()
+    snapshot = service.metrics.snapshot()
+    assert Service.ok.__name__ == "ok"
+    assert snapshot["histograms"]["rpc.ok"]["count"] == 1
+    assert snapshot["histograms"]["rpc.fail"]["count"] == 1
+    assert snapshot["counters"] == {"rpc.fail.errors": 1}
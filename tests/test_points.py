@@ -0,0 +1,72 @@
+"""
+Unit tests for the point type helpers, no volttron instance required.
+"""
+import pytest
+
+from dnp3_outstation.points import (ANALOG_INPUT, BINARY_OUTPUT, coerce_point_value, iter_point_updates,
+                                    iter_point_updates_with_metadata, parse_quality_flags, parse_timestamp,
+                                    resolve_point_type)
+
+
+@pytest.mark.parametrize("name, expected", [("ai", "Analog"), ("ao", "AnalogOutputStatus"),
+                                            ("Binary", "Binary"), ("binaryoutputstatus", "BinaryOutputStatus")])
+def test_resolve_point_type(name, expected):
+    assert resolve_point_type(name) == expected
+
+
+@pytest.mark.parametrize("name", ["counter", None, 1])
+def test_resolve_point_type_unknown(name):
+    with pytest.raises(ValueError):
+        resolve_point_type(name)
+
+
+def test_coerce_point_value():
+    assert coerce_point_value(ANALOG_INPUT, 1) == 1.0
+    assert coerce_point_value(BINARY_OUTPUT, 1) is True
+    with pytest.raises(TypeError):
+        coerce_point_value(ANALOG_INPUT, True)
+    with pytest.raises(TypeError):
+        coerce_point_value(BINARY_OUTPUT, 2)
+
+
+def test_iter_point_updates_rows_and_columns():
+    rows = [["ai", 0, 1.5], {"type": "bo", "index": 1, "value": True}]
+    columns = {"types": ["ai", "bo"], "indexes": [0, 1], "values": [1.5, True]}
+    expected = [(0, "ai", 0, 1.5), (1, "bo", 1, True)]
+    assert list(iter_point_updates(rows)) == expected
+    assert list(iter_point_updates(columns)) == expected
+
+
+def test_iter_point_updates_columns_length_mismatch():
+    with pytest.raises(ValueError):
+        list(iter_point_updates({"types": ["ai"], "indexes": [0, 1], "values": [1.5]}))
+
+
+def test_parse_timestamp():
+    assert parse_timestamp("1667088000") == 1667088000.0
+    assert parse_timestamp("2022-10-30T00:00:00Z") == 1667088000.0
+    assert parse_timestamp("2022-10-30 00:00:00") == 1667088000.0
+    with pytest.raises(ValueError):
+        parse_timestamp("yesterday")
+
+
+def test_parse_quality_flags():
+    assert parse_quality_flags(0x05) == 0x05
+    assert parse_quality_flags("ONLINE|local_forced") == 0x11
+    assert parse_quality_flags(["COMM_LOST"]) == 0x04
+    with pytest.raises(ValueError):
+        parse_quality_flags("OFFLINE")
+    with pytest.raises(ValueError):
+        parse_quality_flags(256)
+
+
+def test_iter_point_updates_with_metadata():
+    rows = [["ai", 0, 1.5], ["ai", 1, 2.5, "COMM_LOST"], {"type": "bo", "index": 1, "value": True, "timestamp": 10}]
+    assert list(iter_point_updates_with_metadata(rows)) == [(0, "ai", 0, 1.5, None, None),
+                                                            (1, "ai", 1, 2.5, "COMM_LOST", None),
+                                                            (2, "bo", 1, True, None, 10)]
+    columns = {"types": ["ai", "bo"], "indexes": [0, 1], "values": [1.5, True], "timestamps": [10, None]}
+    assert list(iter_point_updates_with_metadata(columns)) == [(0, "ai", 0, 1.5, None, 10),
+                                                               (1, "bo", 1, True, None, None)]
+    with pytest.raises(ValueError):
+        list(iter_point_updates_with_metadata({"types": ["ai"], "indexes": [0], "values": [1.5], "flags": []}))
@@ -0,0 +1,50 @@
+"""
+Unit tests for the filtered and paginated database query, no volttron instance required.
+"""
+import pytest
+
+from dnp3_outstation.query import parse_index_spec, query_points
+
+
+def make_db(num_points: int = 10) -> dict:
+    return {
+        "Analog": {index: float(index) for index in range(num_points)},
+        "AnalogOutputStatus": {index: None for index in range(num_points)},
+        "Binary": {index: index % 2 == 0 for index in range(num_points)},
+        "BinaryOutputStatus": {index: None for index in range(num_points)},
+    }
+
+
+def test_parse_index_spec():
+    assert parse_index_spec(3) == [(3, 3)]
+    assert parse_index_spec([5, 1, 2, [7, 9]]) == [(1, 2), (5, 5), (7, 9)]
+    assert parse_index_spec("0-3, 2-5,8") == [(0, 5), (8, 8)]
+    for invalid in ["1-x", [[3, 1]], [1.5], [True]]:
+        with pytest.raises(ValueError):
+            parse_index_spec(invalid)
+
+
+def test_query_by_type_and_index():
+    db = make_db()
+    result = query_points(db, "ai", [[2, 3], 8, 42])
+    assert result == {"points": {"Analog": {2: 2.0, 3: 3.0, 8: 8.0}}, "total": 3, "offset": 0, "next_offset": None}
+
+    result = query_points(db, ["Binary", "Analog"], "0-1")
+    assert result["points"] == {"Binary": {0: True, 1: False}, "Analog": {0: 0.0, 1: 1.0}}
+
+    # wide range over a small database
+    assert query_points(db, "Analog", [[5, 10 ** 9]])["total"] == 5
+
+
+def test_query_pagination():
+    db = make_db()
+    assert query_points(db)["total"] == 40
+    page = query_points(db, offset=8, limit=4)
+    assert page["points"] == {"Analog": {8: 8.0, 9: 9.0}, "AnalogOutputStatus": {0: None, 1: None}}
+    assert page["next_offset"] == 12
+    assert query_points(db, offset=36, limit=4)["next_offset"] is None
+    assert query_points(db, offset=50, limit=4)["points"] == {}
+    with pytest.raises(ValueError):
+        query_points(db, offset=-1)
+    with pytest.raises(ValueError):
+        query_points(db, "unknown")
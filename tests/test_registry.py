@@ -0,0 +1,48 @@
+"""
+Unit tests for the tabular (csv) point registry, no volttron instance required.
+"""
+import pytest
+
+from dnp3_outstation.registry import PointRegistry, iter_point_rows
+
+REGISTRY_CSV = """name,type,index,scaling,deadband,source_topic,source_field
+ZoneTemperature,Analog,0,0.1,0.5,devices/campus/building/rtu1/all,ZoneTemp
+SupplyTemperature,ai,2,,,devices/campus/building/rtu1/all,
+FanStatus,Binary,0,,,,
+"""
+
+
+@pytest.fixture
+def point_registry(tmp_path):
+    path = tmp_path / "points.csv"
+    path.write_text(REGISTRY_CSV)
+    return PointRegistry.from_csv(str(path))
+
+
+def test_registry_lookup(point_registry):
+    assert len(point_registry) == 3
+    assert point_registry.lookup("ZoneTemperature") == ("Analog", 0)
+    assert point_registry.lookup("FanStatus") == ("Binary", 0)
+    assert point_registry.lookup("Unknown") is None
+    assert point_registry.name("Analog", 2) == "SupplyTemperature"
+    assert point_registry.name("Analog", 1) is None
+
+
+def test_registry_metadata(point_registry):
+    assert point_registry.scale("Analog", 0, 700) == pytest.approx(70.0)
+    assert point_registry.scale("Analog", 2, 70) == 70
+    assert point_registry.scale("Binary", 0, True) is True
+    assert list(point_registry.deadbands()) == [("Analog", 0, 0.5)]
+    assert point_registry.sources() == [("devices/campus/building/rtu1/all", "ZoneTemp", "Analog", 0),
+                                        ("devices/campus/building/rtu1/all", "SupplyTemperature", "Analog", 2)]
+
+
+@pytest.mark.parametrize("lines", [
+    ["name,type\n", "a,Analog\n"],  # missing index column
+    ["name,type,index\n", "a,counter,0\n"],  # unknown type
+    ["name,type,index\n", "a,ai,0\n", "b,ai,0\n"],  # duplicated index
+    ["name,type,index\n", "a,ai,0\n", "a,bi,0\n"],  # duplicated name
+])
+def test_registry_invalid(lines):
+    with pytest.raises(ValueError):
+        PointRegistry(iter_point_rows(lines))
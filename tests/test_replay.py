@@ -0,0 +1,120 @@
+"""
+Unit tests for the replay of recorded point values, no volttron instance required.
+"""
+import pytest
+
+from dnp3_outstation.replay import ReplayEngine, iter_records, iter_replay_batches
+
+REPLAY_CSV = """timestamp,type,index,value,outstation
+0,ai,0,1.5,
+0,bo,1,1,feeder2
+1.5,ai,0,2.5,
+1.6,ai,1,3.5,
+4,ai,0,4.5,
+"""
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def replay_file(tmp_path):
+    path = tmp_path / "replay.csv"
+    path.write_text(REPLAY_CSV)
+    return str(path)
+
+
+def test_iter_replay_batches(replay_file):
+    batches = list(iter_replay_batches(iter_records(replay_file), batch_window=0.2))
+    assert [timestamp for timestamp, _ in batches] == [0.0, 1.5, 4.0]
+    first = batches[0][1]
+    assert first[None] == {"types": ["ai"], "indexes": [0], "values": [1.5]}
+    assert first["feeder2"] == {"types": ["bo"], "indexes": [1], "values": [1]}
+    assert batches[1][1][None]["indexes"] == [0, 1]
+
+    assert [timestamp for timestamp, _ in iter_replay_batches(iter_records(replay_file, start=1.6))] == [1.6, 4.0]
+
+
+def test_replay_paced(replay_file):
+    clock = FakeClock()
+    applied = []
+    engine = ReplayEngine(replay_file, lambda outstation, batch: applied.append((clock.now, outstation)) or 0,
+                          speed=2, clock=clock, sleep=clock.sleep)
+    engine.run()
+    # i.e., recorded at 0, 1.5, 1.6 and 4 seconds, replayed at 2x
+    assert [round(now - 100.0, 3) for now, _ in applied] == [0.0, 0.0, 0.75, 0.8, 2.0]
+    status = engine.status()
+    assert status["state"] == "finished" and status["kept_up"] is True
+    assert status["batches"] == 4 and status["updates"] == 5
+    assert status["achieved_speed"] == pytest.approx(2.0)
+
+
+def test_replay_late(replay_file):
+    clock = FakeClock()
+
+    def slow_apply(outstation, batch):
+        clock.now += 3.0
+        return 1
+
+    engine = ReplayEngine(replay_file, slow_apply, speed=1, clock=clock, sleep=clock.sleep)
+    engine.run()
+    status = engine.status()
+    assert status["kept_up"] is False and status["late_batches"] > 0 and status["rejected"] == 5
+
+
+def test_replay_yields_as_fast_as_possible(replay_file):
+    clock = FakeClock()
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            engine.stop()
+
+    engine = ReplayEngine(replay_file, lambda outstation, batch: 0, speed=0, clock=clock, sleep=sleep)
+    engine.run()
+    # i.e., one yield per batch, the stop is handled before the third batch
+    assert sleeps == [0, 0]
+    status = engine.status()
+    assert status["state"] == "stopped" and status["batches"] == 2
+
+
+def test_replay_pause_seek_stop(replay_file):
+    clock = FakeClock()
+    applied = []
+
+    def apply(outstation, batch):
+        applied.append(batch["values"])
+        if len(applied) == 1:
+            engine.pause()
+        return 0
+
+    def sleep(seconds):
+        clock.sleep(seconds)
+        if engine.state == "paused" and clock.now > 110:
+            # rewind to the start, then resume
+            engine.seek(0)
+            engine.resume()
+        elif len(applied) == 4:
+            engine.stop()
+
+    engine = ReplayEngine(replay_file, apply, speed=1, clock=clock, sleep=sleep)
+    engine.run()
+    # i.e., the first batch (two outstations) twice, then stopped before the batch at 1.5 seconds
+    assert applied == [[1.5], [1], [1.5], [1]]
+    assert engine.status()["state"] == "stopped"
+
+
+def test_replay_missing_file(tmp_path):
+    engine = ReplayEngine(str(tmp_path / "missing.csv"), lambda outstation, batch: 0)
+    engine.run()
+    assert engine.status()["state"] == "failed"
@@ -0,0 +1,30 @@
+"""
+Unit tests for the master command routing table, no volttron instance required.
+"""
+import pytest
+
+from dnp3_outstation.routing import CommandRouter, Route
+
+
+def test_command_router_lookup():
+    router = CommandRouter.from_config([
+        {"type": "ao", "index": 0, "path": "campus/building/rtu1", "point": "CoolingSetPoint", "timeout": 10},
+        {"type": "bo", "index": 1, "path": "campus/building/rtu1", "point": "FanCommand"},
+        {"outstation": "feeder2", "type": "ao", "index": 0, "path": "campus/building/rtu2", "point": "SetPoint"},
+    ], default_timeout=2)
+    assert len(router) == 3
+    assert router.lookup("default", "AnalogOutputStatus", 0) == Route("campus/building/rtu1", "CoolingSetPoint", 10)
+    assert router.lookup("default", "BinaryOutputStatus", 1).timeout == 2
+    assert router.lookup("feeder2", "AnalogOutputStatus", 0).path == "campus/building/rtu2"
+    assert router.lookup("default", "AnalogOutputStatus", 1) is None
+
+
+@pytest.mark.parametrize("route", [
+    {"type": "ai", "index": 0, "path": "campus/building/rtu1", "point": "Temperature"},
+    {"type": "ao", "index": "0", "path": "campus/building/rtu1", "point": "SetPoint"},
+    {"type": "ao", "index": 0, "path": "campus/building/rtu1"},
+    {"type": "ao", "index": 0, "path": "campus/building/rtu1", "point": "SetPoint", "timeout": 0},
+])
+def test_command_router_invalid(route):
+    with pytest.raises(ValueError):
+        CommandRouter.from_config([route])
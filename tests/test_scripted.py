@@ -0,0 +1,44 @@
+"""
+Unit tests for the scripted mode of the CLI (parsing, batching and pacing), no volttron instance required.
+"""
+import io
+
+import pytest
+
+from vdnp3_outstation.scripted import detect_format, iter_batches, iter_updates, send_delay
+
+
+def test_iter_updates_csv():
+    stream = io.StringIO("type,index,value\nai,0,1.5\nbo,2,1\nbi, 3 ,true\n")
+    assert list(iter_updates(stream, "csv")) == [("ai", 0, 1.5), ("bo", 2, 1), ("bi", 3, True)]
+
+
+def test_iter_updates_csv_missing_column():
+    with pytest.raises(ValueError):
+        list(iter_updates(io.StringIO("type,value\nai,1.5\n"), "csv"))
+
+
+def test_iter_updates_jsonl():
+    stream = io.StringIO('{"type": "ai", "index": 0, "value": 1.5}\n\n["bo", 2, true]\n')
+    assert list(iter_updates(stream, "jsonl")) == [("ai", 0, 1.5), ("bo", 2, True)]
+    with pytest.raises(ValueError):
+        list(iter_updates(io.StringIO("[1, 2]\n"), "jsonl"))
+
+
+def test_detect_format():
+    assert detect_format("updates.CSV") == "csv"
+    assert detect_format("-") == "jsonl"
+
+
+def test_iter_batches():
+    updates = [("ai", index, float(index)) for index in range(5)]
+    batches = list(iter_batches(updates, batch_size=2))
+    assert [len(batch["types"]) for batch in batches] == [2, 2, 1]
+    assert batches[-1] == {"types": ["ai"], "indexes": [4], "values": [4.0]}
+
+
+def test_send_delay():
+    assert send_delay(start=10.0, now=10.5, num_sent=100, rate=0) == 0.0
+    assert send_delay(start=10.0, now=10.5, num_sent=100, rate=100) == pytest.approx(0.5)
+    # behind schedule
+    assert send_delay(start=10.0, now=12.0, num_sent=100, rate=100) == 0.0
@@ -0,0 +1,83 @@
+"""
+Unit tests for the outstation worker pool, no volttron instance required.
+"""
+import os
+
+import pytest
+
+from dnp3_outstation.sharding import ShardPool, shard_assignments
+
+
+class PointCounter:
+    """minimal outstation stand-in hosted by the workers (picklable by reference)"""
+
+    def __init__(self, name: str, config: dict):
+        if config.get("fail"):
+            raise ValueError(f"cannot create {name}")
+        self.name = name
+        self.num_updates = 0
+        self.event_sink = None
+
+    @property
+    def pid(self) -> int:
+        return os.getpid()
+
+    def apply_batch(self, updates: list) -> dict:
+        if not isinstance(updates, list):
+            raise TypeError("updates should be a list")
+        self.num_updates += len(updates)
+        return {"applied": len(updates), "total": self.num_updates}
+
+    def emit(self, num_events: int):
+        for index in range(num_events):
+            self.event_sink({"outstation": self.name, "index": index})
+
+
+def test_shard_assignments():
+    assert shard_assignments(["a", "b", "c"], 2) == [["a", "c"], ["b"]]
+    assert shard_assignments(["a"], 4) == [["a"]]
+    with pytest.raises(ValueError):
+        shard_assignments(["a"], 0)
+
+
+def test_shard_pool_routes_calls():
+    configs = {name: {} for name in ("a", "b", "c")}
+    pool = ShardPool(PointCounter, configs, num_workers=2)
+    pool.start()
+    try:
+        assert pool.call("a", "apply_batch", [1, 2]) == {"applied": 2, "total": 2}
+        assert pool.call("a", "apply_batch", [3]) == {"applied": 1, "total": 3}
+        results = pool.call_many([(name, "apply_batch", ([0] * 5,), {}) for name in ("c", "b", "a")])
+        assert [r["total"] for r in results] == [5, 5, 8]
+
+        pids = pool.call_many([(name, "pid", (), {}) for name in ("a", "b", "c")])
+        assert pids[0] == pids[2] != pids[1] != os.getpid()
+        assert pids[0] == pool.worker_of("a").pid
+
+        with pytest.raises(TypeError):
+            pool.call("b", "apply_batch", "not a list")
+        with pytest.raises(ValueError):
+            pool.call("unknown", "apply_batch", [])
+    finally:
+        pool.close()
+
+
+def test_shard_pool_start_error():
+    pool = ShardPool(PointCounter, {"a": {"fail": True}}, num_workers=1)
+    with pytest.raises(ValueError):
+        pool.start()
+
+
+def test_shard_pool_forwards_events():
+    pool = ShardPool(PointCounter, {"a": {}, "b": {}}, num_workers=2)
+    pool.start()
+    try:
+        pool.call_many([("a", "emit", (3,), {}), ("b", "emit", (2,), {})])
+        events = []
+        for worker in pool.workers:
+            while len([e for e in events if e["outstation"] in worker.names]) < 3 - worker.index:
+                events.extend(worker.recv_events())
+        assert sorted((e["outstation"], e["index"]) for e in events) == [("a", 0), ("a", 1), ("a", 2),
+                                                                          ("b", 0), ("b", 1)]
+    finally:
+        pool.close()
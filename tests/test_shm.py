@@ -0,0 +1,84 @@
+"""
+Unit tests for the shared-memory ingestion ring, no volttron instance required.
+"""
+import multiprocessing
+import uuid
+
+import pytest
+
+from dnp3_outstation.shm import ShmRingBuffer
+
+
+@pytest.fixture
+def ring():
+    ring = ShmRingBuffer.create(f"dnp3_test_{uuid.uuid4().hex[:8]}", capacity=4)
+    yield ring
+    ring.close()
+
+
+def test_write_read_batch(ring):
+    producer = ShmRingBuffer.attach(ring.name)
+    try:
+        assert producer.write([("ai", 0, 1.5, None, None), ("bo", 3, True, "COMM_LOST", 1667088000.5)]) == 2
+    finally:
+        producer.close()
+    assert len(ring) == 2
+    batch = ring.read_batch()
+    assert batch == {"types": ["Analog", "BinaryOutputStatus"], "indexes": [0, 3], "values": [1.5, True],
+                     "flags": [None, 0x04], "timestamps": [None, 1667088000.5]}
+    assert len(ring) == 0
+    assert ring.read_batch()["types"] == []
+
+
+def test_full_ring_rejects(ring):
+    assert ring.write([("ai", index, float(index), None, None) for index in range(6)]) == 4
+    assert ring.dropped == 2
+    assert ring.read_batch(max_records=3)["indexes"] == [0, 1, 2]
+    # Note: the next records wrap around the end of the segment
+    assert ring.write([("bi", 7, False, 1, "2022-10-30T00:00:00+00:00"), ("ai", 8, 2.0, None, None)]) == 2
+    batch = ring.read_batch()
+    assert batch["indexes"] == [3, 7, 8]
+    assert batch["values"] == [3.0, False, 2.0]
+    assert batch["flags"] == [None, 1, None]
+    assert batch["timestamps"] == [None, 1667088000.0, None]
+    assert (ring.head, ring.tail) == (6, 6)
+
+
+def test_invalid_record_is_not_written(ring):
+    with pytest.raises(ValueError):
+        ring.write([("ai", 0, 1.0, None, None), ("xx", 1, 1.0, None, None)])
+    # Note: the records before the invalid one are written but not published
+    assert len(ring) == 0
+
+
+def test_create_existing_name(ring):
+    with pytest.raises(FileExistsError):
+        ShmRingBuffer.create(ring.name, capacity=4)
+    replaced = ShmRingBuffer.create(ring.name, capacity=8, replace=True)
+    try:
+        assert replaced.capacity == 8
+    finally:
+        replaced.close()
+    ring.owner = False  # i.e., already removed
+
+
+def _produce(name: str, count: int):
+    producer = ShmRingBuffer.attach(name)
+    sent = 0
+    while sent < count:
+        sent += producer.write([("ai", index, float(index), None, None) for index in range(sent, min(sent + 3, count))])
+    producer.close()
+
+
+def test_producer_process():
+    ring = ShmRingBuffer.create(capacity=16)
+    try:
+        process = multiprocessing.get_context("spawn").Process(target=_produce, args=(ring.name, 200))
+        process.start()
+        values = []
+        while len(values) < 200:
+            values.extend(ring.read_batch()["values"])
+        process.join(timeout=10)
+        assert values == [float(index) for index in range(200)]
+    finally:
+        ring.close()
@@ -0,0 +1,77 @@
+"""
+Unit tests for the persistent point snapshot, no volttron instance required.
+"""
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+from dnp3_outstation.snapshot import PointSnapshotStore
+
+
+def test_snapshot_flush_changed_points_only(tmp_path):
+    store = PointSnapshotStore(str(tmp_path / "snapshot.sqlite"))
+    store.mark("Analog", 0, 1.5, flags=1, timestamp=10.0)
+    store.mark("Analog", 0, 2.5, flags=1, timestamp=11.0)
+    store.mark("Binary", 3, True, flags=1, timestamp=12.0)
+    assert len(store) == 2
+    assert store.flush() == 2
+    assert store.flush() == 0
+    assert sorted(store.load()) == [("Analog", 0, 2.5, 1, 11.0), ("Binary", 3, True, 1, 12.0)]
+    store.close()
+
+
+def test_snapshot_flush_failure_keeps_points(tmp_path):
+    store = PointSnapshotStore(str(tmp_path / "snapshot.sqlite"))
+    store.mark("Analog", 0, 1.5, flags=1, timestamp=10.0)
+    store.mark("Analog", 1, 3.5, flags=1, timestamp=10.0)
+    # i.e., a point marked while the failing transaction runs
+    store._conn.create_function("mark_newer", 0, lambda: store.mark("Analog", 0, 2.5, flags=4, timestamp=11.0))
+    store._conn.execute("CREATE TEMP TRIGGER fail BEFORE INSERT ON points "
+                        "BEGIN SELECT mark_newer(); SELECT RAISE(ABORT, 'disk full'); END")
+    with pytest.raises(sqlite3.Error):
+        store.flush()
+    assert len(store) == 2 and list(store.load()) == []
+
+    store._conn.execute("DROP TRIGGER fail")
+    assert store.flush() == 2
+    assert sorted(store.load()) == [("Analog", 0, 2.5, 4, 11.0), ("Analog", 1, 3.5, 1, 10.0)]
+    store.close()
+
+
+def test_snapshot_concurrent_mark_flush(tmp_path):
+    store = PointSnapshotStore(str(tmp_path / "snapshot.sqlite"))
+
+    def mark_points():
+        # i.e., as the opendnp3 thread marking the master commands
+        for index in range(20000):
+            store.mark("AnalogOutputStatus", index, float(index), flags=1, timestamp=1.0)
+
+    # Note: frequent thread switches, i.e., a mark interleaved with the swap of the changed points
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=mark_points)
+    try:
+        thread.start()
+        while thread.is_alive():
+            store.flush()
+        thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    store.flush()
+    assert len(list(store.load())) == 20000 and len(store) == 0
+    store.close()
+
+
+def test_snapshot_reopen(tmp_path):
+    path = str(tmp_path / "snapshot.sqlite")
+    store = PointSnapshotStore(path)
+    store.mark("BinaryOutputStatus", 1, False, flags=1, timestamp=1.0)
+    store.close()  # note: close flushes
+
+    store = PointSnapshotStore(path)
+    assert list(store.load()) == [("BinaryOutputStatus", 1, False, 1, 1.0)]
+    store.clear()
+    assert list(store.load()) == []
+    store.close()
@@ -0,0 +1,82 @@
+"""
+Unit tests for the array-backed point store, no volttron instance required.
+"""
+import pytest
+
+from dnp3_outstation.query import query_points
+from dnp3_outstation.store import PointArray, PointStore
+
+
+def test_point_array_analog():
+    points = PointArray("Analog", 3)
+    assert len(points) == 3
+    assert points[0] is None
+    points.write(1, 2.5, flags=1, timestamp=10.0)
+    assert points[1] == 2.5 and points.is_set(1) and not points.is_set(0)
+    assert list(points.items_set()) == [(1, 2.5, 1, 10.0)]
+    points.write_many([0, 2], [-1.0, 3.0], flags=3, timestamp=11.0)
+    assert points.read_many([0, 1, 2]) == [-1.0, 2.5, 3.0]
+    assert list(points.flags) == [3, 1, 3]
+    points.write_range(0, [4.0, 5.0], flags=1, timestamp=12.0)
+    assert points.read_many([0, 1, 2]) == [4.0, 5.0, 3.0]
+    assert list(points.timestamps) == [12.0, 12.0, 11.0]
+    with pytest.raises(KeyError):
+        points[3]
+    assert 0 in points and True not in points and 3 not in points
+    # Note: out of range writes raise, i.e., never grow the array
+    for index in (3, -1, 10 ** 7):
+        with pytest.raises(IndexError):
+            points.write(index, 1.0)
+    with pytest.raises(IndexError):
+        points.write_many([0, 3], [1.0, 1.0])
+    assert len(points) == 3
+    points.resize(10)
+    assert len(points) == 10 and points[8] is None
+
+
+def test_point_array_binary_bitset():
+    points = PointArray("BinaryOutputStatus", 20)
+    points.write_many([0, 9, 17], [True, True, False])
+    points.write(9, False)
+    assert points.read_many([0, 9, 17, 18]) == [True, False, False, None]
+    assert points.nbytes == 3 + 3 + 20 + 20 * 8
+
+
+def test_point_array_bulk_per_point_metadata():
+    points = PointArray("Analog", 5)
+    # i.e., one apply_measurements batch, the later update of a point wins
+    points.write_many([3, 0, 3], [1.0, 2.0, 3.0], flags=[1, 4, 2], timestamp=[10.0, 11.0, 12.0])
+    assert points.read_range() == [2.0, None, None, 3.0, None]
+    assert points.read_range(3, 5) == [3.0, None] == points.read_many(range(3, 5))
+    assert list(points.flags) == [4, 0, 0, 2, 0]
+    assert list(points.timestamps) == [11.0, 0.0, 0.0, 12.0, 0.0]
+    assert points.to_dict() == {0: 2.0, 1: None, 2: None, 3: 3.0, 4: None}
+    with pytest.raises(IndexError):
+        points.read_range(0, 6)
+
+    points = PointArray("Binary", 10)
+    points.write_many([1, 8], [True, False], flags=[1, 2], timestamp=[1.0, 2.0])
+    assert points.read_range(0, 10) == [None, True] + [None] * 6 + [False, None]
+
+
+def test_point_store_mirrors_db():
+    db = {"Analog": {0: 1.5, 1: None}, "AnalogOutputStatus": {0: None},
+          "Binary": {0: True, 1: False}, "BinaryOutputStatus": {}}
+    store = PointStore.from_db(db)
+    assert store.to_dict() == db
+    assert store.num_points == 5
+    store.write("ai", 1, 2.0)
+    assert store.read("Analog", 1) == 2.0
+    assert query_points(store, "Binary", [1])["points"] == {"Binary": {1: False}}
+
+
+def test_point_store_query_pages():
+    store = PointStore({"Analog": 1000, "Binary": 10})
+    store["Analog"].write_range(0, [float(index) for index in range(1000)])
+    page = query_points(store, ["Analog", "Binary"], [[990, 2000]], offset=5, limit=10)
+    assert page["total"] == 10 + 0
+    assert page["points"] == {"Analog": {995: 995.0, 996: 996.0, 997: 997.0, 998: 998.0, 999: 999.0}}
+    page = query_points(store, offset=995, limit=10)
+    assert page["total"] == 1010 and page["next_offset"] == 1005
+    assert page["points"] == {"Analog": {index: float(index) for index in range(995, 1000)},
+                              "Binary": {index: None for index in range(5)}}
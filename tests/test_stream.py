@@ -0,0 +1,44 @@
+"""
+Unit tests for the push stream client queues, no volttron instance required.
+"""
+from dnp3_outstation.stream import ChangeStream, ClientQueue
+
+
+def test_client_queue_coalesces_points():
+    notified = []
+    client = ClientQueue("c1", notify=lambda: notified.append(True))
+    client.put_points("default", [("Analog", 0, 1.5, 1, 10.0), ("Analog", 1, 2.5, 1, 10.0)])
+    client.put_points("default", [("Analog", 0, 3.5, 1, 11.0)])
+    client.put_event({"event": "command", "index": 0})
+    assert len(notified) == 1  # i.e., only when the queue becomes non-empty
+    message = client.pop_message()
+    assert message["seq"] == 1
+    assert message["points"] == [
+        {"outstation": "default", "type": "Analog", "index": 0, "value": 3.5, "flags": 1, "timestamp": 11.0},
+        {"outstation": "default", "type": "Analog", "index": 1, "value": 2.5, "flags": 1, "timestamp": 10.0}]
+    assert message["events"] == [{"event": "command", "index": 0}]
+    assert client.pop_message() is None
+    assert client.stats() == {"pending": 0, "sent": 1, "coalesced": 1, "dropped": 0}
+
+
+def test_client_queue_bounds():
+    client = ClientQueue("c1", max_points=2, max_events=2)
+    client.put_points("default", [("Binary", index, True, 1, 0.0) for index in range(3)])
+    for index in range(3):
+        client.put_event({"event": "command", "index": index})
+    message = client.pop_message()
+    assert [point["index"] for point in message["points"]] == [1, 2]
+    assert [event["index"] for event in message["events"]] == [1, 2]
+    assert message["dropped"] == 2
+
+
+def test_change_stream_fan_out():
+    stream = ChangeStream()
+    first, second = stream.subscribe("c1"), stream.subscribe("c2")
+    stream.publish_points("feeder1", [("Analog", 0, 1.0, 1, 0.0)])
+    assert first.pop_message()["points"][0]["value"] == 1.0
+    stream.publish_event({"event": "connection", "outstation": "feeder1", "connected": True})
+    assert len(first) == 1 and len(second) == 2
+    assert stream.unsubscribe("c1") is first
+    assert stream.unsubscribe("c1") is None
+    assert list(stream.stats()) == ["c2"]
@@ -0,0 +1,96 @@
+"""
+Unit tests for the HTTP bulk update and query endpoints, no volttron instance required.
+"""
+import json
+
+import pytest
+
+from dnp3_outstation.query import query_points
+from dnp3_outstation.web import (apply_bulk_updates, iter_body_items, iter_json_array, iter_ndjson,
+                                 iter_query_json, iter_query_ndjson, parse_query_string)
+
+DB = {"Analog": {0: 1.5, 1: 2.5, 2: 3.5}, "Binary": {0: True, 1: False}}
+
+
+def query(point_types, indexes, offset, limit):
+    return query_points(DB, point_types, indexes, offset, limit)
+
+
+def test_iter_json_array():
+    assert list(iter_json_array(' [ ["ai", 0, 1.5], {"type": "bo", "index": 2, "value": true} ] ')) == [
+        ["ai", 0, 1.5], {"type": "bo", "index": 2, "value": True}]
+    assert list(iter_json_array("[]")) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array('{"type": "ai"}'))
+    items = iter_json_array('[["ai", 0, 1.5] ["ai", 1, 2.5]]')
+    assert next(items) == ["ai", 0, 1.5]
+    with pytest.raises(ValueError):
+        next(items)
+    with pytest.raises(ValueError):
+        list(iter_json_array('[["ai", 0, 1.5]'))
+
+
+def test_iter_ndjson():
+    assert list(iter_ndjson('["ai", 0, 1.5]\n\n{"type": "bi", "index": 1, "value": false}\n')) == [
+        ["ai", 0, 1.5], {"type": "bi", "index": 1, "value": False}]
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_ndjson('["ai", 0, 1.5]\n["ai", 1\n'))
+
+
+def test_iter_body_items():
+    assert list(iter_body_items(b'[["ai", 0, 1.5]]')) == [["ai", 0, 1.5]]
+    assert list(iter_body_items('["ai", 0, 1.5]\n["ai", 1, 2.5]', "application/x-ndjson")) == [
+        ["ai", 0, 1.5], ["ai", 1, 2.5]]
+    assert list(iter_body_items('{"type": "ai", "index": 0, "value": 1}')) == [{"type": "ai", "index": 0, "value": 1}]
+
+
+def test_apply_bulk_updates():
+    chunks = []
+
+    def apply_batch(chunk):
+        chunks.append(list(chunk))
+        errors = [[position, "invalid"] for position, item in enumerate(chunk) if item[0] == "xx"]
+        return {"applied": len(chunk) - len(errors), "errors": errors}
+
+    items = [["ai", 0, 1.0], ["xx", 1, 1.0], ["ai", 2, 1.0], ["xx", 3, 1.0], ["ai", 4, 1.0]]
+    result = apply_bulk_updates(apply_batch, iter(items), batch_size=2)
+    assert result == {"applied": 3, "errors": [[1, "invalid"], [3, "invalid"]], "transactions": 3}
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+    chunks.clear()
+    result = apply_bulk_updates(apply_batch, iter_body_items('[["ai", 0, 1.0], ["ai", 1, 1.0] ["ai", 2]]'), 10)
+    assert result["applied"] == 2
+    assert "after 2 items" in result["error"]
+
+
+def test_apply_bulk_updates_backpressure():
+    hint = {"occupancy": 0.9, "high_watermark": 0.8, "retry_after": 1.5}
+
+    def apply_batch(chunk):
+        return {"applied": 1, "errors": [], "deferred": len(chunk) - 1, "backpressure": hint}
+
+    result = apply_bulk_updates(apply_batch, iter([["ai", index, 1.0] for index in range(5)]), batch_size=2)
+    assert result["applied"] == 3 and result["deferred"] == 2
+    assert result["backpressure"] == hint
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 100])
+def test_iter_query_json(page_size):
+    body = json.loads(b"".join(iter_query_json(query, page_size=page_size)))
+    assert body == {"points": {"Analog": {"0": 1.5, "1": 2.5, "2": 3.5}, "Binary": {"0": True, "1": False}},
+                    "total": 5, "offset": 0, "next_offset": None}
+    body = json.loads(b"".join(iter_query_json(query, ["ai"], "1-9", offset=0, limit=1, page_size=page_size)))
+    assert body == {"points": {"Analog": {"1": 2.5}}, "total": 2, "offset": 0, "next_offset": 1}
+    body = json.loads(b"".join(iter_query_json(query, ["bo"], page_size=page_size)))
+    assert body == {"points": {}, "total": 0, "offset": 0, "next_offset": None}
+
+
+def test_iter_query_ndjson():
+    lines = b"".join(iter_query_ndjson(query, None, "1", offset=1, page_size=1)).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [{"type": "Binary", "index": 1, "value": False}]
+
+
+def test_parse_query_string():
+    assert parse_query_string("types=ai,bi&indexes=0-9,15&limit=10&limit=20") == {
+        "types": "ai,bi", "indexes": "0-9,15", "limit": "20"}
+    assert parse_query_string(None) == {}